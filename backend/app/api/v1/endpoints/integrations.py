@@ -8,6 +8,7 @@ from backend.app.core.auth.fastapi_users import current_active_user
 from backend.app.models.user import User
 from backend.app.models.service_connection import ServiceConnection
 from backend.app.core.config import settings
+from backend.core.http_clients import get_shared_http_client
 import uuid
 
 router = APIRouter()
@@ -107,7 +108,6 @@ async def spotify_callback(code: str, state: str, db: AsyncSession = Depends(get
     """
     Handle the callback from Spotify and store tokens.
     """
-    import httpx
     from datetime import datetime, timedelta, UTC
 
     try:
@@ -135,60 +135,59 @@ async def spotify_callback(code: str, state: str, db: AsyncSession = Depends(get
         raise HTTPException(status_code=400, detail="Spotify Relay credentials not found.")
 
     # 2. Exchange code for tokens
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://accounts.spotify.com/api/token",
-            data={
-                "grant_type": "authorization_code",
-                "code": code,
-                "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
-                "client_id": client_id,
-                "client_secret": client_secret,
-            },
+    client = get_shared_http_client()
+    response = await client.post(
+        "https://accounts.spotify.com/api/token",
+        data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": settings.SPOTIFY_REDIRECT_URI,
+            "client_id": client_id,
+            "client_secret": client_secret,
+        },
+    )
+    if response.status_code != 200:
+        error_data = response.json()
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Failed to get tokens from Spotify: " f"{error_data.get('error_description', error_data.get('error'))}"
+            ),
         )
-        if response.status_code != 200:
-            error_data = response.json()
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"Failed to get tokens from Spotify: "
-                    f"{error_data.get('error_description', error_data.get('error'))}"
-                ),
-            )
-
-        token_data = response.json()
-        granted_scopes = token_data.get("scope", "").split(" ")
-
-        # 3. Get user info from Spotify
-        user_response = await client.get(
-            "https://api.spotify.com/v1/me",
-            headers={"Authorization": f"Bearer {token_data['access_token']}"},
+
+    token_data = response.json()
+    granted_scopes = token_data.get("scope", "").split(" ")
+
+    # 3. Get user info from Spotify
+    user_response = await client.get(
+        "https://api.spotify.com/v1/me",
+        headers={"Authorization": f"Bearer {token_data['access_token']}"},
+    )
+    spotify_user = user_response.json()
+
+    # 4. Update or Create Connection
+    # Note: Database expects naive timestamp (UTC)
+    expires_at = (datetime.now(UTC) + timedelta(seconds=token_data["expires_in"])).replace(tzinfo=None)
+
+    if not conn:
+        conn = ServiceConnection(
+            user_id=user_id,
+            provider_name="spotify",
+            provider_user_id=spotify_user["id"],
+            access_token=token_data["access_token"],
+            refresh_token=token_data.get("refresh_token"),
+            expires_at=expires_at,
+            scopes=granted_scopes,
         )
-        spotify_user = user_response.json()
-
-        # 4. Update or Create Connection
-        # Note: Database expects naive timestamp (UTC)
-        expires_at = (datetime.now(UTC) + timedelta(seconds=token_data["expires_in"])).replace(tzinfo=None)
-
-        if not conn:
-            conn = ServiceConnection(
-                user_id=user_id,
-                provider_name="spotify",
-                provider_user_id=spotify_user["id"],
-                access_token=token_data["access_token"],
-                refresh_token=token_data.get("refresh_token"),
-                expires_at=expires_at,
-                scopes=granted_scopes,
-            )
-            db.add(conn)
-        else:
-            conn.provider_user_id = spotify_user["id"]
-            conn.access_token = token_data["access_token"]
-            conn.refresh_token = token_data.get("refresh_token")
-            conn.expires_at = expires_at
-            conn.scopes = granted_scopes
-
-        await db.commit()
-
-        # Redirect to frontend settings page
-        return RedirectResponse(url="/settings")
+        db.add(conn)
+    else:
+        conn.provider_user_id = spotify_user["id"]
+        conn.access_token = token_data["access_token"]
+        conn.refresh_token = token_data.get("refresh_token")
+        conn.expires_at = expires_at
+        conn.scopes = granted_scopes
+
+    await db.commit()
+
+    # Redirect to frontend settings page
+    return RedirectResponse(url="/settings")
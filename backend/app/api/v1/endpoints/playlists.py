@@ -1,42 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict
+from typing import Any, AsyncIterator, List, Dict
 from datetime import datetime, timezone
 from backend.app.db.session import get_async_session
 from backend.app.models.service_connection import ServiceConnection
 from backend.app.schemas.playlist import (
+    GenerationEvent,
     GenerationRequest,
     VerificationRequest,
     VerificationResponse,
+    VerificationEvent,
     PlaylistCreate,
+    BuildJobRead,
     BuildResponse,
     PlaylistGenerationResponse,
     PlaylistRead,
     PlaylistBuildRequest,
     PlaylistImport,
+    TrackCreate,
 )
 from backend.app.services.ai_service import AIService
+from backend.app.services.metadata_catalog import (
+    MetadataCatalog,
+    artist_search_stmt,
+    get_metadata_catalog,
+    track_search_stmt,
+)
 from backend.app.services.integrations_service import IntegrationsService
+from backend.app.services.playlist_tracks import playlists_with_artist_stmt, set_playlist_tracks
 from backend.app.core.auth.fastapi_users import current_active_user
 from backend.app.models.user import User
 from backend.app.models.playlist import Playlist as PlaylistModel
-from backend.app.core.tasks import sync_playlist_task
-from backend.core.client import SpotifyPlaylistBuilder
+from backend.app.models.build_job import BuildJob
+from backend.app.core.tasks import build_playlist_task, sync_playlist_task
+from backend.core.build_engine import build_playlist
 from .users import get_spotify_provider, get_http_client
 from backend.core.providers.spotify import SpotifyProvider
+from google import genai
 import uuid
 import httpx
 
 router = APIRouter()
 
 
+def get_gemini_client(request: Request) -> genai.Client | None:
+    """Shared Gemini client created in the app lifespan (None when no API key is configured)."""
+    return getattr(request.app.state, "gemini_client", None)
+
+
 def get_ai_service(
     db: AsyncSession = Depends(get_async_session),
     http_client: httpx.AsyncClient = Depends(get_http_client),
     spotify_provider: SpotifyProvider = Depends(get_spotify_provider),
+    gemini_client: genai.Client | None = Depends(get_gemini_client),
+    catalog: MetadataCatalog | None = Depends(get_metadata_catalog),
 ):
-    return AIService(db=db, http_client=http_client, spotify_provider=spotify_provider)
+    return AIService(
+        db=db,
+        http_client=http_client,
+        spotify_provider=spotify_provider,
+        gemini_client=gemini_client,
+        catalog=catalog,
+    )
 
 
 @router.post("/", response_model=PlaylistRead)
@@ -56,10 +84,11 @@ async def create_playlist(
         name=playlist.name,
         description=playlist.description,
         public=playlist.public,
-        content_json={"tracks": tracks_dict},
+        content_json={},
         status="draft",
     )
     db.add(db_playlist)
+    await set_playlist_tracks(db, db_playlist, tracks_dict)
     await db.commit()
     await db.refresh(db_playlist)
     return db_playlist
@@ -132,7 +161,7 @@ async def update_playlist(
 
     # Update content
     tracks_dict = [t.model_dump() for t in playlist_update.tracks]
-    db_playlist.content_json = {"tracks": tracks_dict}
+    await set_playlist_tracks(db, db_playlist, tracks_dict)
 
     await db.commit()
     await db.refresh(db_playlist)
@@ -291,11 +320,12 @@ async def import_playlist_endpoint(
             status="imported",
             provider=request.provider,
             provider_id=request.provider_playlist_id,
-            content_json={"tracks": tracks},
+            content_json={},
             # total_duration_ms can be sum of tracks
             total_duration_ms=sum(t.get("duration_ms", 0) for t in tracks),
         )
         db.add(db_playlist)
+        await set_playlist_tracks(db, db_playlist, tracks)
         await db.commit()
         await db.refresh(db_playlist)
         return db_playlist
@@ -318,7 +348,13 @@ async def generate_playlist_endpoint(
     """
     try:
         # ai_service.generate now returns {title, description, tracks}
-        result = ai_service.generate(prompt=request.prompt, count=request.count, artists=request.artists)
+        result = await ai_service.generate_async(
+            prompt=request.prompt,
+            count=request.count,
+            artists=request.artists,
+            use_cache=request.use_cache,
+            user_id=user.id,
+        )
         return result
     except Exception as e:
         import traceback
@@ -327,6 +363,41 @@ async def generate_playlist_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate/stream")
+async def generate_playlist_stream_endpoint(
+    request: GenerationRequest,
+    verify: bool = False,
+    ai_service: AIService = Depends(get_ai_service),
+    user: User = Depends(current_active_user),
+):
+    """
+    Generate a playlist, streaming one NDJSON event per track as soon as the model completes it.
+    With ?verify=true each track is verified as it arrives and reported as verified/rejected.
+    The stream ends with a "done" event carrying the title and description (or an "error" event).
+    """
+    events = ai_service.generate_stream(
+        prompt=request.prompt,
+        count=request.count,
+        artists=request.artists,
+        verify=verify,
+        use_cache=request.use_cache,
+    )
+
+    async def lines() -> AsyncIterator[str]:
+        try:
+            async for raw in events:
+                try:
+                    event = GenerationEvent.model_validate(raw)
+                except ValidationError:
+                    # Skip malformed tracks rather than ending the whole stream
+                    continue
+                yield event.model_dump_json() + "\n"
+        except Exception as e:
+            yield GenerationEvent(status="error", detail=str(e)).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
 @router.post("/verify", response_model=VerificationResponse)
 async def verify_tracks_endpoint(
     request: VerificationRequest,
@@ -345,18 +416,48 @@ async def verify_tracks_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/build", response_model=BuildResponse)
-async def build_playlist_endpoint(
-    request: PlaylistBuildRequest,
+@router.post("/verify/stream")
+async def verify_tracks_stream_endpoint(
+    request: VerificationRequest,
+    ai_service: AIService = Depends(get_ai_service),
     user: User = Depends(current_active_user),
-    db: AsyncSession = Depends(get_async_session),
 ):
     """
-    Build a playlist on a connected service (Spotify).
+    Verify tracks like /verify, streaming one NDJSON event per track as soon as it resolves.
+    Events arrive in request order and the stream ends with a "done" summary (or an "error" event).
     """
-    playlist_data = request.playlist_data
-    db_playlist = None
+    tracks_dict = [t.model_dump() for t in request.tracks]
+    try:
+        results = ai_service.stream_verify_tracks(tracks_dict)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+    async def events() -> AsyncIterator[str]:
+        verified_count = rejected_count = 0
+        try:
+            async for track, verified in results:
+                if verified:
+                    verified_count += 1
+                else:
+                    rejected_count += 1
+                event = VerificationEvent(
+                    status="verified" if verified else "rejected", track=TrackCreate.model_validate(track)
+                )
+                yield event.model_dump_json() + "\n"
+            event = VerificationEvent(status="done", verified_count=verified_count, rejected_count=rejected_count)
+        except Exception as e:
+            event = VerificationEvent(status="error", detail=str(e))
+        yield event.model_dump_json() + "\n"
+
+    # Disable proxy buffering so each line reaches the client immediately
+    return StreamingResponse(events(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
+async def _get_build_source(
+    request: PlaylistBuildRequest, user: User, db: AsyncSession
+) -> tuple[PlaylistModel | None, Dict[str, Any]]:
+    """Return the user's saved playlist (if requested) and the name, description, public flag and tracks to build."""
+    db_playlist = None
     if request.playlist_id:
         result = await db.execute(
             select(PlaylistModel).where(
@@ -365,15 +466,28 @@ async def build_playlist_endpoint(
             )
         )
         db_playlist = result.scalar_one_or_none()
-        if db_playlist and db_playlist.user_id == user.id:
-            # Use data from DB
-            # We will use db_playlist content below directly
-            pass
+        if db_playlist and db_playlist.user_id != user.id:
+            db_playlist = None
+
+    if db_playlist:
+        return db_playlist, {
+            "name": db_playlist.name,
+            "description": db_playlist.description or "",
+            "public": db_playlist.public,
+            "tracks": db_playlist.content_json.get("tracks", []),
+        }
+    if request.playlist_data:
+        playlist_data = request.playlist_data
+        return None, {
+            "name": playlist_data.name,
+            "description": playlist_data.description or "",
+            "public": playlist_data.public,
+            "tracks": [t.model_dump() for t in playlist_data.tracks],
+        }
+    raise HTTPException(status_code=400, detail="No playlist data provided.")
 
-    if not playlist_data and not db_playlist:
-        raise HTTPException(status_code=400, detail="No playlist data provided.")
 
-    # 1. Fetch Spotify connection for the user
+async def _get_spotify_connection(user: User, db: AsyncSession) -> ServiceConnection:
     result = await db.execute(
         select(ServiceConnection).where(
             ServiceConnection.user_id == user.id,
@@ -387,6 +501,23 @@ async def build_playlist_endpoint(
             status_code=400,
             detail="Spotify relay station not connected. Please go to Settings.",
         )
+    return conn
+
+
+@router.post("/build", response_model=BuildResponse)
+async def build_playlist_endpoint(
+    request: PlaylistBuildRequest,
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Build a playlist on a connected service (Spotify).
+    Tracks are resolved concurrently; use /build/jobs to run large builds in the background.
+    """
+    db_playlist, source = await _get_build_source(request, user, db)
+
+    # 1. Fetch Spotify connection for the user
+    conn = await _get_spotify_connection(user, db)
 
     # 2. Ensure token is valid
     integrations_service = IntegrationsService(db)
@@ -397,46 +528,26 @@ async def build_playlist_endpoint(
 
     # 3. Use the token to build the playlist
     try:
-        builder = SpotifyPlaylistBuilder(access_token=access_token)
-
-        # Determine inputs
-        if db_playlist:
-            tracks_dict = db_playlist.content_json.get("tracks", [])
-            name = db_playlist.name
-            description = db_playlist.description or ""
-            public = db_playlist.public
-        elif playlist_data:
-            tracks_dict = [t.model_dump() for t in playlist_data.tracks]
-            name = playlist_data.name
-            description = playlist_data.description or ""
-            public = playlist_data.public
-        else:
-            # Should be caught above
-            raise HTTPException(status_code=400, detail="No playlist data.")
-
-        # Use core logic to create the playlist
-        pid = builder.create_playlist(name, description, public=public)
-        actual_tracks, failed = builder.add_tracks_to_playlist(pid, tracks_dict)
-
-        # Calculate total duration from actual metadata
-        total_ms = sum(t.get("duration_ms", 0) for t in actual_tracks)
+        result = await build_playlist(
+            SpotifyProvider(auth_token=access_token),
+            source["name"],
+            source["description"],
+            source["tracks"],
+            public=source["public"],
+        )
+        resolved_tracks = result.pop("tracks")
 
         # Update DB status if it exists
         if db_playlist:
             db_playlist.status = "transmitted"
             db_playlist.provider = "spotify"
-            db_playlist.provider_id = pid
-            db_playlist.total_duration_ms = total_ms
+            db_playlist.provider_id = result["playlist_id"]
+            db_playlist.total_duration_ms = result["total_duration_ms"]
+            # Keep the resolved URIs so later syncs can diff against the remote playlist
+            await set_playlist_tracks(db, db_playlist, resolved_tracks)
             await db.commit()
 
-        return {
-            "status": "success",
-            "playlist_id": pid,
-            "url": f"https://open.spotify.com/playlist/{pid}",
-            "failed_tracks": failed,
-            "actual_tracks": actual_tracks,
-            "total_duration_ms": total_ms,
-        }
+        return result
     except Exception as e:
         import traceback
 
@@ -444,6 +555,49 @@ async def build_playlist_endpoint(
         raise HTTPException(status_code=500, detail=f"Failed to build playlist: {str(e)}")
 
 
+@router.post("/build/jobs", response_model=BuildJobRead, status_code=202)
+async def create_build_job(
+    request: PlaylistBuildRequest,
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Queue a playlist build on the background worker and return the job to poll.
+    """
+    db_playlist, source = await _get_build_source(request, user, db)
+    await _get_spotify_connection(user, db)
+
+    job = BuildJob(
+        user_id=user.id,
+        playlist_id=db_playlist.id if db_playlist else None,
+        status="pending",
+        total=len(source["tracks"]),
+        processed=0,
+        request_json=source,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    await build_playlist_task.kiq(job.id)  # type: ignore[no-matching-overload]
+    return job
+
+
+@router.get("/build/jobs/{job_id}", response_model=BuildJobRead)
+async def get_build_job(
+    job_id: uuid.UUID,
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Get the status and progress of a background build; the build result is included once completed.
+    """
+    job = await db.get(BuildJob, job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Build job not found")
+    return job
+
+
 @router.get("/search/tracks", response_model=List[PlaylistRead])
 async def search_playlists_by_track(
     artist: str,
@@ -451,18 +605,9 @@ async def search_playlists_by_track(
     db: AsyncSession = Depends(get_async_session),
 ):
     """
-    Search for playlists containing a specific artist using JSONB containment.
+    Search for playlists containing a specific artist using the normalized playlist_track index.
     """
-    # Optimized query using @> operator
-    from sqlalchemy import cast
-    from sqlalchemy.dialects.postgresql import JSONB
-
-    stmt = select(PlaylistModel).where(
-        PlaylistModel.user_id == user.id,
-        PlaylistModel.deleted_at.is_(None),
-        cast(PlaylistModel.content_json, JSONB).contains({"tracks": [{"artist": artist}]}),
-    )
-    result = await db.execute(stmt)
+    result = await db.execute(playlists_with_artist_stmt(artist, user_id=user.id))
     return result.scalars().all()
 
 
@@ -475,32 +620,8 @@ async def search_metadata(
     """
     Search for artists and tracks using FTS and Trigrams.
     """
-    from backend.app.models.metadata import Artist, Track
-    from sqlalchemy import func, or_
-
-    # Trigram fuzzy search for artists
-    artist_stmt = (
-        select(Artist)
-        .where(
-            or_(
-                func.similarity(Artist.name, q) > 0.3,
-                func.to_tsvector("english", Artist.name).bool_op("@@")(func.plainto_tsquery("english", q)),
-            )
-        )
-        .limit(10)
-    )
-
-    # FTS for tracks
-    track_stmt = (
-        select(Track)
-        .where(
-            or_(
-                func.similarity(Track.title, q) > 0.3,
-                func.to_tsvector("english", Track.title).bool_op("@@")(func.plainto_tsquery("english", q)),
-            )
-        )
-        .limit(10)
-    )
+    artist_stmt = artist_search_stmt(q)
+    track_stmt = track_search_stmt(q)
 
     artist_results = await db.execute(artist_stmt)
     track_results = await db.execute(track_stmt)
@@ -8,7 +8,9 @@ from backend.app.models.playlist import Playlist
 from backend.app.models.service_connection import ServiceConnection
 from backend.app.schemas.user import UserPublic
 from backend.app.schemas.playlist import PlaylistRead
+from backend.app.services.metadata_catalog import MetadataCatalog, get_metadata_catalog
 from backend.app.services.metadata_service import MetadataService
+from backend.core.http_clients import get_shared_http_client
 from backend.core.providers.spotify import SpotifyProvider
 from pydantic import BaseModel, Field
 from typing import Optional, List
@@ -19,11 +21,8 @@ router = APIRouter()
 
 
 def get_http_client() -> httpx.AsyncClient:
-    # NOTE: This should be managed by FastAPI lifespan events for a real app,
-    # but for local development and testing, we use a simple instantiation.
-    # We rely on the app's lifespan to create a client that the DI system can use.
-    # Since we don't have a global DI for the client yet, we instantiate it here.
-    return httpx.AsyncClient()
+    """Pooled client from the registry that the app lifespan closes on shutdown."""
+    return get_shared_http_client()
 
 
 async def get_spotify_provider(
@@ -45,8 +44,9 @@ async def get_spotify_provider(
 def get_metadata_service(
     http_client: httpx.AsyncClient = Depends(get_http_client),
     spotify_provider: SpotifyProvider = Depends(get_spotify_provider),
+    catalog: Optional[MetadataCatalog] = Depends(get_metadata_catalog),
 ):
-    return MetadataService(http_client=http_client, spotify_provider=spotify_provider)
+    return MetadataService(http_client=http_client, spotify_provider=spotify_provider, catalog=catalog)
 
 
 class UserPreferencesUpdate(BaseModel):
@@ -25,6 +25,13 @@ class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     REDIS_URL: RedisDsn = "redis://localhost:6379"  # type: ignore
 
+    # Outbound HTTP: one pooled client per upstream, shared for the lifetime of the process
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
     # Security
     SECRET_KEY: str
     FASTAPI_SECRET: str  # Kept for backward compatibility, but we should unify
@@ -45,13 +52,54 @@ class Settings(BaseSettings):
     SPOTIFY_CLIENT_ID: Optional[str] = None
     SPOTIFY_CLIENT_SECRET: Optional[str] = None
     SPOTIFY_REDIRECT_URI: Optional[str] = None
+    # Track searches in flight at once while building a playlist
+    SPOTIFY_BUILD_CONCURRENCY: int = 8
+    # Pages of a large playlist fetched at once once the first page reports the total
+    SPOTIFY_PAGE_CONCURRENCY: int = 4
+
+    # Track search cache
+    SEARCH_CACHE_MAX_ENTRIES: int = 10000
+    SEARCH_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7  # 7 days
+    SEARCH_CACHE_NEGATIVE_TTL_SECONDS: int = 60 * 60 * 6  # 6 hours for misses
+    SEARCH_CACHE_REDIS_ENABLED: bool = False  # Share results across processes via REDIS_URL
+
+    # MusicBrainz allows ~1 req/sec per client IP
+    MUSICBRAINZ_REQUESTS_PER_SECOND: float = 1.0
+    MUSICBRAINZ_RATE_LIMIT_REDIS_ENABLED: bool = False  # Share the budget across processes via REDIS_URL
+
+    # Local metadata catalog: provider lookups are written to the artist/track tables and served from there
+    METADATA_CATALOG_ENABLED: bool = True
+    METADATA_CATALOG_MAX_AGE_DAYS: int = 30  # Older entries are looked up again
+
+    # Fuzzy matching: "auto" (rapidfuzz from the "speedups" extra if installed, else difflib), "rapidfuzz",
+    # "difflib" or "bigram". "auto" never picks bigram: it scores differently from the tuned thresholds
+    SIMILARITY_ENGINE: str = "auto"
 
     # Integrations - AI
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-flash-latest"
+    GEMINI_EMBEDDING_MODEL: str = "text-embedding-004"  # 768 dimensions, matching AIInteractionEmbedding
+    # Model discovery: the model list is cached and refreshed in the background once stale
+    GEMINI_MODEL_REGISTRY_TTL_SECONDS: int = 60 * 60  # 1 hour
+    GEMINI_MODEL_FAILURE_TTL_SECONDS: int = 60 * 10  # Skip models that 404'd for 10 minutes
+    # Connection pool of the shared Gemini client created in the API lifespan
+    GEMINI_MAX_CONNECTIONS: int = 20
+    GEMINI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GEMINI_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+    # Generated playlist cache, keyed on normalized prompt + count + model
+    GENERATION_CACHE_ENABLED: bool = True
+    GENERATION_CACHE_MAX_ENTRIES: int = 1000
+    GENERATION_CACHE_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+    GENERATION_CACHE_REDIS_ENABLED: bool = False  # Share results across processes via REDIS_URL
+    # Also reuse results of near-duplicate prompts via stored prompt embeddings (one embedding call per miss)
+    GENERATION_CACHE_SEMANTIC_ENABLED: bool = False
+    GENERATION_CACHE_SEMANTIC_MAX_DISTANCE: float = 0.2  # L2 distance between prompt embeddings
 
     # Integrations - Discogs
     DISCOGS_PAT: Optional[str] = None
+    # Starting budget per token; adjusted from the X-Discogs-Ratelimit headers once responses arrive
+    DISCOGS_REQUESTS_PER_MINUTE: int = 60
 
     # Email
     SMTP_HOST: Optional[str] = None
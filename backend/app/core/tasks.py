@@ -8,10 +8,13 @@ from taskiq_redis import ListQueueBroker
 
 from backend.app.core.config import settings
 from backend.app.db.session import async_session_maker
+from backend.app.models.build_job import BuildJob
 from backend.app.models.playlist import Playlist
 from backend.app.models.service_connection import ServiceConnection
 from backend.app.models.user import User
 from backend.app.services.integrations_service import IntegrationsService
+from backend.app.services.playlist_tracks import set_playlist_tracks
+from backend.core.build_engine import build_playlist
 from backend.core.providers.spotify import SpotifyProvider
 
 broker = ListQueueBroker(str(settings.REDIS_URL))
@@ -31,6 +34,77 @@ async def create_playlist_task(
     return playlist_id
 
 
+@broker.task
+async def build_playlist_task(job_id: UUID) -> str:
+    """
+    Runs a queued playlist build on Spotify, recording progress and the result on its BuildJob.
+    """
+    async with async_session_maker() as session:
+        job = await session.get(BuildJob, job_id)
+        if not job:
+            return f"Build failed: Job {job_id} not found."
+
+        try:
+            # 1. Get a valid token for the user's Spotify connection
+            stmt = select(ServiceConnection).where(
+                ServiceConnection.user_id == job.user_id,
+                ServiceConnection.provider_name == "spotify",
+            )
+            conn = (await session.execute(stmt)).scalar_one_or_none()
+            if not conn:
+                raise Exception(f"User {job.user_id} has no active spotify connection.")
+            access_token = await IntegrationsService(session).get_valid_spotify_token(conn)
+
+            request = job.request_json
+            tracks = request.get("tracks", [])
+            job.status = "running"
+            job.total = len(tracks)
+            await session.commit()
+
+            # 2. Resolve and add the tracks, committing progress about every 5%
+            step = max(1, len(tracks) // 20)
+
+            async def on_progress(done: int, total: int) -> None:
+                if done % step == 0 or done == total:
+                    job.processed = done
+                    await session.commit()
+
+            result = await build_playlist(
+                SpotifyProvider(auth_token=access_token),
+                request["name"],
+                request.get("description") or "",
+                tracks,
+                public=request.get("public", False),
+                on_progress=on_progress,
+            )
+            resolved_tracks = result.pop("tracks")
+
+            # 3. Link the saved playlist to the remote one
+            playlist = await session.get(Playlist, job.playlist_id) if job.playlist_id else None
+            if playlist:
+                playlist.status = "transmitted"
+                playlist.provider = "spotify"
+                playlist.provider_id = result["playlist_id"]
+                playlist.total_duration_ms = result["total_duration_ms"]
+                await set_playlist_tracks(session, playlist, resolved_tracks)
+
+            job.status = "completed"
+            job.processed = job.total
+            job.result_json = result
+            await session.commit()
+
+            return f"Build successful for job {job_id}: playlist {result['playlist_id']}"
+
+        except Exception as e:
+            await session.rollback()
+            job.status = "failed"
+            job.error = str(e)[:1024]
+            await session.commit()
+            print(f"Error during build_playlist_task for {job_id}: {e}")
+            traceback.print_exc()
+            return f"Build failed for job {job_id}: {str(e)}"
+
+
 @broker.task
 async def sync_playlist_task(playlist_id: UUID) -> str:
     """
@@ -77,13 +151,8 @@ async def sync_playlist_task(playlist_id: UUID) -> str:
             local_tracks = playlist.content_json.get("tracks", [])
             local_uris = [t["uri"] for t in local_tracks if t.get("uri") and t.get("provider") == "spotify"]
 
-            # 5. Get remote track URIs (Assuming SpotifyProvider has a method for this)
-            # For simplicity, we will force a full overwrite for the first pass of the sync engine.
-            # A true diffing engine is more complex and will be addressed later if needed.
-            # The builder logic provides a mechanism to replace all tracks.
-
-            # We use the raw client to replace all tracks.
-            await provider.replace_playlist_tracks(playlist.provider_id, local_uris)
+            # 5. Diff against the remote snapshot and apply only the changes
+            await provider.sync_playlist_tracks(playlist.provider_id, local_uris)
 
             # 6. Update last_synced_at
             playlist.last_synced_at = datetime.now(timezone.utc)
@@ -0,0 +1,70 @@
+"""playlist_track
+
+Revision ID: 3c7a5e9b1d42
+Revises: 8e1f4c7d2a90
+Create Date: 2026-10-18 14:03:27.551904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7a5e9b1d42"
+down_revision: Union[str, Sequence[str], None] = "8e1f4c7d2a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "playlist_track",
+        sa.Column("playlist_id", sa.UUID(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("artist", sa.String(length=255), nullable=True),
+        sa.Column("track", sa.String(length=255), nullable=True),
+        sa.Column("album", sa.String(length=255), nullable=True),
+        sa.Column("version", sa.String(length=50), nullable=True),
+        sa.Column("uri", sa.String(length=255), nullable=True),
+        sa.Column("provider", sa.String(length=50), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["playlist_id"], ["playlist.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("playlist_id", "position"),
+    )
+    op.create_index("ix_playlist_track_artist_lower", "playlist_track", [sa.text("lower(artist)")], unique=False)
+    op.create_index("ix_playlist_track_uri", "playlist_track", ["uri"], unique=False)
+
+    # Backfill from the existing JSON documents
+    op.execute(
+        """
+        INSERT INTO playlist_track (playlist_id, position, artist, track, album, version, uri, provider, duration_ms)
+        SELECT
+            p.id,
+            t.ordinality - 1,
+            left(t.value ->> 'artist', 255),
+            left(t.value ->> 'track', 255),
+            left(t.value ->> 'album', 255),
+            left(t.value ->> 'version', 50),
+            left(t.value ->> 'uri', 255),
+            left(t.value ->> 'provider', 50),
+            CASE WHEN jsonb_typeof(t.value -> 'duration_ms') = 'number'
+                THEN (t.value ->> 'duration_ms')::numeric::integer END
+        FROM playlist p
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(p.content_json::jsonb -> 'tracks') = 'array'
+                THEN p.content_json::jsonb -> 'tracks' ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS t(value, ordinality)
+        WHERE jsonb_typeof(t.value) = 'object'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_playlist_track_uri", table_name="playlist_track")
+    op.drop_index("ix_playlist_track_artist_lower", table_name="playlist_track")
+    op.drop_table("playlist_track")
@@ -0,0 +1,56 @@
+"""metadata_catalog
+
+Revision ID: 5b2d9e41c7a3
+Revises: cfe0aee7e7f0
+Create Date: 2026-10-18 10:12:44.318205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2d9e41c7a3"
+down_revision: Union[str, Sequence[str], None] = "cfe0aee7e7f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("artist", sa.Column("artist_type", sa.String(length=50), nullable=True))
+    op.add_column("artist", sa.Column("country", sa.String(length=50), nullable=True))
+    op.add_column("artist", sa.Column("source", sa.String(length=50), nullable=True))
+    op.add_column(
+        "artist",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.add_column("track", sa.Column("version", sa.String(length=50), nullable=True))
+    op.add_column("track", sa.Column("source", sa.String(length=50), nullable=True))
+    op.add_column(
+        "track",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_artist_name_lower", "artist", [sa.text("lower(name)")], unique=False)
+    op.create_index(
+        "ix_track_catalog_lookup",
+        "track",
+        [sa.text("lower(artist_name)"), sa.text("lower(title)"), "version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_track_catalog_lookup", table_name="track")
+    op.drop_index("ix_artist_name_lower", table_name="artist")
+    op.drop_column("track", "updated_at")
+    op.drop_column("track", "source")
+    op.drop_column("track", "version")
+    op.drop_column("artist", "updated_at")
+    op.drop_column("artist", "source")
+    op.drop_column("artist", "country")
+    op.drop_column("artist", "artist_type")
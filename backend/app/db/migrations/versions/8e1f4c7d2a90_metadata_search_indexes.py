@@ -0,0 +1,76 @@
+"""metadata_search_indexes
+
+Revision ID: 8e1f4c7d2a90
+Revises: 5b2d9e41c7a3
+Create Date: 2026-10-18 11:03:27.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1f4c7d2a90"
+down_revision: Union[str, Sequence[str], None] = "5b2d9e41c7a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "artist",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', name)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "track",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A') || "
+                "setweight(to_tsvector('english', artist_name), 'B') || "
+                "setweight(to_tsvector('english', coalesce(album_name, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_artist_name_trgm",
+        "artist",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index("ix_artist_search_vector", "artist", ["search_vector"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_track_title_trgm",
+        "track",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index("ix_track_search_vector", "track", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_track_search_vector", table_name="track")
+    op.drop_index("ix_track_title_trgm", table_name="track")
+    op.drop_index("ix_artist_search_vector", table_name="artist")
+    op.drop_index("ix_artist_name_trgm", table_name="artist")
+    op.drop_column("track", "search_vector")
+    op.drop_column("artist", "search_vector")
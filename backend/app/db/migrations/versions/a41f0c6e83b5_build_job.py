@@ -0,0 +1,47 @@
+"""build_job
+
+Revision ID: a41f0c6e83b5
+Revises: 3c7a5e9b1d42
+Create Date: 2026-10-18 15:21:09.874310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a41f0c6e83b5"
+down_revision: Union[str, Sequence[str], None] = "3c7a5e9b1d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "build_job",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("playlist_id", sa.UUID(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("request_json", sa.JSON(), nullable=False),
+        sa.Column("result_json", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(length=1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["playlist_id"], ["playlist.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_build_job_user_id"), "build_job", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_build_job_user_id"), table_name="build_job")
+    op.drop_table("build_job")
@@ -0,0 +1,77 @@
+"""unique_metadata_catalog
+
+Revision ID: d62b8f0e4a17
+Revises: a41f0c6e83b5
+Create Date: 2026-10-18 17:40:12.506318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d62b8f0e4a17"
+down_revision: Union[str, Sequence[str], None] = "a41f0c6e83b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent verifications could insert the same catalog entry twice; keep the most recent row
+    op.execute(
+        """
+        DELETE FROM track t
+        USING track newer
+        WHERE t.version IS NOT NULL
+            AND lower(newer.artist_name) = lower(t.artist_name)
+            AND lower(newer.title) = lower(t.title)
+            AND newer.version = t.version
+            AND (newer.updated_at, newer.id) > (t.updated_at, t.id)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM artist a
+        USING artist newer
+        WHERE a.source IS NOT NULL
+            AND newer.source = a.source
+            AND (
+                newer.provider_id = a.provider_id
+                OR (a.provider_id IS NULL AND newer.provider_id IS NULL AND lower(newer.name) = lower(a.name))
+            )
+            AND (newer.updated_at, newer.id) > (a.updated_at, a.id)
+        """
+    )
+
+    op.drop_index("ix_track_catalog_lookup", table_name="track")
+    op.create_index(
+        "ix_track_catalog_lookup",
+        "track",
+        [sa.text("lower(artist_name)"), sa.text("lower(title)"), "version"],
+        unique=True,
+    )
+    op.create_index("ix_artist_catalog_provider", "artist", ["source", "provider_id"], unique=True)
+    op.create_index(
+        "ix_artist_catalog_name",
+        "artist",
+        [sa.text("lower(name)"), "source"],
+        unique=True,
+        postgresql_where=sa.text("provider_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_artist_catalog_name", table_name="artist", postgresql_where=sa.text("provider_id IS NULL"))
+    op.drop_index("ix_artist_catalog_provider", table_name="artist")
+    op.drop_index("ix_track_catalog_lookup", table_name="track")
+    op.create_index(
+        "ix_track_catalog_lookup",
+        "track",
+        [sa.text("lower(artist_name)"), sa.text("lower(title)"), "version"],
+        unique=False,
+    )
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from backend.app.api.v1.api import api_router
+from backend.app.core.config import settings
 from backend.app.core.tasks import broker
+from backend.core.ai import close_gemini_client, create_gemini_client
+from backend.core.http_clients import close_http_clients, get_http_client_registry
 from contextlib import asynccontextmanager
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
@@ -9,7 +12,14 @@ from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 async def lifespan(app: FastAPI):
     if not broker.is_worker_process:
         await broker.startup()
+    # Pooled outbound HTTP clients shared by every request, closed on shutdown
+    app.state.http_clients = get_http_client_registry()
+    # One pooled Gemini client for every request instead of a new client (and TLS handshake) per call
+    app.state.gemini_client = create_gemini_client() if settings.GEMINI_API_KEY else None
     yield
+    if app.state.gemini_client:
+        await close_gemini_client(app.state.gemini_client)
+    await close_http_clients()
     if not broker.is_worker_process:
         await broker.shutdown()
 
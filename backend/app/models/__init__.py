@@ -1,15 +1,18 @@
 from .user import User, OAuthAccount
-from .playlist import Playlist
+from .playlist import Playlist, PlaylistTrack
 from .service_connection import ServiceConnection
 from .metadata import Artist, Track
 from .ai_log import AIInteractionEmbedding
+from .build_job import BuildJob
 
 __all__ = [
     "User",
     "OAuthAccount",
     "Playlist",
+    "PlaylistTrack",
     "ServiceConnection",
     "Artist",
     "Track",
     "AIInteractionEmbedding",
+    "BuildJob",
 ]
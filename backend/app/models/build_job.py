@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import ForeignKey, String, JSON, UUID, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.db.session import Base
+from typing import Any, Dict, Optional
+
+
+class BuildJob(Base):
+    """A playlist build running on the taskiq worker, polled by the client for progress."""
+
+    __tablename__ = "build_job"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Saved playlist being built; None when building from inline playlist data
+    playlist_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("playlist.id", ondelete="SET NULL"), nullable=True
+    )
+
+    # "pending", "running", "completed" or "failed"
+    status: Mapped[str] = mapped_column(String(50), default="pending", nullable=False)
+    total: Mapped[int] = mapped_column(default=0, nullable=False)
+    processed: Mapped[int] = mapped_column(default=0, nullable=False)
+
+    # Name, description, public flag and tracks to build
+    request_json: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # BuildResponse payload once completed
+    result_json: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
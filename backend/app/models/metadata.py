@@ -1,8 +1,10 @@
 import uuid
-from sqlalchemy import String, UUID
+from datetime import datetime
+from sqlalchemy import String, UUID, Computed, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from backend.app.db.session import Base
-from typing import Optional
+from typing import Any, Optional
 
 
 class Artist(Base):
@@ -13,6 +15,19 @@ class Artist(Base):
     provider_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
     genres: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
 
+    # Local metadata catalog (write-through cache of provider lookups)
+    artist_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    country: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # Full-text search document maintained by Postgres; deferred so it is never loaded or serialized
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', name)", persisted=True), nullable=True, deferred=True
+    )
+
 
 class Track(Base):
     __tablename__ = "track"
@@ -22,3 +37,44 @@ class Track(Base):
     artist_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     album_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     provider_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+
+    # Local metadata catalog: one row per verified (artist, title, version)
+    version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # Title matches rank above artist, then album matches
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', artist_name), 'B') || "
+            "setweight(to_tsvector('english', coalesce(album_name, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
+
+
+# Case-insensitive catalog lookups
+Index("ix_artist_name_lower", func.lower(Artist.name))
+Index("ix_track_catalog_lookup", func.lower(Track.artist_name), func.lower(Track.title), Track.version, unique=True)
+
+# One catalog row per provider artist, or per name for results without a provider ID (the upsert targets)
+Index("ix_artist_catalog_provider", Artist.source, Artist.provider_id, unique=True)
+Index(
+    "ix_artist_catalog_name",
+    func.lower(Artist.name),
+    Artist.source,
+    unique=True,
+    postgresql_where=Artist.provider_id.is_(None),
+)
+
+# Metadata search: trigram indexes back the % operator, GIN indexes back @@ on the generated vectors
+Index("ix_artist_name_trgm", Artist.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("ix_artist_search_vector", Artist.search_vector, postgresql_using="gin")
+Index("ix_track_title_trgm", Track.title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"})
+Index("ix_track_search_vector", Track.search_vector, postgresql_using="gin")
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import ForeignKey, String, JSON, Boolean, UUID, DateTime
+from sqlalchemy import ForeignKey, String, JSON, Boolean, UUID, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.app.db.session import Base
 from typing import TYPE_CHECKING, Any, Dict, Optional
@@ -37,3 +37,33 @@ class Playlist(Base):
     user: Mapped["User"] = relationship(back_populates="playlists")
     source_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("playlist.id", ondelete="SET NULL"), nullable=True)
     source_playlist: Mapped["Playlist"] = relationship(remote_side=[id], backref="derived_playlists")
+
+
+class PlaylistTrack(Base):
+    """
+    One row per track of a playlist, mirroring ``Playlist.content_json["tracks"]``.
+
+    The JSON document stays the source of truth for the API; these rows exist so track and artist
+    lookups (within a user's playlists or across all of them) are index scans instead of JSON scans.
+    """
+
+    __tablename__ = "playlist_track"
+    __table_args__ = (
+        Index("ix_playlist_track_artist_lower", func.lower(text("artist"))),
+        Index("ix_playlist_track_uri", "uri"),
+    )
+
+    playlist_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("playlist.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    position: Mapped[int] = mapped_column(primary_key=True)
+
+    artist: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    track: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    album: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    uri: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    provider: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    duration_ms: Mapped[Optional[int]] = mapped_column(nullable=True)
+
+    playlist: Mapped["Playlist"] = relationship()
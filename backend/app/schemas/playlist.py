@@ -28,6 +28,22 @@ class BuildResponse(BaseModel):
     total_duration_ms: int
 
 
+class BuildJobRead(BaseModel):
+    """Progress of a background build; ``result`` is set once the job completes."""
+
+    id: uuid.UUID
+    status: str  # "pending", "running", "completed" or "failed"
+    total: int
+    processed: int
+    playlist_id: Optional[uuid.UUID] = None
+    result: Optional[BuildResponse] = Field(None, validation_alias="result_json")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PlaylistBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -66,6 +82,7 @@ class GenerationRequest(BaseModel):
     prompt: str
     count: int = 20
     artists: Optional[str] = None
+    use_cache: bool = True  # Set to false to always call the AI model
 
 
 class PlaylistGenerationResponse(BaseModel):
@@ -74,6 +91,16 @@ class PlaylistGenerationResponse(BaseModel):
     tracks: List[TrackCreate]
 
 
+class GenerationEvent(BaseModel):
+    """One NDJSON line of the streaming generation response."""
+
+    status: str  # "track", "verified", "rejected", "done" or "error"
+    track: Optional[TrackCreate] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    detail: Optional[str] = None
+
+
 class VerificationRequest(BaseModel):
     tracks: List[TrackCreate]
 
@@ -83,6 +110,16 @@ class VerificationResponse(BaseModel):
     rejected: List[str]
 
 
+class VerificationEvent(BaseModel):
+    """One NDJSON line of the streaming verification response."""
+
+    status: str  # "verified", "rejected", "done" or "error"
+    track: Optional[TrackCreate] = None
+    detail: Optional[str] = None
+    verified_count: Optional[int] = None
+    rejected_count: Optional[int] = None
+
+
 class PlaylistImport(BaseModel):
     provider: str = Field(..., description="Provider name (e.g. 'spotify')")
     provider_playlist_id: str
@@ -1,10 +1,25 @@
-from typing import List, Dict, Any, Optional, cast
-from backend.core.ai import generate_playlist, verify_ai_tracks
+import logging
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Dict, Any, Optional, cast
+import numpy as np
+from backend.app.core.config import settings
+from backend.core.ai import (
+    embed_text_async,
+    generate_playlist,
+    generate_playlist_async,
+    generate_playlist_stream,
+    iter_verified_ai_tracks,
+    verify_ai_tracks,
+)
+from backend.core.generation_cache import GenerationCache, get_generation_cache
+from backend.app.services.metadata_catalog import MetadataCatalog
 from backend.core.providers.spotify import SpotifyProvider
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.ai_log import AIInteractionEmbedding
 from sqlalchemy import select
 import httpx
+from google import genai
+
+logger = logging.getLogger("backend.app.services.ai_service")
 
 
 class AIService:
@@ -13,22 +28,132 @@ class AIService:
         db: Optional[AsyncSession] = None,
         http_client: Optional[httpx.AsyncClient] = None,
         spotify_provider: Optional[SpotifyProvider] = None,
+        gemini_client: Optional[genai.Client] = None,
+        catalog: Optional[MetadataCatalog] = None,
     ):
         self.db = db
         self.http_client = http_client
         self.spotify_provider = spotify_provider
+        # Shared, lifespan-scoped client; None builds a client per generation
+        self.gemini_client = gemini_client
+        # Local metadata catalog consulted before MusicBrainz/Discogs during verification
+        self.catalog = catalog
 
-    def generate(self, prompt: str, count: int = 20, artists: Optional[str] = None) -> Dict[str, Any]:
+    @staticmethod
+    def _full_prompt(prompt: str, artists: Optional[str] = None) -> str:
         full_prompt = prompt
         if artists:
             full_prompt += f". Inspired by artists: {artists}"
-        return generate_playlist(full_prompt, count)
+        return full_prompt
+
+    def generate(
+        self, prompt: str, count: int = 20, artists: Optional[str] = None, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        return generate_playlist(
+            self._full_prompt(prompt, artists), count, use_cache=use_cache, client=self.gemini_client
+        )
+
+    async def generate_async(
+        self,
+        prompt: str,
+        count: int = 20,
+        artists: Optional[str] = None,
+        use_cache: bool = True,
+        user_id: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate for use on the event loop.
+        With semantic caching enabled, a user_id and a database session, near-duplicate prompts also
+        reuse cached results.
+        """
+        full_prompt = self._full_prompt(prompt, artists)
+        if use_cache and user_id is not None and self.db and settings.GENERATION_CACHE_SEMANTIC_ENABLED:
+            return await self._generate_with_semantic_cache(full_prompt, count, user_id)
+        return await generate_playlist_async(full_prompt, count, use_cache=use_cache, client=self.gemini_client)
+
+    async def _generate_with_semantic_cache(self, full_prompt: str, count: int, user_id: Any) -> Dict[str, Any]:
+        cache = get_generation_cache()
+        gemini_client = self.gemini_client
+        if cache is None or gemini_client is None:
+            # Embeddings only go through the shared lifespan client; without one, skip the semantic lookup
+            return await generate_playlist_async(
+                full_prompt, count, use_cache=cache is not None, client=self.gemini_client
+            )
+
+        # Exact hits skip the embedding call entirely
+        if cached := await cache.aget_playlist(GenerationCache.playlist_key(full_prompt, count, settings.GEMINI_MODEL)):
+            return cached
+
+        embedding = None
+        try:
+            embedding = await embed_text_async(full_prompt, client=gemini_client)
+            for neighbor in await self.get_nearest_interactions(embedding, limit=1):
+                distance = float(np.linalg.norm(np.asarray(neighbor.embedding) - np.asarray(embedding)))
+                if distance > settings.GENERATION_CACHE_SEMANTIC_MAX_DISTANCE:
+                    continue
+                key = GenerationCache.playlist_key(neighbor.prompt, count, settings.GEMINI_MODEL)
+                if cached := await cache.aget_playlist(key):
+                    logger.info(f"Reusing generation for similar prompt (distance {distance:.3f}).")
+                    return cached
+        except Exception as e:
+            # Semantic lookup is best-effort; fall back to a normal generation
+            logger.warning(f"Semantic generation cache lookup failed: {e}")
+
+        playlist = await generate_playlist_async(full_prompt, count, client=self.gemini_client)
+        if embedding is not None:
+            await self.store_interaction_embedding(user_id, full_prompt, embedding)
+        return playlist
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        count: int = 20,
+        artists: Optional[str] = None,
+        verify: bool = False,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream generation events: a ``track`` event per track as the model completes it (or
+        ``verified``/``rejected`` when verify is set, still in generation order), then ``done`` with the
+        playlist title and description.
+        """
+        playlist: Dict[str, Any] = {}
+
+        async def tracks() -> AsyncIterator[Dict[str, Any]]:
+            async for event in generate_playlist_stream(
+                self._full_prompt(prompt, artists), count, use_cache, client=self.gemini_client
+            ):
+                if event["type"] == "track":
+                    yield event["track"]
+                else:
+                    playlist.update(event["playlist"])
+
+        if verify:
+            async for track, verified in self.stream_verify_tracks(tracks()):
+                yield {"status": "verified" if verified else "rejected", "track": track}
+        else:
+            async for track in tracks():
+                yield {"status": "track", "track": track}
+
+        yield {"status": "done", "title": playlist.get("title"), "description": playlist.get("description")}
 
     async def verify_tracks(self, tracks: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[str]]:
         if not self.http_client or not self.spotify_provider:
             # Should not happen in FastAPI, but for core use, raise error
             raise ValueError("HTTP client and Spotify provider required for metadata verification.")
-        return await verify_ai_tracks(tracks, http_client=self.http_client, spotify_provider=self.spotify_provider)
+        return await verify_ai_tracks(
+            tracks, http_client=self.http_client, spotify_provider=self.spotify_provider, catalog=self.catalog
+        )
+
+    def stream_verify_tracks(
+        self, tracks: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]]
+    ) -> AsyncIterator[tuple[Dict[str, Any], bool]]:
+        """Yield ``(track, verified)`` in input order as each track's verification completes."""
+        if not self.http_client or not self.spotify_provider:
+            raise ValueError("HTTP client and Spotify provider required for metadata verification.")
+        return iter_verified_ai_tracks(
+            tracks, http_client=self.http_client, spotify_provider=self.spotify_provider, catalog=self.catalog
+        )
 
     async def store_interaction_embedding(
         self, user_id: Any, prompt: str, embedding: List[float]
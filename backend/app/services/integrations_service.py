@@ -1,8 +1,8 @@
-import httpx
 from datetime import datetime, timedelta, UTC
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.service_connection import ServiceConnection
 from backend.app.core.config import settings
+from backend.core.http_clients import get_shared_http_client
 
 
 class IntegrationsService:
@@ -33,32 +33,29 @@ class IntegrationsService:
         if not client_id or not client_secret:
             raise Exception("Spotify Relay credentials not found.")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://accounts.spotify.com/api/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": connection.refresh_token,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
+        client = get_shared_http_client()
+        response = await client.post(
+            "https://accounts.spotify.com/api/token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": connection.refresh_token,
+                "client_id": client_id,
+                "client_secret": client_secret,
+            },
+        )
+
+        if response.status_code != 200:
+            error_data = response.json()
+            raise Exception(
+                f"Failed to refresh Spotify token: " f"{error_data.get('error_description', error_data.get('error'))}"
             )
 
-            if response.status_code != 200:
-                error_data = response.json()
-                raise Exception(
-                    f"Failed to refresh Spotify token: "
-                    f"{error_data.get('error_description', error_data.get('error'))}"
-                )
+        token_data = response.json()
+        connection.access_token = token_data["access_token"]
+        if "refresh_token" in token_data:
+            connection.refresh_token = token_data["refresh_token"]
 
-            token_data = response.json()
-            connection.access_token = token_data["access_token"]
-            if "refresh_token" in token_data:
-                connection.refresh_token = token_data["refresh_token"]
+        connection.expires_at = (datetime.now(UTC) + timedelta(seconds=token_data["expires_in"])).replace(tzinfo=None)
 
-            connection.expires_at = (datetime.now(UTC) + timedelta(seconds=token_data["expires_in"])).replace(
-                tzinfo=None
-            )
-
-            await self.db.commit()
-            return connection.access_token
+        await self.db.commit()
+        return connection.access_token
@@ -0,0 +1,174 @@
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from backend.app.core.config import settings
+from backend.app.db.session import async_session_maker
+from backend.app.models.metadata import Artist, Track
+
+logger = logging.getLogger("backend.app.services.metadata_catalog")
+
+
+def _normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+class MetadataCatalog:
+    """
+    Write-through catalog of provider lookups, stored in the artist and track tables.
+
+    Every call uses its own short-lived session so concurrent verifications can share one catalog.
+    Database errors are logged and treated as misses: the catalog never fails a provider lookup.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        max_age: Optional[timedelta] = None,
+    ):
+        self.session_maker = session_maker
+        self.max_age = max_age if max_age is not None else timedelta(days=settings.METADATA_CATALOG_MAX_AGE_DAYS)
+
+    def _fresh_since(self) -> datetime:
+        return datetime.now(UTC) - self.max_age
+
+    async def get_artist(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a cataloged artist in MusicBrainz search-result shape, or None."""
+        stmt = (
+            select(Artist)
+            .where(
+                func.lower(Artist.name) == _normalize(name),
+                Artist.source.is_not(None),
+                Artist.updated_at >= self._fresh_since(),
+            )
+            .order_by(Artist.updated_at.desc())
+            .limit(1)
+        )
+        try:
+            async with self.session_maker() as session:
+                artist = (await session.execute(stmt)).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Metadata catalog lookup failed for artist {name}: {e}")
+            return None
+        if artist is None:
+            return None
+        return {"id": artist.provider_id, "name": artist.name, "type": artist.artist_type, "country": artist.country}
+
+    async def store_artist(self, data: Dict[str, Any], source: str = "musicbrainz") -> None:
+        """Insert or refresh an artist from a provider search result."""
+        if not data.get("name"):
+            return
+        stmt = insert(Artist).values(
+            name=data["name"],
+            provider_id=data.get("id"),
+            artist_type=data.get("type"),
+            country=data.get("country"),
+            source=source,
+        )
+        # One upsert against the catalog's unique index, so concurrent verifications never insert an artist twice
+        if data.get("id"):
+            conflict_target, conflict_where = [Artist.source, Artist.provider_id], None
+        else:
+            conflict_target, conflict_where = [func.lower(Artist.name), Artist.source], Artist.provider_id.is_(None)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_target,
+            index_where=conflict_where,
+            set_={"artist_type": stmt.excluded.artist_type, "country": stmt.excluded.country, "updated_at": func.now()},
+        )
+        try:
+            async with self.session_maker() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to store artist {data.get('name')} in metadata catalog: {e}")
+
+    async def has_track(self, artist: str, title: str, version: str) -> bool:
+        """Whether this artist/title/version was verified recently."""
+        stmt = (
+            select(Track.id)
+            .where(
+                func.lower(Track.artist_name) == _normalize(artist),
+                func.lower(Track.title) == _normalize(title),
+                Track.version == version,
+                Track.updated_at >= self._fresh_since(),
+            )
+            .limit(1)
+        )
+        try:
+            async with self.session_maker() as session:
+                return (await session.execute(stmt)).scalar_one_or_none() is not None
+        except Exception as e:
+            logger.warning(f"Metadata catalog lookup failed for {artist} - {title}: {e}")
+            return False
+
+    async def store_track(
+        self,
+        artist: str,
+        title: str,
+        version: str,
+        source: str,
+        provider_id: Optional[str] = None,
+        album: Optional[str] = None,
+    ) -> None:
+        """Insert or refresh a verified track."""
+        # One upsert against the catalog's unique index, so concurrent verifications never insert a track twice
+        stmt = insert(Track).values(
+            artist_name=artist, title=title, version=version, source=source, provider_id=provider_id, album_name=album
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[func.lower(Track.artist_name), func.lower(Track.title), Track.version],
+            set_={
+                "source": stmt.excluded.source,
+                "provider_id": func.coalesce(stmt.excluded.provider_id, Track.provider_id),
+                "album_name": func.coalesce(stmt.excluded.album_name, Track.album_name),
+                "updated_at": func.now(),
+            },
+        )
+        try:
+            async with self.session_maker() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to store {artist} - {title} in metadata catalog: {e}")
+
+
+def artist_search_stmt(q: str, limit: int = 10) -> Select:
+    """
+    Fuzzy (trigram ``%``) or full-text artist search, best matches first.
+    Both predicates are served by GIN indexes, so the query never scans the whole table.
+    """
+    tsquery = func.plainto_tsquery("english", q)
+    rank = func.similarity(Artist.name, q) + func.ts_rank(Artist.search_vector, tsquery)
+    return (
+        select(Artist)
+        .where(or_(Artist.name.op("%")(q), Artist.search_vector.bool_op("@@")(tsquery)))
+        .order_by(rank.desc())
+        .limit(limit)
+    )
+
+
+def track_search_stmt(q: str, limit: int = 10) -> Select:
+    """Fuzzy title or full-text (title, artist, album) track search, best matches first."""
+    tsquery = func.plainto_tsquery("english", q)
+    rank = func.similarity(Track.title, q) + func.ts_rank(Track.search_vector, tsquery)
+    return (
+        select(Track)
+        .where(or_(Track.title.op("%")(q), Track.search_vector.bool_op("@@")(tsquery)))
+        .order_by(rank.desc())
+        .limit(limit)
+    )
+
+
+_metadata_catalog: Optional[MetadataCatalog] = None
+
+
+def get_metadata_catalog() -> Optional[MetadataCatalog]:
+    """Return the process-wide metadata catalog, or None when the catalog is disabled."""
+    global _metadata_catalog
+    if not settings.METADATA_CATALOG_ENABLED:
+        return None
+    if _metadata_catalog is None:
+        _metadata_catalog = MetadataCatalog()
+    return _metadata_catalog
@@ -1,12 +1,18 @@
 from backend.core.metadata import MetadataVerifier
 from backend.core.providers.spotify import SpotifyProvider
+from backend.app.services.metadata_catalog import MetadataCatalog
 from typing import Optional, Dict, Any
 import httpx
 
 
 class MetadataService:
-    def __init__(self, http_client: httpx.AsyncClient, spotify_provider: SpotifyProvider):
-        self.verifier = MetadataVerifier(http_client=http_client, spotify_provider=spotify_provider)
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        spotify_provider: SpotifyProvider,
+        catalog: Optional[MetadataCatalog] = None,
+    ):
+        self.verifier = MetadataVerifier(http_client=http_client, spotify_provider=spotify_provider, catalog=catalog)
 
     async def get_artist_info(self, artist_name: str) -> Optional[Dict[str, Any]]:
         """Fetch enriched metadata for an artist."""
@@ -0,0 +1,61 @@
+import uuid
+from typing import Any
+
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.playlist import Playlist, PlaylistTrack
+
+
+def _clip(value: Any, length: int) -> str | None:
+    # Track dicts are free-form JSON; keep the normalized rows within their column sizes
+    return str(value)[:length] if value is not None else None
+
+
+def playlist_track_rows(playlist: Playlist, tracks: list[dict[str, Any]]) -> list[PlaylistTrack]:
+    """Build the normalized rows for a playlist's tracks, in playlist order."""
+    rows = []
+    for position, track in enumerate(tracks):
+        duration = track.get("duration_ms")
+        rows.append(
+            PlaylistTrack(
+                playlist=playlist,
+                position=position,
+                artist=_clip(track.get("artist"), 255),
+                track=_clip(track.get("track"), 255),
+                album=_clip(track.get("album"), 255),
+                version=_clip(track.get("version"), 50),
+                uri=_clip(track.get("uri"), 255),
+                provider=_clip(track.get("provider"), 50),
+                duration_ms=duration if isinstance(duration, int) else None,
+            )
+        )
+    return rows
+
+
+async def set_playlist_tracks(db: AsyncSession, playlist: Playlist, tracks: list[dict[str, Any]]) -> None:
+    """
+    Store ``tracks`` as the playlist's content and replace its normalized rows to match.
+
+    Every write to ``content_json["tracks"]`` should go through here so the ``playlist_track``
+    table never drifts from the JSON document. Nothing is flushed; the caller commits as usual.
+    """
+    content = dict(playlist.content_json or {})
+    content["tracks"] = tracks
+    playlist.content_json = content
+
+    if playlist.id is None:
+        # New playlist: assign the key now so the rows can reference it, nothing to replace
+        playlist.id = uuid.uuid4()
+    else:
+        await db.execute(delete(PlaylistTrack).where(PlaylistTrack.playlist_id == playlist.id))
+    db.add_all(playlist_track_rows(playlist, tracks))
+
+
+def playlists_with_artist_stmt(artist: str, user_id: uuid.UUID | None = None) -> Select:
+    """Live playlists containing ``artist`` (case-insensitive), optionally limited to one user."""
+    track_match = select(PlaylistTrack.playlist_id).where(func.lower(PlaylistTrack.artist) == artist.lower())
+    stmt = select(Playlist).where(Playlist.deleted_at.is_(None), Playlist.id.in_(track_match))
+    if user_id is not None:
+        stmt = stmt.where(Playlist.user_id == user_id)
+    return stmt
@@ -1,18 +1,28 @@
+import asyncio
 import json
 import logging
-from typing import Any, TYPE_CHECKING
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Sized, TYPE_CHECKING, TypeVar
 from google import genai
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from backend.app.core.config import settings
+from .generation_cache import GenerationCache, get_generation_cache
 from .metadata import MetadataVerifier
+from .model_registry import DEFAULT_FALLBACK_MODEL, get_model_registry
+from .utils.json_stream import TrackStreamParser
 import httpx
 
 if TYPE_CHECKING:
+    from backend.app.services.metadata_catalog import MetadataCatalog
     from .providers.spotify import SpotifyProvider
 
 logger = logging.getLogger("backend.core.ai")
 
+# Tracks verified at once; MusicBrainz calls are still paced by its shared limiter
+VERIFY_CONCURRENCY = 8
+
+T = TypeVar("T")
+
 SYSTEM_PROMPT = """
 You are a professional music curator. Your goal is to generate a list of songs based on the user's
 description.
@@ -66,6 +76,27 @@ def get_ai_api_key() -> str:
     raise ValueError("Gemini API Key not found. Please set GEMINI_API_KEY in your environment.")
 
 
+def create_gemini_client(api_key: str | None = None) -> genai.Client:
+    """Build a Gemini client whose sync and async transports share a bounded keep-alive pool."""
+    limits = httpx.Limits(
+        max_connections=settings.GEMINI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.GEMINI_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    http_options = types.HttpOptions(
+        client_args={"limits": limits},
+        # An explicit transport keeps async calls on pooled httpx instead of an unbounded aiohttp session
+        async_client_args={"transport": httpx.AsyncHTTPTransport(limits=limits)},
+    )
+    return genai.Client(api_key=api_key or get_ai_api_key(), http_options=http_options)
+
+
+async def close_gemini_client(client: genai.Client) -> None:
+    """Close both connection pools of a client built by create_gemini_client."""
+    client.close()
+    await client.aio.aclose()
+
+
 @retry(
     retry=retry_if_exception(is_retryable_error),
     stop=stop_after_attempt(3),
@@ -77,6 +108,17 @@ def generate_content_with_retry(client, model, contents, config):
     return client.models.generate_content(model=model, contents=contents, config=config)
 
 
+@retry(
+    retry=retry_if_exception(is_retryable_error),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    reraise=True,
+)
+async def generate_content_with_retry_async(client, model, contents, config):
+    """Async generate_content through the SDK's aio client; retries back off with asyncio.sleep."""
+    return await client.aio.models.generate_content(model=model, contents=contents, config=config)
+
+
 def list_available_models(client: genai.Client | None = None) -> list[str]:
     """List available Gemini models for the configured key."""
     if not client:
@@ -98,33 +140,38 @@ def list_available_models(client: genai.Client | None = None) -> list[str]:
 
 
 def discover_fallback_model(client: genai.Client) -> str:
-    """Dynamically discover the best available Flash model as a fallback."""
+    """Pick the best available Flash model from the cached model registry."""
     try:
-        available = list_available_models(client)
-        # Filter for 'flash' models and strip 'models/' prefix
-        flash_models = [m.replace("models/", "") for m in available if "flash" in m.lower()]
-
-        if flash_models:
-            # Sort reverse alphabetically (e.g. gemini-2.0 > gemini-1.5)
-            flash_models.sort(reverse=True)
-            return flash_models[0]
-
+        return get_model_registry().fallback_model(client)
     except Exception as e:
         logger.warning(f"Could not discovery fallback models: {e}")
 
     # Ultimate fallback
-    return "gemini-2.0-flash"
+    return DEFAULT_FALLBACK_MODEL
 
 
-def generate_playlist(description: str, count: int = 20) -> dict[str, Any]:
-    """Generate a playlist structure using Google Gemini (via google-genai SDK)."""
-    api_key = get_ai_api_key()
-    client = genai.Client(api_key=api_key)
+async def resolve_model_async(model: str, client: genai.Client) -> str:
+    """Skip a model that failed recently without another request; only a cold registry lists off the loop."""
+    if not get_model_registry().recently_failed(model):
+        return model
+    return await asyncio.to_thread(get_model_registry().resolve, model, client)
+
+
+async def embed_text_async(text: str, client: genai.Client) -> list[float]:
+    """Embed text with the configured Gemini embedding model through the shared client."""
+    result = await client.aio.models.embed_content(model=settings.GEMINI_EMBEDDING_MODEL, contents=text)
+    values = result.embeddings[0].values if result.embeddings else None
+    if not values:
+        raise ValueError("Gemini returned an empty embedding.")
+    return list(values)
 
-    # Default to user preference or the latest alias
-    model_name = settings.GEMINI_MODEL
 
-    # Construct the user prompt
+# Every generation asks for raw JSON matching SYSTEM_PROMPT's schema
+GENERATION_CONFIG = types.GenerateContentConfig(response_mime_type="application/json")
+
+
+def build_generation_contents(description: str, count: int) -> list[str]:
+    """Build the Gemini request contents for a playlist description."""
     user_message = f"""
     Create a playlist based on this description: "{description}".
 
@@ -132,32 +179,23 @@ def generate_playlist(description: str, count: int = 20) -> dict[str, Any]:
     ignore the default count of {count} and instead generate enough tracks to satisfy
     that total runtime. Otherwise, generate exactly {count} tracks.
     """
-    contents = [SYSTEM_PROMPT, user_message]
-    config = types.GenerateContentConfig(response_mime_type="application/json")
+    return [SYSTEM_PROMPT, user_message]
 
-    response = None
-    try:
-        logger.info(f"Sending request to Gemini (Model: {model_name})...")
-        response = generate_content_with_retry(client=client, model=model_name, contents=contents, config=config)
-    except Exception as e:
-        if not is_retryable_error(e):
-            logger.warning(f"Model '{model_name}' not found or unavailable. Attempting fallback...")
-            fallback = discover_fallback_model(client)
-            if fallback and fallback != model_name:
-                logger.info(f"Retrying with fallback model: {fallback}")
-                response = generate_content_with_retry(client=client, model=fallback, contents=contents, config=config)
-            else:
-                raise
-        else:
-            raise
 
+def parse_generation_response(response: Any, description: str) -> dict[str, Any]:
+    """Parse a Gemini response into the {title, description, tracks} playlist structure."""
     logger.info("Received response from Gemini.")
 
     if not response or not hasattr(response, "text") or not response.text:
         logger.error(f"Invalid or empty response from Gemini. Response: {response}")
         raise ValueError("AI failed to generate a valid response. Please try a different prompt.")
 
-    text = response.text.strip()
+    return parse_generation_text(response.text, description)
+
+
+def parse_generation_text(text: str, description: str) -> dict[str, Any]:
+    """Parse raw generated JSON text into the playlist structure."""
+    text = text.strip()
 
     # Clean up response text if it accidentally contains markdown
     if text.startswith("```json"):
@@ -183,37 +221,257 @@ def generate_playlist(description: str, count: int = 20) -> dict[str, Any]:
     raise ValueError("AI response format invalid (expected list or object with 'tracks').")
 
 
-async def verify_ai_tracks(
-    tracks: list[dict[str, Any]],
+def generation_cache_for(description: str, count: int, use_cache: bool = True) -> tuple[GenerationCache | None, str]:
+    """Return the generation cache (None when disabled) and the key for a request."""
+    cache = get_generation_cache() if use_cache else None
+    return cache, GenerationCache.playlist_key(description, count, settings.GEMINI_MODEL)
+
+
+def fallback_model_for(error: Exception, model_name: str, client: genai.Client) -> str | None:
+    """
+    Handle a failed generation request: for a missing or unavailable model, mark it failed and
+    return the fallback to retry with. None means there is nothing to retry and the error stands.
+    """
+    if is_retryable_error(error):
+        return None
+    logger.warning(f"Model '{model_name}' not found or unavailable. Attempting fallback...")
+    get_model_registry().mark_failed(model_name)
+    fallback = discover_fallback_model(client)
+    if not fallback or fallback == model_name:
+        return None
+    logger.info(f"Retrying with fallback model: {fallback}")
+    return fallback
+
+
+def call_with_model_fallback(call: Callable[[str], T], model_name: str, client: genai.Client) -> T:
+    """Run ``call(model_name)``, retrying once with the fallback model if the model is unavailable."""
+    try:
+        return call(model_name)
+    except Exception as e:
+        fallback = fallback_model_for(e, model_name, client)
+        if fallback is None:
+            raise
+        return call(fallback)
+
+
+async def call_with_model_fallback_async(
+    call: Callable[[str], Awaitable[T]], model_name: str, client: genai.Client
+) -> T:
+    """Async variant of call_with_model_fallback."""
+    try:
+        return await call(model_name)
+    except Exception as e:
+        # A cold registry pages through the sync client, so run discovery off the loop
+        fallback = await asyncio.to_thread(fallback_model_for, e, model_name, client)
+        if fallback is None:
+            raise
+        return await call(fallback)
+
+
+def generate_playlist(
+    description: str, count: int = 20, use_cache: bool = True, client: genai.Client | None = None
+) -> dict[str, Any]:
+    """
+    Generate a playlist structure using Google Gemini (via google-genai SDK).
+    Pass a shared client (see create_gemini_client) to reuse its connections; otherwise one is built per call.
+    """
+    cache, cache_key = generation_cache_for(description, count, use_cache)
+    if cache and (cached := cache.get_playlist(cache_key)):
+        logger.info("Using cached playlist generation.")
+        return cached
+
+    gemini = client or genai.Client(api_key=get_ai_api_key())
+    # Default to user preference or the latest alias
+    model_name = get_model_registry().resolve(settings.GEMINI_MODEL, gemini)
+    contents = build_generation_contents(description, count)
+
+    def generate(model: str) -> Any:
+        logger.info(f"Sending request to Gemini (Model: {model})...")
+        return generate_content_with_retry(client=gemini, model=model, contents=contents, config=GENERATION_CONFIG)
+
+    response = call_with_model_fallback(generate, model_name, gemini)
+
+    playlist = parse_generation_response(response, description)
+    if cache:
+        cache.set_playlist(cache_key, playlist)
+    return playlist
+
+
+async def generate_playlist_async(
+    description: str, count: int = 20, use_cache: bool = True, client: genai.Client | None = None
+) -> dict[str, Any]:
+    """Async variant of generate_playlist that never blocks the event loop."""
+    cache, cache_key = generation_cache_for(description, count, use_cache)
+    if cache and (cached := await cache.aget_playlist(cache_key)):
+        logger.info("Using cached playlist generation.")
+        return cached
+
+    gemini = client or genai.Client(api_key=get_ai_api_key())
+    model_name = await resolve_model_async(settings.GEMINI_MODEL, gemini)
+    contents = build_generation_contents(description, count)
+
+    async def generate(model: str) -> Any:
+        logger.info(f"Sending request to Gemini (Model: {model})...")
+        return await generate_content_with_retry_async(
+            client=gemini, model=model, contents=contents, config=GENERATION_CONFIG
+        )
+
+    response = await call_with_model_fallback_async(generate, model_name, gemini)
+
+    playlist = parse_generation_response(response, description)
+    if cache:
+        await cache.aset_playlist(cache_key, playlist)
+    return playlist
+
+
+@retry(
+    retry=retry_if_exception(is_retryable_error),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    reraise=True,
+)
+async def open_content_stream_with_retry(client, model, contents, config) -> tuple[str, AsyncIterator[Any]]:
+    """Start a streaming generation and wait for its first chunk, retrying failures before any output."""
+    stream = await client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+    first = await anext(stream, None)
+    return (getattr(first, "text", None) or ""), stream
+
+
+async def generate_playlist_stream(
+    description: str, count: int = 20, use_cache: bool = True, client: genai.Client | None = None
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Stream a playlist from Gemini, yielding ``{"type": "track", "track": {...}}`` for every track as
+    soon as its JSON object is complete, then ``{"type": "playlist", "playlist": {...}}`` with the
+    fully parsed result. Cached playlists are replayed through the same events.
+    """
+    cache, cache_key = generation_cache_for(description, count, use_cache)
+    if cache and (cached := await cache.aget_playlist(cache_key)):
+        logger.info("Using cached playlist generation.")
+        for track in cached["tracks"]:
+            yield {"type": "track", "track": track}
+        yield {"type": "playlist", "playlist": cached}
+        return
+
+    gemini = client or genai.Client(api_key=get_ai_api_key())
+    model_name = await resolve_model_async(settings.GEMINI_MODEL, gemini)
+    contents = build_generation_contents(description, count)
+
+    async def open_stream(model: str) -> tuple[str, AsyncIterator[Any]]:
+        logger.info(f"Streaming request to Gemini (Model: {model})...")
+        return await open_content_stream_with_retry(gemini, model, contents, GENERATION_CONFIG)
+
+    first_text, stream = await call_with_model_fallback_async(open_stream, model_name, gemini)
+
+    parser = TrackStreamParser()
+    for track in parser.feed(first_text):
+        yield {"type": "track", "track": track}
+    async for chunk in stream:
+        for track in parser.feed(getattr(chunk, "text", None) or ""):
+            yield {"type": "track", "track": track}
+
+    logger.info("Received streamed response from Gemini.")
+    if not parser.buffer.strip():
+        raise ValueError("AI failed to generate a valid response. Please try a different prompt.")
+    playlist = parse_generation_text(parser.buffer, description)
+    if cache:
+        await cache.aset_playlist(cache_key, playlist)
+    yield {"type": "playlist", "playlist": playlist}
+
+
+async def _verify_ai_track(verifier: MetadataVerifier, item: dict[str, Any]) -> bool | None:
+    """Verify one AI track; None means the entry was unusable and is dropped."""
+    artist = item.get("artist")
+    track = item.get("track")
+    version = item.get("version")
+
+    if not artist or not track:
+        return None
+
+    try:
+        # We use verify_track_version which checks for existence + version
+        # If version is None or 'studio', it just checks existence
+        return bool(await verifier.verify_track_version(artist, track, version or "studio"))
+    except Exception as e:
+        logger.debug(f"Verification failed for {artist} - {track}: {e}")
+        # If API fails, we lean towards keeping it but maybe warning?
+        # For now, let's keep it if MB is down, but reject if MB says no.
+        return True
+
+
+async def iter_verified_ai_tracks(
+    tracks: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
     http_client: httpx.AsyncClient,
     spotify_provider: "SpotifyProvider",
-) -> tuple[list[dict[str, Any]], list[str]]:
-    """Verify AI-generated tracks against MusicBrainz."""
-    verifier = MetadataVerifier(http_client=http_client, spotify_provider=spotify_provider)
-    verified_tracks = []
-    rejected_tracks = []
+    max_concurrency: int = VERIFY_CONCURRENCY,
+    catalog: "MetadataCatalog | None" = None,
+) -> AsyncIterator[tuple[dict[str, Any], bool]]:
+    """
+    Verify AI-generated tracks concurrently, yielding ``(track, verified)`` in input order.
 
-    logger.info(f"Verifying {len(tracks)} tracks against MusicBrainz...")
+    Up to ``max_concurrency`` tracks are in flight at once. MusicBrainz lookups still queue on the
+    shared MusicBrainz limiter, while Discogs fallbacks run alongside them, so total latency tracks the
+    slowest provider instead of the sum of every lookup. ``tracks`` may be an async iterable (such as
+    a generation stream); each track starts verifying as soon as it arrives. Tracks already in the
+    local ``catalog`` skip the providers entirely.
+    """
+    verifier = MetadataVerifier(http_client=http_client, spotify_provider=spotify_provider, catalog=catalog)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    scheduled: asyncio.Queue[tuple[dict[str, Any], asyncio.Future] | None] = asyncio.Queue()
+    tasks: list[asyncio.Future] = []
 
-    for item in tracks:
-        artist = item.get("artist")
-        track = item.get("track")
-        version = item.get("version")
+    async def verify(item: dict[str, Any]) -> bool | None:
+        async with semaphore:
+            return await _verify_ai_track(verifier, item)
 
-        if not artist or not track:
-            continue
+    def schedule(item: dict[str, Any]) -> None:
+        task = asyncio.ensure_future(verify(item))
+        tasks.append(task)
+        scheduled.put_nowait((item, task))
 
+    async def feed() -> None:
         try:
-            # We use verify_track_version which checks for existence + version
-            # If version is None or 'studio', it just checks existence
-            if await verifier.verify_track_version(artist, track, version or "studio"):
-                verified_tracks.append(item)
+            if isinstance(tracks, AsyncIterable):
+                async for item in tracks:
+                    schedule(item)
             else:
-                rejected_tracks.append(f"{artist} - {track}")
-        except Exception as e:
-            logger.debug(f"Verification failed for {artist} - {track}: {e}")
-            # If API fails, we lean towards keeping it but maybe warning?
-            # For now, let's keep it if MB is down, but reject if MB says no.
+                for item in tracks:
+                    schedule(item)
+        finally:
+            scheduled.put_nowait(None)
+
+    if isinstance(tracks, Sized):
+        logger.info(f"Verifying {len(tracks)} tracks against MusicBrainz...")
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while (entry := await scheduled.get()) is not None:
+            item, task = entry
+            result = await task
+            if result is not None:
+                yield item, result
+        # Surface errors from the track source
+        await feeder
+    finally:
+        feeder.cancel()
+        for task in tasks:
+            task.cancel()
+
+
+async def verify_ai_tracks(
+    tracks: list[dict[str, Any]],
+    http_client: httpx.AsyncClient,
+    spotify_provider: "SpotifyProvider",
+    catalog: "MetadataCatalog | None" = None,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Verify AI-generated tracks against the local catalog and MusicBrainz."""
+    verified_tracks = []
+    rejected_tracks = []
+
+    async for item, verified in iter_verified_ai_tracks(tracks, http_client, spotify_provider, catalog=catalog):
+        if verified:
             verified_tracks.append(item)
+        else:
+            rejected_tracks.append(f"{item['artist']} - {item['track']}")
 
     return verified_tracks, rejected_tracks
@@ -0,0 +1,101 @@
+import logging
+from typing import Any, Awaitable, Callable
+
+from backend.core.providers.spotify import SpotifyProvider, spotify_track_id
+
+logger = logging.getLogger("backend.core.build_engine")
+
+# Called with (resolved so far, total) after each track search completes
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+async def resolve_tracks(
+    provider: SpotifyProvider,
+    tracks: list[dict[str, Any]],
+    concurrency: int | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> list[dict[str, Any] | None]:
+    """
+    Find every track on Spotify: tracks with a known Spotify URI are fetched 50 at a time, the rest
+    are searched with up to ``concurrency`` searches in flight and their candidate pages scored
+    together in one batch.
+
+    Returns the best match (or None) for each track, in input order. ``on_progress`` is awaited from
+    this coroutine only, one completion at a time, so it may safely use a database session.
+    """
+    matches: list[dict[str, Any] | None] = [None] * len(tracks)
+
+    # Tracks that already carry a Spotify URI (e.g. imported playlists) are fetched in bulk, not searched
+    known_uris = [uri for t in tracks if (uri := t.get("uri")) and spotify_track_id(uri)]
+    hydrated: dict[str, dict[str, Any]] = {}
+    if known_uris:
+        try:
+            hydrated = await provider.get_tracks(known_uris)
+        except Exception as e:
+            logger.warning(f"Bulk track lookup failed, searching every track instead: {e}")
+    to_search = []
+    for index, track in enumerate(tracks):
+        uri = track.get("uri")
+        match = hydrated.get(uri) if uri else None
+        if match is None:
+            to_search.append(index)
+        matches[index] = match
+    done = len(tracks) - len(to_search)
+    if on_progress and done:
+        await on_progress(done, len(tracks))
+
+    async def on_searched() -> None:
+        nonlocal done
+        done += 1
+        if on_progress:
+            await on_progress(done, len(tracks))
+
+    found = await provider.search_tracks(
+        [tracks[i] for i in to_search], concurrency=concurrency, on_searched=on_searched
+    )
+    for index, match in zip(to_search, found):
+        matches[index] = match
+    return matches
+
+
+async def build_playlist(
+    provider: SpotifyProvider,
+    name: str,
+    description: str,
+    tracks: list[dict[str, Any]],
+    public: bool = False,
+    concurrency: int | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """
+    Create a Spotify playlist and fill it with the best match for each track.
+
+    Returns the build summary (playlist id, url, failed and actual tracks, total duration) plus
+    ``tracks``: the requested tracks in order, with the resolved URI and duration attached to each
+    track that was found.
+    """
+    matches = await resolve_tracks(provider, tracks, concurrency=concurrency, on_progress=on_progress)
+
+    actual_tracks: list[dict[str, Any]] = []
+    failed: list[str] = []
+    resolved: list[dict[str, Any]] = []
+    for track, match in zip(tracks, matches):
+        if match is None:
+            failed.append(f"{track.get('artist', '')} - {track.get('track', '')}")
+            resolved.append(track)
+            continue
+        actual_tracks.append(match)
+        resolved.append({**track, "uri": match["uri"], "duration_ms": match.get("duration_ms"), "provider": "spotify"})
+
+    playlist_id = await provider.create_playlist(name, description, public=public)
+    await provider.add_tracks_to_playlist(playlist_id, [t["uri"] for t in actual_tracks])
+
+    return {
+        "status": "success",
+        "playlist_id": playlist_id,
+        "url": f"https://open.spotify.com/playlist/{playlist_id}",
+        "failed_tracks": failed,
+        "actual_tracks": actual_tracks,
+        "total_duration_ms": sum(t.get("duration_ms") or 0 for t in actual_tracks),
+        "tracks": resolved,
+    }
@@ -28,11 +28,14 @@ def main(
 def build(
     json_file: Annotated[Path, typer.Argument(exists=True, help="Path to playlist JSON file")],
     dry_run: Annotated[bool, typer.Option("--dry-run", help="Verify tracks without creating playlist")] = False,
+    workers: Annotated[
+        int, typer.Option("--workers", "-w", min=1, help="Number of tracks to resolve concurrently")
+    ] = 4,
 ) -> None:
     """Build or update a Spotify playlist from a JSON file."""
     try:
         builder = get_builder()
-        builder.build_playlist_from_json(str(json_file), dry_run=dry_run)
+        builder.build_playlist_from_json(str(json_file), dry_run=dry_run, max_workers=workers)
     except Exception as e:
         logger.error(f"Error: {e}")
         raise typer.Exit(code=1)
@@ -55,11 +58,33 @@ def export(
 @app.command()
 def backup(
     output_dir: Annotated[Path, typer.Argument(help="Directory to save backup files")] = Path("backups"),
+    workers: Annotated[
+        int, typer.Option("--workers", "-w", min=1, help="Number of playlists to export concurrently")
+    ] = 4,
+    force: Annotated[bool, typer.Option("--force", help="Export every playlist, even if unchanged")] = False,
 ) -> None:
-    """Backup all user playlists to JSON files."""
+    """Backup all user playlists to JSON files, skipping playlists unchanged since the last backup."""
     try:
         builder = get_builder()
-        builder.backup_all_playlists(str(output_dir))
+        builder.backup_all_playlists(str(output_dir), max_workers=workers, force=force)
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command("forget-track")
+def forget_track_cmd(
+    artist: Annotated[str, typer.Argument(help="Artist name as written in the playlist")],
+    track: Annotated[str, typer.Argument(help="Track name as written in the playlist")],
+    album: Annotated[str | None, typer.Option("--album", help="Album, if the playlist entry has one")] = None,
+    version: Annotated[str | None, typer.Option("--version", help="Version, if the playlist entry has one")] = None,
+) -> None:
+    """Drop a track's cached search results so the next build searches Spotify again."""
+    from .search_cache import get_search_cache
+
+    try:
+        get_search_cache().invalidate(artist, track, album=album, version=version)
+        logger.info(f"Forgot cached search results for {artist} - {track}")
     except Exception as e:
         logger.error(f"Error: {e}")
         raise typer.Exit(code=1)
@@ -104,10 +129,10 @@ def uninstall_completion_cmd() -> None:
 @app.command("ai-models")
 def ai_models_cmd() -> None:
     """List available Gemini models for your API key."""
-    from .ai import list_available_models
+    from .model_registry import get_model_registry
 
     try:
-        models = list_available_models()
+        models = get_model_registry().available_models()
         logger.info("Available Gemini Models:")
         for model in models:
             print(f"- {model}")
@@ -125,6 +150,9 @@ def generate_cmd(
         bool,
         typer.Option("--build", "-b", help="Immediately build playlist on Spotify"),
     ] = False,
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Always call the AI model, ignoring cached results")
+    ] = False,
 ) -> None:
     """Generate a playlist using AI and verify tracks."""
     from .ai import generate_playlist, verify_ai_tracks
@@ -145,7 +173,7 @@ def generate_cmd(
         full_prompt += f". Inspired by artists: {artists}"
 
     try:
-        generated_data = generate_playlist(full_prompt, count)
+        generated_data = generate_playlist(full_prompt, count, use_cache=not no_cache)
         raw_tracks = generated_data["tracks"]
         title = generated_data["title"]
         description = generated_data.get("description", "")
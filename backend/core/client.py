@@ -2,14 +2,30 @@ import spotipy
 import logging
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from spotipy.oauth2 import SpotifyOAuth
-import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import AsyncMock
 import httpx
+from backend.app.core.config import settings
 from .metadata import MetadataVerifier
-from .providers.spotify import SpotifyProvider
+from .providers.spotify import MAX_TRACK_IDS_PER_REQUEST, SpotifyProvider, spotify_track_id
+from .pagination import fetch_pages_threaded, remaining_offsets
+from .providers.spotify_fields import PLAYLIST_DETAILS_FIELDS, tracks_page_fields
+from .playlist_diff import MAX_ITEMS_PER_REQUEST, full_replace_cost, plan_playlist_diff
+from .search_cache import (
+    CANDIDATE_SEARCH_LIMIT,
+    CANDIDATES_NAMESPACE,
+    EXACT_SEARCH_LIMIT,
+    SearchCache,
+    get_search_cache,
+    slim_track,
+    track_search_query,
+)
+from .utils.background_loop import run_sync
+from .utils.scoring import VERIFICATION_BONUS, VERIFIED_VERSIONS, best_candidate_index, score_candidates
 from .utils.helpers import (
     _similarity,
     _determine_version,
@@ -20,6 +36,51 @@ from .utils.helpers import (
 logger = logging.getLogger("backend.core.client")
 
 
+# Records the snapshot_id of every backed up playlist, keyed by playlist id
+BACKUP_MANIFEST_NAME = ".backup_manifest.json"
+
+
+def _load_backup_manifest(path: str) -> dict[str, dict[str, str]]:
+    """Read a backup manifest, treating a missing or unreadable file as empty."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("playlists", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _save_backup_manifest(path: str, playlists: dict[str, dict[str, str]]) -> None:
+    """Atomically write a backup manifest."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"playlists": playlists}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _assign_backup_files(playlists: list[dict[str, Any]], manifest: dict[str, dict[str, str]]) -> dict[str, str]:
+    """
+    Give every playlist ID its own backup file name.
+
+    A playlist keeps the file the manifest recorded for it; new playlists get ``<snake_name>.json``,
+    or ``<snake_name>_<id>.json`` when another playlist already holds that name.
+    """
+    files: dict[str, str] = {}
+    taken: set[str] = set()
+    for pl in playlists:
+        recorded = manifest.get(pl["id"], {}).get("file")
+        if recorded and recorded not in taken:
+            files[pl["id"]] = recorded
+            taken.add(recorded)
+    for pl in playlists:
+        if pl["id"] in files:
+            continue
+        base = to_snake_case(pl["name"]) or pl["id"]
+        filename = f"{base}.json" if f"{base}.json" not in taken else f"{base}_{pl['id']}.json"
+        files[pl["id"]] = filename
+        taken.add(filename)
+    return files
+
+
 class SpotifyPlaylistBuilder:
     def __init__(
         self,
@@ -28,8 +89,10 @@ class SpotifyPlaylistBuilder:
         redirect_uri: str = "https://127.0.0.1:8888/callback",
         sp_client: spotipy.Spotify | None = None,
         access_token: str | None = None,
+        search_cache: SearchCache | None = None,
     ) -> None:
         """Initialize Spotify API client."""
+        self.search_cache = search_cache or get_search_cache()
         if sp_client:
             self.sp = sp_client
         elif access_token:
@@ -78,6 +141,18 @@ class SpotifyPlaylistBuilder:
         """Proxy to determine_version helper."""
         return _determine_version(track_name, album_name)
 
+    def _search_candidates(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Run a track search, serving the candidate page from the search cache when possible."""
+        cache_key = self.search_cache.make_key(CANDIDATES_NAMESPACE, query, limit)
+        hit, cached = self.search_cache.get(cache_key)
+        if hit:
+            return cached or []
+
+        results = self.sp.search(q=query, type="track", limit=limit)
+        candidates = [slim_track(item) for item in results["tracks"]["items"]] if results else []
+        self.search_cache.set(cache_key, candidates or None)
+        return candidates
+
     @rate_limit_retry
     def search_track(
         self,
@@ -87,87 +162,49 @@ class SpotifyPlaylistBuilder:
         version: str | None = None,
     ) -> str | None:
         """Search for a track on Spotify using fuzzy matching and external verification."""
-        if album:
-            query = f"track:{track} artist:{artist} album:{album}"
-            results = self.sp.search(q=query, type="track", limit=1)
-            if results and results["tracks"]["items"]:
-                return results["tracks"]["items"][0]["uri"]
-
-        query = f"track:{track} artist:{artist}"
-        results = self.sp.search(q=query, type="track", limit=20)
-        if results is None or not results["tracks"]["items"]:
-            return None
+        cache_key = self.search_cache.make_key("builder", artist, track, album, version)
+        hit, cached_uri = self.search_cache.get(cache_key)
+        if hit:
+            return cached_uri
 
-        candidates = results["tracks"]["items"]
-        best_match = None
-        best_score = -1.0
+        uri = self._search_track_uncached(artist, track, album, version)
+        self.search_cache.set(cache_key, uri)
+        return uri
 
-        for item in candidates:
-            score = 0.0
-            item_name = item["name"]
-            item_artists = [a["name"] for a in item["artists"]]
-            item_album = item["album"]["name"]
+    def _search_track_uncached(
+        self,
+        artist: str,
+        track: str,
+        album: str | None = None,
+        version: str | None = None,
+    ) -> str | None:
+        if album:
+            exact = self._search_candidates(track_search_query(artist, track, album), limit=EXACT_SEARCH_LIMIT)
+            if exact:
+                return exact[0]["uri"]
+
+        candidates = self._search_candidates(track_search_query(artist, track), limit=CANDIDATE_SEARCH_LIMIT)
+        if not candidates:
+            return None
 
-            # Artist Match (Weight: 30)
-            artist_match = max(self._similarity(artist, a) for a in item_artists)
-            score += artist_match * 30
+        scores = score_candidates(
+            artist, track, candidates, album=album, version=version, detect_version=self._determine_version
+        )
 
-            # Track Name Match (Weight: 40)
-            track_match = self._similarity(track, item_name)
-            score += track_match * 40
+        # External Metadata Verification (Weight: 20), one batched call on the shared background loop
+        if version in VERIFIED_VERSIONS:
+            pairs = [(item["artists"][0]["name"] if item["artists"] else artist, item["name"]) for item in candidates]
+            try:
+                verified = run_sync(self.metadata_verifier.verify_track_versions(pairs, version))
+            except Exception as e:
+                logger.debug(f"Metadata verification skipped: {e}")
+                verified = [False] * len(candidates)
+            for i, is_verified in enumerate(verified):
+                if is_verified:
+                    scores[i] += VERIFICATION_BONUS
 
-            # Album/Version Preference (Weight: 30)
-            if album:
-                album_match = self._similarity(album, item_album)
-                score += album_match * 30
-            else:
-                detected_version = self._determine_version(item_name, item_album)
-
-                if version == "live":
-                    score += 30 if detected_version == "live" else 5
-                elif version == "remix":
-                    score += 30 if detected_version == "remix" else 5
-                elif version == "compilation":
-                    score += 30 if detected_version == "compilation" else 5
-                elif version == "remaster":
-                    score += 30 if detected_version == "remaster" else 5
-                elif version == "instrumental":
-                    score += 30 if detected_version == "instrumental" else 5
-                elif version == "acoustic":
-                    score += 30 if detected_version == "acoustic" else 5
-                elif version == "original":
-                    # For original, we specifically want studio and NOT remaster
-                    if detected_version == "studio":
-                        score += 30
-                    elif detected_version == "remaster":
-                        score += 10
-                    else:
-                        score += 5
-                else:
-                    # Default: Studio/Original preference
-                    if detected_version == "studio":
-                        score += 30
-                    elif detected_version == "remaster":
-                        score += 20  # Remaster is better than live/remix if we want studio
-                    else:
-                        score += 10
-
-            # 4. External Metadata Verification (Weight: 20)
-            if version in ["live", "remix", "remaster"]:
-                try:
-                    primary_artist = item_artists[0] if item_artists else artist
-                    if asyncio.run(self.metadata_verifier.verify_track_version(primary_artist, item_name, version)):
-                        score += 20
-                except Exception as e:
-                    logger.debug(f"Metadata verification skipped: {e}")
-
-            if score > best_score:
-                best_score = score
-                best_match = item
-
-        if best_match and best_score > 60:
-            return best_match["uri"]
-        return None
+        best = best_candidate_index(scores)
+        return candidates[best]["uri"] if best is not None else None
 
     @rate_limit_retry
     def find_playlist_by_name(self, playlist_name: str) -> str | None:
@@ -187,20 +224,39 @@ class SpotifyPlaylistBuilder:
         return None
 
     @rate_limit_retry
+    def _playlist_tracks_page(
+        self, playlist_id: str, offset: int, limit: int = 100, use_case: str = "uris"
+    ) -> dict[str, Any] | None:
+        return self.sp.playlist_tracks(playlist_id, fields=tracks_page_fields(use_case), limit=limit, offset=offset)
+
+    def _collect_pages(self, fetch_page: Callable[[int], dict[str, Any] | None], limit: int) -> list[dict[str, Any]]:
+        """Return the items of every page; once the first page reports the total, the rest load in parallel."""
+        first = fetch_page(0)
+        if first is None:
+            return []
+        items = list(first["items"])
+        offsets = remaining_offsets(first)
+        if offsets is None:
+            # No total reported: page through one request at a time
+            offset, page = 0, first
+            while page and page["next"]:
+                offset += limit
+                page = fetch_page(offset)
+                if page:
+                    items.extend(page["items"])
+            return items
+
+        for page in fetch_pages_threaded(fetch_page, offsets, settings.SPOTIFY_PAGE_CONCURRENCY):
+            if page:
+                items.extend(page["items"])
+        return items
+
+    def _playlist_track_items(self, playlist_id: str, use_case: str = "uris") -> list[dict[str, Any]]:
+        return self._collect_pages(lambda offset: self._playlist_tracks_page(playlist_id, offset, 100, use_case), 100)
+
     def get_playlist_tracks(self, playlist_id: str) -> list[str]:
         """Get all track URIs from a playlist."""
-        tracks = []
-        offset = 0
-        limit = 100
-        while True:
-            results = self.sp.playlist_tracks(playlist_id, limit=limit, offset=offset)
-            if results is None:
-                break
-            tracks.extend([item["track"]["uri"] for item in results["items"] if item["track"]])
-            if not results["next"]:
-                break
-            offset += limit
-        return tracks
+        return [item["track"]["uri"] for item in self._playlist_track_items(playlist_id) if item["track"]]
 
     @rate_limit_retry
     def clear_playlist(self, playlist_id: str) -> None:
@@ -226,7 +282,7 @@ class SpotifyPlaylistBuilder:
     @rate_limit_retry
     def update_playlist_details(self, playlist_id: str, description: str, public: bool = False) -> None:
         """Update playlist details if they differ."""
-        playlist = self.sp.playlist(playlist_id)
+        playlist = self.sp.playlist(playlist_id, fields=PLAYLIST_DETAILS_FIELDS)
         if playlist is None:
             return
         current_description = playlist.get("description") or ""
@@ -247,29 +303,99 @@ class SpotifyPlaylistBuilder:
             batch = track_uris[i : i + 100]
             self.sp.playlist_add_items(playlist_id, batch)
 
+    def _replace_playlist_tracks(self, playlist_id: str, track_uris: list[str]) -> None:
+        self.sp.playlist_replace_items(playlist_id, track_uris[:MAX_ITEMS_PER_REQUEST])
+        self._add_track_uris_to_playlist(playlist_id, track_uris[MAX_ITEMS_PER_REQUEST:])
+
+    @rate_limit_retry
+    def sync_playlist_tracks(self, playlist_id: str, track_uris: list[str]) -> None:
+        """Apply the minimal remove/reorder/insert diff that makes a playlist match track_uris."""
+        snapshot = self.sp.playlist(playlist_id, fields="snapshot_id")
+        snapshot_id = snapshot.get("snapshot_id") if snapshot else None
+        items = self._playlist_track_items(playlist_id)
+        remote_uris = [item["track"]["uri"] for item in items if item.get("track")]
+        if len(remote_uris) < len(items):
+            # Track-less items (unavailable tracks) can't be removed by URI and would shift every diff position
+            logger.info("Rewriting playlist (it has unavailable tracks)...")
+            self._replace_playlist_tracks(playlist_id, track_uris)
+            return
+
+        ops = plan_playlist_diff(remote_uris, track_uris)
+        if not ops:
+            return
+
+        if len(ops) > full_replace_cost(track_uris):
+            logger.info(f"Rewriting playlist ({len(ops)} diff operations, full replace is cheaper)...")
+            self._replace_playlist_tracks(playlist_id, track_uris)
+            return
+
+        logger.info(f"Applying {len(ops)} playlist diff operations...")
+        for op in ops:
+            # Each write targets the snapshot produced by the previous one
+            if op["type"] == "remove":
+                result = self.sp.playlist_remove_all_occurrences_of_items(
+                    playlist_id, op["uris"], snapshot_id=snapshot_id
+                )
+            elif op["type"] == "reorder":
+                result = self.sp.playlist_reorder_items(
+                    playlist_id,
+                    op["range_start"],
+                    op["insert_before"],
+                    range_length=op["range_length"],
+                    snapshot_id=snapshot_id,
+                )
+            else:
+                result = self.sp.playlist_add_items(playlist_id, op["uris"], position=op["position"])
+            snapshot_id = (result or {}).get("snapshot_id", snapshot_id)
+
+    @rate_limit_retry
+    def _fetch_tracks(self, track_ids: list[str]) -> list[dict[str, Any] | None]:
+        results = self.sp.tracks(track_ids)
+        return (results or {}).get("tracks") or []
+
+    def get_tracks_by_uri(self, track_uris: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch full track objects for Spotify track URIs, 50 per request, keyed by the requested URI."""
+        ids = {uri: track_id for uri in dict.fromkeys(track_uris) if (track_id := spotify_track_id(uri))}
+        uris = list(ids)
+        found = {}
+        for i in range(0, len(uris), MAX_TRACK_IDS_PER_REQUEST):
+            batch = uris[i : i + MAX_TRACK_IDS_PER_REQUEST]
+            for uri, item in zip(batch, self._fetch_tracks([ids[uri] for uri in batch])):
+                if item:
+                    found[uri] = item
+        return found
+
     def add_tracks_to_playlist(
         self, playlist_id: str, tracks: list[dict[str, Any]]
     ) -> tuple[list[dict[str, Any]], list[str]]:
-        """Add tracks to a playlist, returning actual metadata and failed tracks."""
+        """Add tracks to a playlist, returning actual metadata and failed tracks.
+
+        Tracks that already carry a Spotify URI are looked up in bulk; only the rest are searched.
+        """
         actual_tracks = []
         failed_tracks = []
         uris = []
 
+        hydrated = self.get_tracks_by_uri([t["uri"] for t in tracks if spotify_track_id(t.get("uri"))])
+
         for i, track in enumerate(tracks):
             artist = str(track.get("artist", ""))
             track_name = str(track.get("track", ""))
             album = track.get("album")
 
-            # search_track only returns URI, we need full metadata for duration
-            query = f"track:{track_name} artist:{artist}"
-            if album:
-                query += f" album:{album}"
+            uri = track.get("uri")
+            best_match = hydrated.get(uri) if uri else None
+            if best_match is None:
+                # search_track only returns URI, we need full metadata for duration
+                query = f"track:{track_name} artist:{artist}"
+                if album:
+                    query += f" album:{album}"
 
-            search_results = self.sp.search(q=query, type="track", limit=1)
-            items = search_results["tracks"]["items"] if search_results else []
+                search_results = self.sp.search(q=query, type="track", limit=1)
+                items = search_results["tracks"]["items"] if search_results else []
+                best_match = items[0] if items else None
 
-            if items:
-                best_match = items[0]
+            if best_match:
                 uris.append(best_match["uri"])
                 actual_tracks.append(
                     {
@@ -291,42 +417,40 @@ class SpotifyPlaylistBuilder:
 
         return actual_tracks, failed_tracks
 
-    @rate_limit_retry
     def get_playlist_tracks_details(self, playlist_id: str) -> list[dict[str, str]]:
         """Get full track details from a playlist for export."""
         tracks = []
-        offset = 0
-        limit = 100
-        while True:
-            results = self.sp.playlist_tracks(playlist_id, limit=limit, offset=offset)
-            if results is None:
-                break
-            for item in results["items"]:
-                track = item.get("track")
-                if track:
-                    artist_name = track["artists"][0]["name"] if track["artists"] else "Unknown"
-                    tracks.append(
-                        {
-                            "uri": track["uri"],
-                            "artist": artist_name,
-                            "track": track["name"],
-                            "album": track["album"]["name"],
-                            "version": self._determine_version(track["name"], track["album"]["name"]),
-                        }
-                    )
-            if not results["next"]:
-                break
-            offset += limit
+        for item in self._playlist_track_items(playlist_id, use_case="export"):
+            track = item.get("track")
+            if track:
+                artist_name = track["artists"][0]["name"] if track["artists"] else "Unknown"
+                tracks.append(
+                    {
+                        "uri": track["uri"],
+                        "artist": artist_name,
+                        "track": track["name"],
+                        "album": track["album"]["name"],
+                        "version": self._determine_version(track["name"], track["album"]["name"]),
+                    }
+                )
         return tracks
 
-    def export_playlist_to_json(self, playlist_name: str, output_file: str, playlist_id: str | None = None) -> None:
+    def export_playlist_to_json(
+        self,
+        playlist_name: str,
+        output_file: str,
+        playlist_id: str | None = None,
+        playlist_info: dict[str, Any] | None = None,
+    ) -> None:
         """Export an existing playlist to a JSON file."""
         if not playlist_id:
             playlist_id = self.find_playlist_by_name(playlist_name)
 
         if not playlist_id:
             raise Exception(f"Playlist '{playlist_name}' not found.")
-        playlist_info = self.sp.playlist(playlist_id)
+        # Listings already carry description/public, so callers can skip the details request
+        if playlist_info is None:
+            playlist_info = self.sp.playlist(playlist_id, fields=PLAYLIST_DETAILS_FIELDS)
         if playlist_info is None:
             raise Exception("Failed to fetch details")
         tracks = self.get_playlist_tracks_details(playlist_id)
@@ -340,40 +464,88 @@ class SpotifyPlaylistBuilder:
             json.dump(export_data, f, indent=2)
         logger.info(f"✓ Successfully exported {len(tracks)} tracks to {output_file}")
 
-    def backup_all_playlists(self, output_dir: str) -> None:
-        """Backup all user playlists to JSON files in a directory."""
+    @rate_limit_retry
+    def _user_playlists_page(self, offset: int, limit: int = 50) -> dict[str, Any] | None:
+        return self.sp.current_user_playlists(limit=limit, offset=offset)
+
+    def _all_user_playlists(self) -> list[dict[str, Any]]:
+        return self._collect_pages(lambda offset: self._user_playlists_page(offset, 50), 50)
+
+    def backup_all_playlists(self, output_dir: str, max_workers: int = 1, force: bool = False) -> None:
+        """
+        Backup all user playlists to JSON files in a directory.
+
+        A manifest in the output directory records the snapshot_id of every exported playlist, so
+        playlists unchanged since the last run are skipped and an interrupted backup resumes where it
+        stopped. Pass force=True to export everything regardless.
+        """
         Path(output_dir).mkdir(parents=True, exist_ok=True)
-        offset, limit, playlists = 0, 50, []
-        while True:
-            results = self.sp.current_user_playlists(limit=limit, offset=offset)
-            if results is None:
-                break
-            playlists.extend(results["items"])
-            if not results["next"]:
-                break
-            offset += limit
-        for pl in playlists:
-            safe_name = to_snake_case(pl["name"])
-            filepath = os.path.join(output_dir, f"{safe_name or pl['id']}.json")
+        # Followed and owned listings can overlap; each playlist is backed up once
+        playlists = list({pl["id"]: pl for pl in self._all_user_playlists()}.values())
+
+        manifest_path = os.path.join(output_dir, BACKUP_MANIFEST_NAME)
+        manifest = _load_backup_manifest(manifest_path)
+        # Assigned up front so concurrent workers never share a file, even for playlists with the same name
+        files = _assign_backup_files(playlists, manifest)
+        manifest_lock = threading.Lock()
+
+        def backup(pl: dict[str, Any]) -> None:
+            filepath = os.path.join(output_dir, files[pl["id"]])
+            snapshot_id = pl.get("snapshot_id")
+            entry = manifest.get(pl["id"], {})
+            if not force and snapshot_id and entry.get("snapshot_id") == snapshot_id and os.path.exists(filepath):
+                logger.debug(f"Skipping unchanged playlist '{pl['name']}'")
+                return
             try:
-                self.export_playlist_to_json(pl["name"], filepath, playlist_id=pl["id"])
+                self.export_playlist_to_json(pl["name"], filepath, playlist_id=pl["id"], playlist_info=pl)
             except Exception as e:
                 logger.error(f"Failed to backup '{pl['name']}': {e}")
+                return
+            if snapshot_id:
+                with manifest_lock:
+                    # Persist after every playlist so an interrupted run can resume
+                    manifest[pl["id"]] = {"snapshot_id": snapshot_id, "file": os.path.basename(filepath)}
+                    _save_backup_manifest(manifest_path, manifest)
+
+        if max_workers <= 1:
+            for pl in playlists:
+                backup(pl)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(backup, playlists))
 
-    def build_playlist_from_json(self, json_file: str, dry_run: bool = False) -> None:
-        """Build or update a playlist from a JSON file."""
-        with open(json_file, "r") as f:
-            data = json.load(f)
-        playlist_name = data.get("name", "New Playlist")
-        new_track_uris, failed_items = [], []
+    def resolve_tracks(self, tracks: list[dict[str, Any]], max_workers: int = 1) -> list[str | None]:
+        """Resolve track entries to URIs, in input order.
 
-        for track in data.get("tracks", []):
-            uri = self.search_track(
+        With max_workers > 1 the searches run on a bounded thread pool; each search still goes through
+        rate_limit_retry, so a 429 only backs off the worker that received it.
+        """
+
+        def resolve(track: dict[str, Any]) -> str | None:
+            return self.search_track(
                 track.get("artist"),
                 track.get("track"),
                 track.get("album"),
                 track.get("version"),
             )
+
+        if max_workers <= 1 or len(tracks) <= 1:
+            return [resolve(track) for track in tracks]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(resolve, tracks))
+
+    def build_playlist_from_json(self, json_file: str, dry_run: bool = False, max_workers: int = 1) -> None:
+        """Build or update a playlist from a JSON file."""
+        with open(json_file, "r") as f:
+            data = json.load(f)
+        playlist_name = data.get("name", "New Playlist")
+        new_track_uris, failed_items = [], []
+
+        tracks = data.get("tracks", [])
+        resolved_uris = self.resolve_tracks(tracks, max_workers=max_workers)
+
+        for track, uri in zip(tracks, resolved_uris):
             if uri:
                 new_track_uris.append(uri)
             elif track.get("uri"):
@@ -417,9 +589,7 @@ class SpotifyPlaylistBuilder:
                         # Let's stick to strict match on Artist - Title for now.
                         logger.warning(f"Could not find or preserve: {item.get('artist')} - " f"{item.get('track')}")
 
-            if self.get_playlist_tracks(existing_pid) != new_track_uris:
-                self.clear_playlist(existing_pid)
-                self._add_track_uris_to_playlist(existing_pid, new_track_uris)
+            self.sync_playlist_tracks(existing_pid, new_track_uris)
             playlist_id = existing_pid
         else:
             if failed_items:
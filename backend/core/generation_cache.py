@@ -0,0 +1,53 @@
+import copy
+from typing import Any
+
+from backend.app.core.config import settings
+from backend.core.search_cache import SearchCache
+
+GENERATION_NAMESPACE = "playlist"
+
+
+class GenerationCache(SearchCache):
+    """Two-tier cache of generated playlists, keyed on the normalized prompt, count and model."""
+
+    key_prefix = "vibomat:generation"
+
+    @classmethod
+    def playlist_key(cls, description: str, count: int, model: str) -> str:
+        """Key for a generation request; artists are already folded into the description."""
+        return cls.make_key(GENERATION_NAMESPACE, description, count, model)
+
+    def get_playlist(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of a cached playlist so callers can mutate it freely."""
+        _, value = self.get(key)
+        return copy.deepcopy(value) if value else None
+
+    async def aget_playlist(self, key: str) -> dict[str, Any] | None:
+        """Async variant of get_playlist."""
+        _, value = await self.aget(key)
+        return copy.deepcopy(value) if value else None
+
+    def set_playlist(self, key: str, playlist: dict[str, Any]) -> None:
+        """Cache a copy of a generated playlist."""
+        self.set(key, copy.deepcopy(playlist))
+
+    async def aset_playlist(self, key: str, playlist: dict[str, Any]) -> None:
+        """Async variant of set_playlist."""
+        await self.aset(key, copy.deepcopy(playlist))
+
+
+_generation_cache: GenerationCache | None = None
+
+
+def get_generation_cache() -> GenerationCache | None:
+    """Return the process-wide generation cache, or None when caching is disabled."""
+    global _generation_cache
+    if not settings.GENERATION_CACHE_ENABLED:
+        return None
+    if _generation_cache is None:
+        _generation_cache = GenerationCache(
+            max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+            ttl=settings.GENERATION_CACHE_TTL_SECONDS,
+            redis_url=str(settings.REDIS_URL) if settings.GENERATION_CACHE_REDIS_ENABLED else None,
+        )
+    return _generation_cache
@@ -0,0 +1,83 @@
+import logging
+from importlib.util import find_spec
+from typing import Any
+
+import httpx
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger("backend.core.http_clients")
+
+# HTTP/2 needs the optional 'h2' package (installed via httpx[http2])
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+DEFAULT_CLIENT = "default"
+
+
+def default_client_options() -> dict[str, Any]:
+    """Pooling, HTTP/2 and timeout options applied to every shared client."""
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "timeout": httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+
+class HTTPClientRegistry:
+    """
+    Named httpx.AsyncClients shared by the whole process, one keep-alive pool per upstream.
+
+    Clients are created on first use and recreated if something closed them. Auth headers belong on
+    the request, not the client, so one pool can serve every user token.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str = DEFAULT_CLIENT, **options: Any) -> httpx.AsyncClient:
+        """Return the client registered as ``name``; ``options`` only apply when it is created."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            if not HTTP2_AVAILABLE:
+                logger.warning(f"'h2' is not installed; HTTP client '{name}' falls back to HTTP/1.1")
+            client = httpx.AsyncClient(**{**default_client_options(), **options})
+            self._clients[name] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every client and forget them."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+_http_client_registry: HTTPClientRegistry | None = None
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """Return the process-wide client registry."""
+    global _http_client_registry
+    if _http_client_registry is None:
+        _http_client_registry = HTTPClientRegistry()
+    return _http_client_registry
+
+
+def get_shared_http_client(name: str = DEFAULT_CLIENT, **options: Any) -> httpx.AsyncClient:
+    """Shortcut for ``get_http_client_registry().get(name, **options)``."""
+    return get_http_client_registry().get(name, **options)
+
+
+async def close_http_clients() -> None:
+    """Close every shared client; called when the API shuts down."""
+    if _http_client_registry is not None:
+        await _http_client_registry.aclose()
+
+
+def reset_http_clients() -> None:
+    """Drop the process-wide registry without closing it (for tests that switch event loops)."""
+    global _http_client_registry
+    _http_client_registry = None
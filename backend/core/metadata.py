@@ -1,16 +1,23 @@
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 
 import httpx
 from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_type
 
 from backend.app.core.config import settings
-from backend.core.providers.discogs import DiscogsClient
+from backend.core.providers.discogs import get_discogs_client
 from backend.core.providers.spotify import SpotifyProvider
+from backend.core.rate_limit import TokenBucket, get_musicbrainz_limiter
+
+if TYPE_CHECKING:
+    from backend.app.services.metadata_catalog import MetadataCatalog
 
 logger = logging.getLogger("backend.core.metadata")
 
+# In-flight MusicBrainz lookups, so concurrent identical requests share one rate-limited call
+_inflight_requests: Dict[tuple, "asyncio.Future[Dict[str, Any]]"] = {}
+
 
 # Exception for retry logic
 class MusicBrainzAPIError(Exception):
@@ -25,18 +32,26 @@ class MetadataVerifier:
     Spotify (primary), Discogs (secondary), and MusicBrainz (tertiary/verification).
     """
 
-    def __init__(self, http_client: httpx.AsyncClient, spotify_provider: SpotifyProvider):
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        spotify_provider: SpotifyProvider,
+        rate_limiter: Optional[TokenBucket] = None,
+        catalog: Optional["MetadataCatalog"] = None,
+    ):
         self.http_client = http_client
         self.spotify_provider = spotify_provider
-        self.discogs_client = DiscogsClient()
+        # Shared per token so all verifiers draw from one Discogs rate limit budget
+        self.discogs_client = get_discogs_client()
         self.base_url = "https://musicbrainz.org/ws/2/recording"
         self.headers = {
             "User-Agent": f"{settings.PROJECT_NAME}/0.1.0 " "( https://github.com/dwdozier/vibomat )",
             "Accept": "application/json",
         }
-        self.last_request_time = 0.0
-        # MusicBrainz allows ~1 req/sec
-        self.rate_limit_delay = 1.1
+        # Shared by every verifier in the process (and across processes when Redis-backed)
+        self.rate_limiter = rate_limiter or get_musicbrainz_limiter()
+        # Optional local catalog: checked before any provider call and updated with what they return
+        self.catalog = catalog
 
     async def enrich_track_metadata(self, artist: str, track: str, album: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -77,11 +92,25 @@ class MetadataVerifier:
         return enriched_data
 
     async def _enforce_rate_limit(self):
-        """Sleep to respect MusicBrainz rate limits."""
-        elapsed = asyncio.get_event_loop().time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = asyncio.get_event_loop().time()
+        """Wait for a slot in the shared MusicBrainz budget."""
+        await self.rate_limiter.acquire()
+
+    async def _fetch_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        await self._enforce_rate_limit()
+        response = await self.http_client.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _musicbrainz_get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Rate-limited MusicBrainz GET; identical concurrent requests are coalesced into one call."""
+        key = (asyncio.get_running_loop(), url, tuple(sorted(params.items())))
+        future = _inflight_requests.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_json(url, params))
+            _inflight_requests[key] = future
+            future.add_done_callback(lambda _: _inflight_requests.pop(key, None))
+        # Shield so one caller being cancelled does not fail the others waiting on the same call
+        return await asyncio.shield(future)
 
     @retry(
         retry=retry_if_exception_type(httpx.RequestError),
@@ -93,17 +122,13 @@ class MetadataVerifier:
     )
     async def search_recording(self, artist: str, track: str) -> List[Dict[str, Any]]:
         """Search MusicBrainz for recordings matching the artist and track."""
-        await self._enforce_rate_limit()
-
         # Lucene search syntax
         query = f'artist:"{artist}" AND recording:"{track}"'
         params = {"query": query, "fmt": "json", "limit": 10}
         url = "https://musicbrainz.org/ws/2/recording"
 
         try:
-            response = await self.http_client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._musicbrainz_get(url, params)
             return data.get("recordings", [])
         except httpx.HTTPStatusError as e:
             logger.warning(f"MusicBrainz HTTP error for {artist} - {track}: {e}")
@@ -116,32 +141,22 @@ class MetadataVerifier:
             return []
 
     async def verify_track_version(self, artist: str, track: str, version: str) -> bool:
-        """Verify if a track matches the requested version using MusicBrainz (primary)
-        and Discogs (fallback) metadata.
+        """Verify if a track matches the requested version using the local catalog, MusicBrainz
+        (primary) and Discogs (fallback) metadata.
         """
         version = version.lower() if version else "studio"
 
+        if self.catalog and await self.catalog.has_track(artist, track, version):
+            return True
+
         # 1. Try MusicBrainz
         try:
             recordings = await self.search_recording(artist, track)
-            if recordings:
-                for rec in recordings:
-                    disambiguation = rec.get("disambiguation", "").lower()
-                    title = rec.get("title", "").lower()
-
-                    if version == "live":
-                        if "live" in disambiguation or "live" in title:
-                            return True
-                    elif version == "remix":
-                        if "remix" in disambiguation or "remix" in title or "mix" in title:
-                            return True
-                    elif version == "remaster":
-                        if "remaster" in disambiguation or "remaster" in title:
-                            return True
-                    else:
-                        # For 'studio' or unspecified, simple existence in MB is enough
-                        # provided we aren't looking for a specific alternate version
-                        return True
+            match = self._match_recording(recordings or [], version)
+            if match is not None:
+                if self.catalog:
+                    await self.catalog.store_track(artist, track, version, "musicbrainz", provider_id=match.get("id"))
+                return True
         except MusicBrainzAPIError as e:
             logger.warning(f"MusicBrainz verification failed, falling back to Discogs: {e}")
             # Continue to Discogs fallback
@@ -160,21 +175,64 @@ class MetadataVerifier:
             logger.info(f"Found Discogs URI for {artist} - {track}: {discogs_result['uri']}")
             # Since Discogs search is more general, we currently assume existence is enough.
             # We will improve version matching logic later if needed.
+            if self.catalog:
+                await self.catalog.store_track(artist, track, version, "discogs", provider_id=discogs_result["uri"])
             return True
 
         return False
 
+    async def verify_track_versions(self, tracks: List[tuple[str, str]], version: str) -> List[bool]:
+        """Verify many (artist, track) pairs against one version concurrently, in input order.
+
+        Duplicate pairs share one lookup and a failed lookup counts as unverified.
+        """
+        unique = list(dict.fromkeys(tracks))
+        results = await asyncio.gather(
+            *(self.verify_track_version(artist, track, version) for artist, track in unique),
+            return_exceptions=True,
+        )
+        verified = {}
+        for pair, result in zip(unique, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Metadata verification skipped for {pair[0]} - {pair[1]}: {result}")
+            verified[pair] = result is True
+        return [verified[pair] for pair in tracks]
+
+    @staticmethod
+    def _match_recording(recordings: List[Dict[str, Any]], version: str) -> Optional[Dict[str, Any]]:
+        """Return the first MusicBrainz recording that matches the requested version."""
+        for rec in recordings:
+            disambiguation = rec.get("disambiguation", "").lower()
+            title = rec.get("title", "").lower()
+
+            if version == "live":
+                if "live" in disambiguation or "live" in title:
+                    return rec
+            elif version == "remix":
+                if "remix" in disambiguation or "remix" in title or "mix" in title:
+                    return rec
+            elif version == "remaster":
+                if "remaster" in disambiguation or "remaster" in title:
+                    return rec
+            else:
+                # For 'studio' or unspecified, simple existence in MB is enough
+                # provided we aren't looking for a specific alternate version
+                return rec
+        return None
+
     async def search_artist(self, artist_name: str) -> Optional[Dict[str, Any]]:
-        """Search MusicBrainz for artist metadata."""
-        await self._enforce_rate_limit()
+        """Search the local catalog, then MusicBrainz, for artist metadata."""
+        if self.catalog and (cached := await self.catalog.get_artist(artist_name)):
+            return cached
+
         url = "https://musicbrainz.org/ws/2/artist"
         params = {"query": f'artist:"{artist_name}"', "fmt": "json", "limit": 1}
         try:
-            response = await self.http_client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._musicbrainz_get(url, params)
             artists = data.get("artists", [])
             if artists:
+                if self.catalog:
+                    await self.catalog.store_artist(artists[0])
                 return artists[0]
         except Exception as e:
             logger.debug(f"Failed to fetch artist metadata for {artist_name}: {e}")
@@ -182,14 +240,11 @@ class MetadataVerifier:
 
     async def search_album(self, artist_name: str, album_name: str) -> Optional[Dict[str, Any]]:
         """Search MusicBrainz for album (release-group) metadata."""
-        await self._enforce_rate_limit()
         url = "https://musicbrainz.org/ws/2/release-group"
         query = f'artist:"{artist_name}" AND releasegroup:"{album_name}"'
         params = {"query": query, "fmt": "json", "limit": 1}
         try:
-            response = await self.http_client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._musicbrainz_get(url, params)
             groups = data.get("release-groups", [])
             if groups:
                 return groups[0]
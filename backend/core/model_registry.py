@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from typing import Any, Iterable
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger("backend.core.model_registry")
+
+# Used when no flash model can be discovered
+DEFAULT_FALLBACK_MODEL = "gemini-2.0-flash"
+
+
+class ModelRegistry:
+    """
+    Cached view of the Gemini models available to the configured key.
+
+    The model list is served from memory for ``ttl`` seconds. Once stale it is still served while a
+    background thread refreshes it, so only the very first lookup waits on a listing round-trip.
+    Models that recently failed (e.g. 404s) are remembered for ``failure_ttl`` seconds and skipped
+    when choosing a fallback.
+    """
+
+    def __init__(self, ttl: float = 3600, failure_ttl: float = 600):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._models: list[str] = []
+        self._loaded_at: float | None = None
+        self._failed: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def refresh(self, client: Any = None) -> list[str]:
+        """List models now; a failed or empty listing keeps the previous list."""
+        from .ai import list_available_models
+
+        try:
+            models = list_available_models(client)
+        finally:
+            with self._lock:
+                self._refreshing = False
+        if models:
+            with self._lock:
+                self._models = models
+                self._loaded_at = time.monotonic()
+        else:
+            logger.debug("Model listing returned nothing; keeping the cached model list.")
+        return self.cached_models()
+
+    def cached_models(self) -> list[str]:
+        with self._lock:
+            return list(self._models)
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _refresh_in_background(self, client: Any) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, args=(client,), daemon=True, name="gemini-model-refresh").start()
+
+    def available_models(self, client: Any = None) -> list[str]:
+        """Return the cached model list, listing synchronously only when nothing is cached yet."""
+        if not self._models:
+            return self.refresh(client)
+        if self._is_stale():
+            self._refresh_in_background(client)
+        return self.cached_models()
+
+    def mark_failed(self, model: str) -> None:
+        """Remember that a model just failed so it is skipped for failure_ttl seconds."""
+        with self._lock:
+            self._failed[model.replace("models/", "")] = time.monotonic()
+
+    def recently_failed(self, model: str) -> bool:
+        with self._lock:
+            failed_at = self._failed.get(model.replace("models/", ""))
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_ttl
+
+    def resolve(self, model: str, client: Any = None) -> str:
+        """Return ``model``, or a fallback straight away if it failed recently."""
+        if not self.recently_failed(model):
+            return model
+        fallback = self.fallback_model(client, exclude=[model])
+        logger.info(f"Model '{model}' failed recently, using fallback: {fallback}")
+        return fallback
+
+    def fallback_model(self, client: Any = None, exclude: Iterable[str] = ()) -> str:
+        """Pick the newest available Flash model that has not failed recently."""
+        excluded = {m.replace("models/", "") for m in exclude}
+        # Filter for 'flash' models and strip 'models/' prefix
+        flash_models = [
+            name
+            for name in (m.replace("models/", "") for m in self.available_models(client))
+            if "flash" in name.lower() and name not in excluded and not self.recently_failed(name)
+        ]
+        if flash_models:
+            # Sort reverse alphabetically (e.g. gemini-2.0 > gemini-1.5)
+            return sorted(flash_models, reverse=True)[0]
+        return DEFAULT_FALLBACK_MODEL
+
+
+_model_registry: ModelRegistry | None = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry configured from settings."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(
+            ttl=settings.GEMINI_MODEL_REGISTRY_TTL_SECONDS,
+            failure_ttl=settings.GEMINI_MODEL_FAILURE_TTL_SECONDS,
+        )
+    return _model_registry
+
+
+def reset_model_registry() -> None:
+    """Drop the process-wide registry so the next call rebuilds it from settings."""
+    global _model_registry
+    _model_registry = None
@@ -0,0 +1,43 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+# Spotify paging objects report total/limit/offset, so every page after the first can be requested at once
+
+
+def remaining_offsets(page: Optional[dict[str, Any]]) -> Optional[list[int]]:
+    """
+    Offsets of the pages after ``page``.
+
+    Returns an empty list when there is no next page, and None when the page does not report its
+    total and limit (callers then fall back to following ``next`` one page at a time).
+    """
+    if not page or not page.get("next"):
+        return []
+    total, limit = page.get("total"), page.get("limit")
+    if not isinstance(total, int) or not isinstance(limit, int) or limit <= 0:
+        return None
+    return list(range((page.get("offset") or 0) + limit, total, limit))
+
+
+async def fetch_pages_concurrently(
+    fetch: Callable[[int], Awaitable[Optional[dict[str, Any]]]], offsets: list[int], concurrency: int
+) -> list[Optional[dict[str, Any]]]:
+    """Fetch the page at every offset with at most ``concurrency`` requests in flight, in offset order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_one(offset: int) -> Optional[dict[str, Any]]:
+        async with semaphore:
+            return await fetch(offset)
+
+    return list(await asyncio.gather(*(fetch_one(offset) for offset in offsets)))
+
+
+def fetch_pages_threaded(
+    fetch: Callable[[int], Optional[dict[str, Any]]], offsets: list[int], max_workers: int
+) -> list[Optional[dict[str, Any]]]:
+    """Fetch the page at every offset on a bounded thread pool, in offset order."""
+    if max_workers <= 1 or len(offsets) <= 1:
+        return [fetch(offset) for offset in offsets]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as pool:
+        return list(pool.map(fetch, offsets))
@@ -0,0 +1,71 @@
+from collections import Counter
+from typing import Any
+
+# Spotify accepts at most 100 items per add/remove request
+MAX_ITEMS_PER_REQUEST = 100
+
+
+def full_replace_cost(desired: list[str]) -> int:
+    """Number of requests needed to overwrite a playlist: one replace plus one add per extra 100 tracks."""
+    return max(1, -(-len(desired) // MAX_ITEMS_PER_REQUEST))
+
+
+def plan_playlist_diff(remote: list[str], desired: list[str]) -> list[dict[str, Any]]:
+    """
+    Plan the remove, reorder and insert operations that turn ``remote`` into ``desired``.
+
+    Operations are meant to be applied in order, each against the playlist state left by the previous
+    one:
+    - ``{"type": "remove", "uris": [...]}`` removes every occurrence of the URIs. Any URI with more
+      remote copies than desired copies is removed entirely and the missing copies are re-inserted.
+    - ``{"type": "reorder", "range_start": j, "insert_before": i, "range_length": n}`` moves a
+      contiguous run of tracks.
+    - ``{"type": "insert", "uris": [...], "position": i}`` inserts a run of new tracks.
+    """
+    ops: list[dict[str, Any]] = []
+    remote_counts, desired_counts = Counter(remote), Counter(desired)
+
+    to_remove = [uri for uri in dict.fromkeys(remote) if remote_counts[uri] > desired_counts[uri]]
+    for i in range(0, len(to_remove), MAX_ITEMS_PER_REQUEST):
+        ops.append({"type": "remove", "uris": to_remove[i : i + MAX_ITEMS_PER_REQUEST]})
+
+    removed = set(to_remove)
+    current = [uri for uri in remote if uri not in removed]
+    # Tracks at or after position i that have not been matched to a desired slot yet
+    unplaced = Counter(current)
+
+    i = 0
+    while i < len(desired):
+        uri = desired[i]
+        if i < len(current) and current[i] == uri:
+            unplaced[uri] -= 1
+            i += 1
+            continue
+
+        if unplaced[uri]:
+            # Move the longest run starting at the next copy of this track into place
+            j = current.index(uri, i + 1)
+            length = 1
+            while (
+                j + length < len(current) and i + length < len(desired) and current[j + length] == desired[i + length]
+            ):
+                length += 1
+            block = current[j : j + length]
+            del current[j : j + length]
+            current[i:i] = block
+            unplaced.subtract(block)
+            ops.append({"type": "reorder", "range_start": j, "insert_before": i, "range_length": length})
+            i += length
+            continue
+
+        # Insert the run of tracks that are not on the remote playlist at all
+        run = []
+        k = i
+        while k < len(desired) and not unplaced[desired[k]] and len(run) < MAX_ITEMS_PER_REQUEST:
+            run.append(desired[k])
+            k += 1
+        current[i:i] = run
+        ops.append({"type": "insert", "uris": run, "position": i})
+        i += len(run)
+
+    return ops
@@ -3,7 +3,9 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from backend.app.core.config import settings
+from backend.core.http_clients import get_shared_http_client
 from backend.core.providers.base import BaseMusicProvider
+from backend.core.rate_limit import AdaptiveRateLimiter, get_discogs_limiter
 import logging
 
 logger = logging.getLogger("backend.core.providers.discogs")
@@ -15,6 +17,17 @@ class DiscogsAPIError(Exception):
     pass
 
 
+class DiscogsRateLimitError(DiscogsAPIError):
+    """Raised on HTTP 429; retried once the shared limiter allows another request."""
+
+    pass
+
+
+def _header_int(response: httpx.Response, name: str) -> int | None:
+    value = response.headers.get(name)
+    return int(value) if isinstance(value, str) and value.isdigit() else None
+
+
 def retry_if_not_auth_error(exception: BaseException) -> bool:
     """Predicate to retry on API errors, but not on authentication errors."""
     if isinstance(exception, httpx.HTTPStatusError):
@@ -29,28 +42,53 @@ class DiscogsClient(BaseMusicProvider):
     This client is designed for metadata enrichment, complementing Spotify's data.
     """
 
-    def __init__(self):
-        if not settings.DISCOGS_PAT:
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        token: str | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        token = token or settings.DISCOGS_PAT
+        if not token:
             raise ValueError("DISCOGS_PAT is not configured in settings.")
 
         self.base_url = "https://api.discogs.com"
         self.headers = {
-            "Authorization": f"Discogs token={settings.DISCOGS_PAT}",
+            "Authorization": f"Discogs token={token}",
             "User-Agent": settings.PROJECT_NAME,  # Required by Discogs API
         }
-        self.http_client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=10)
+        self._http_client = http_client
+        # Discogs budgets requests per token, so every client for a token shares one limiter
+        self.rate_limiter = rate_limiter or get_discogs_limiter(token)
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        # Resolved per call so long-lived clients pick up a pool recreated after shutdown
+        # Headers go on each request so every token shares one pool to api.discogs.com
+        return self._http_client or get_shared_http_client("discogs", base_url=self.base_url)
+
+    def _observe_rate_limit(self, response: httpx.Response) -> None:
+        """Feed the X-Discogs-Ratelimit headers (and 429s) back into the shared limiter."""
+        remaining = 0 if response.status_code == 429 else _header_int(response, "X-Discogs-Ratelimit-Remaining")
+        self.rate_limiter.update(limit=_header_int(response, "X-Discogs-Ratelimit"), remaining=remaining)
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(httpx.HTTPStatusError) | retry_if_exception_type(httpx.RequestError),
+        retry=(
+            retry_if_exception_type(httpx.HTTPStatusError)
+            | retry_if_exception_type(httpx.RequestError)
+            | retry_if_exception_type(DiscogsRateLimitError)
+        ),
         retry_error_callback=lambda retry_state: (
             retry_state.outcome.result() if retry_state.outcome and retry_state.outcome.result() is not None else None
         ),
     )
     async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Internal asynchronous GET request with retry logic."""
-        response = await self.http_client.get(endpoint, params=params)
+        """Internal asynchronous GET request with rate limiting and retry logic."""
+        await self.rate_limiter.acquire()
+        response = await self.http_client.get(endpoint, params=params, headers=self.headers)
+        self._observe_rate_limit(response)
 
         try:
             response.raise_for_status()
@@ -58,6 +96,9 @@ class DiscogsClient(BaseMusicProvider):
             if e.response.status_code == 404:
                 logger.debug(f"Discogs not found: {endpoint} - {e.response.text}")
                 return None
+            if e.response.status_code == 429:
+                logger.warning(f"Discogs rate limit hit on {endpoint}, backing off.")
+                raise DiscogsRateLimitError("Discogs API error: 429") from e
 
             logger.error(f"Discogs API error on {endpoint}: {e}")
             raise DiscogsAPIError(f"Discogs API error: {e.response.status_code}") from e
@@ -146,3 +187,23 @@ class DiscogsClient(BaseMusicProvider):
 
     async def get_playlist(self, playlist_id: str) -> dict:
         raise NotImplementedError("Discogs is for metadata only.")
+
+
+_discogs_clients: dict[str, DiscogsClient] = {}
+
+
+def get_discogs_client(token: str | None = None) -> DiscogsClient:
+    """Return the process-wide client for a Discogs token (the configured PAT by default)."""
+    token = token or settings.DISCOGS_PAT
+    if not token:
+        raise ValueError("DISCOGS_PAT is not configured in settings.")
+    client = _discogs_clients.get(token)
+    if client is None:
+        client = DiscogsClient(token=token)
+        _discogs_clients[token] = client
+    return client
+
+
+def reset_discogs_clients() -> None:
+    """Drop the shared clients so the next call rebuilds them from settings."""
+    _discogs_clients.clear()
@@ -1,26 +1,129 @@
-from typing import List, Optional
-import spotipy
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+from spotipy.exceptions import SpotifyException
 from .base import BaseMusicProvider
-from backend.core.utils.helpers import _similarity, _determine_version
+from backend.app.core.config import settings
+from backend.core.pagination import fetch_pages_concurrently, remaining_offsets
+from backend.core.providers.spotify_fields import playlist_fields, tracks_page_fields
+from backend.core.http_clients import get_shared_http_client
+from backend.core.playlist_diff import full_replace_cost, plan_playlist_diff
+from backend.core.search_cache import (
+    CANDIDATE_SEARCH_LIMIT,
+    CANDIDATES_NAMESPACE,
+    EXACT_SEARCH_LIMIT,
+    SearchCache,
+    get_search_cache,
+    slim_track,
+    track_search_query,
+)
+from backend.core.utils.helpers import rate_limit_retry
+from backend.core.utils.scoring import (
+    best_candidate_index,
+    provider_version_bonus,
+    score_candidate_pages,
+    score_candidates,
+)
 import logging
 
 logger = logging.getLogger("backend.core.providers.spotify")
 
+SPOTIFY_API_BASE_URL = "https://api.spotify.com/v1"
+# The several-tracks endpoint accepts at most 50 IDs per request
+MAX_TRACK_IDS_PER_REQUEST = 50
+
+
+def spotify_track_id(uri: Any) -> Optional[str]:
+    """Return the track ID of a ``spotify:track:<id>`` URI, or None for anything else."""
+    if isinstance(uri, str) and uri.startswith("spotify:track:"):
+        return uri.removeprefix("spotify:track:") or None
+    return None
+
+
+def _track_match(item: Dict[str, Any]) -> Dict[str, Any]:
+    """The match shape returned by search_track and get_tracks for a Spotify track object."""
+    return {
+        "artist": ", ".join([a["name"] for a in item["artists"]]),
+        "track": item["name"],
+        "album": item["album"]["name"],
+        "uri": item["uri"],
+        "duration_ms": item.get("duration_ms"),
+    }
+
+
+def get_spotify_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client used for Spotify Web API calls.
+
+    Auth headers are sent per request, so a single keep-alive pool can serve every user token.
+    """
+    return get_shared_http_client("spotify", base_url=SPOTIFY_API_BASE_URL)
+
 
 class SpotifyProvider(BaseMusicProvider):
-    def __init__(self, auth_token: str):
-        self.sp = spotipy.Spotify(auth=auth_token)
-        self._user_id = None
+    """Async Spotify Web API provider backed by a shared httpx connection pool."""
+
+    def __init__(
+        self,
+        auth_token: str,
+        http_client: httpx.AsyncClient | None = None,
+        search_cache: SearchCache | None = None,
+    ):
+        self.auth_token = auth_token
+        self.http_client = http_client or get_spotify_http_client()
+        self.search_cache = search_cache or get_search_cache()
+        self.headers = {"Authorization": f"Bearer {auth_token}"}
+        self._user_id: str | None = None
+
+    @rate_limit_retry
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Issue a Web API request, raising SpotifyException on errors so 429s share the retry policy."""
+        if not url.startswith("http"):
+            url = f"{SPOTIFY_API_BASE_URL}{url}"
+        response = await self.http_client.request(method, url, params=params, json=json, headers=self.headers)
+
+        if response.status_code >= 400:
+            try:
+                msg = response.json().get("error", {}).get("message", response.text)
+            except ValueError:
+                msg = response.text
+            raise SpotifyException(
+                response.status_code,
+                -1,
+                f"{response.request.url}:\n {msg}",
+                headers=dict(response.headers),
+            )
+
+        if not response.content:
+            return None
+        return response.json()
 
-    @property
-    def user_id(self) -> str:
+    async def get_user_id(self) -> str:
+        """Return (and cache) the Spotify user ID for the current token."""
         if self._user_id is None:
-            user = self.sp.current_user()
+            user = await self._request("GET", "/me")
             if user is None:
                 raise Exception("Failed to authenticate with Spotify")
             self._user_id = user["id"]
         return self._user_id
 
+    async def _search_candidates(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Run a track search, serving the candidate page from the search cache when possible."""
+        cache_key = self.search_cache.make_key(CANDIDATES_NAMESPACE, query, limit)
+        hit, cached = await self.search_cache.aget(cache_key)
+        if hit:
+            return cached or []
+
+        results = await self._request("GET", "/search", params={"q": query, "type": "track", "limit": limit})
+        candidates = [slim_track(item) for item in results["tracks"]["items"]] if results else []
+        await self.search_cache.aset(cache_key, candidates or None)
+        return candidates
+
     async def search_track(
         self,
         artist: str,
@@ -28,73 +131,140 @@ class SpotifyProvider(BaseMusicProvider):
         album: Optional[str] = None,
         version: Optional[str] = None,
     ) -> Optional[dict]:
-        # Implementation logic moved from client.py, adapted for async if needed
-        # For now, keeping synchronous calls but wrapped in async interface
+        cache_key = self.search_cache.make_key("provider", artist, track, album, version)
+        hit, cached = await self.search_cache.aget(cache_key)
+        if hit:
+            return cached
 
+        match = await self._search_track_uncached(artist, track, album, version)
+        await self.search_cache.aset(cache_key, match)
+        return match
+
+    async def _search_track_uncached(
+        self,
+        artist: str,
+        track: str,
+        album: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> Optional[dict]:
+        exact, candidates = await self._search_pages(artist, track, album)
+        if exact is not None or not candidates:
+            return exact
+
+        scores = score_candidates(artist, track, candidates, version=version, version_bonus=provider_version_bonus)
+        best = best_candidate_index(scores)
+        return _track_match(candidates[best]) if best is not None else None
+
+    async def _search_pages(
+        self, artist: str, track: str, album: Optional[str] = None
+    ) -> Tuple[Optional[dict], List[Dict[str, Any]]]:
+        """Return the exact album match if there is one, otherwise the candidate page to score."""
         if album:
-            query = f"track:{track} artist:{artist} album:{album}"
-            results = self.sp.search(q=query, type="track", limit=1)
-            if results and results["tracks"]["items"]:
-                item = results["tracks"]["items"][0]
-                return {
-                    "artist": ", ".join([a["name"] for a in item["artists"]]),
-                    "track": item["name"],
-                    "album": item["album"]["name"],
-                    "uri": item["uri"],
-                }
-
-        query = f"track:{track} artist:{artist}"
-        results = self.sp.search(q=query, type="track", limit=20)
-        if results is None or not results["tracks"]["items"]:
-            return None
+            exact = await self._search_candidates(track_search_query(artist, track, album), limit=EXACT_SEARCH_LIMIT)
+            if exact:
+                return _track_match(exact[0]), []
+        return None, await self._search_candidates(track_search_query(artist, track), limit=CANDIDATE_SEARCH_LIMIT)
+
+    async def search_tracks(
+        self,
+        queries: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        on_searched: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[Optional[dict]]:
+        """
+        Resolve many tracks like search_track, scoring every fetched candidate page in one batch.
+
+        Each query has ``artist`` and ``track`` and optional ``album``/``version`` keys. Searches run
+        with up to ``concurrency`` in flight and a failed search resolves to None. ``on_searched`` is
+        awaited after each track's search, one at a time from this coroutine.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.SPOTIFY_BUILD_CONCURRENCY)
+        keys = [
+            self.search_cache.make_key("provider", q.get("artist"), q.get("track"), q.get("album"), q.get("version"))
+            for q in queries
+        ]
+        matches: List[Optional[dict]] = [None] * len(queries)
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+
+        async def search(index: int) -> Tuple[int, bool, Optional[dict], List[Dict[str, Any]]]:
+            hit, cached = await self.search_cache.aget(keys[index])
+            if hit:
+                return index, False, cached, []
+            query = queries[index]
+            artist, track = str(query.get("artist", "")), str(query.get("track", ""))
+            async with semaphore:
+                try:
+                    exact, candidates = await self._search_pages(artist, track, query.get("album"))
+                except Exception as e:
+                    logger.warning(f"Search failed for {artist} - {track}: {e}")
+                    return index, False, None, []
+            if exact is not None or not candidates:
+                await self.search_cache.aset(keys[index], exact)
+            return index, exact is None and bool(candidates), exact, candidates
+
+        for pending in asyncio.as_completed([search(i) for i in range(len(queries))]):
+            index, needs_scoring, match, candidates = await pending
+            matches[index] = match
+            if needs_scoring:
+                pages[index] = candidates
+            if on_searched:
+                await on_searched()
+
+        if pages:
+            # Album matching is only used for the exact lookup, so candidates are scored on version
+            scored = list(pages)
+            page_scores = score_candidate_pages(
+                [
+                    {
+                        "artist": queries[i].get("artist"),
+                        "track": queries[i].get("track"),
+                        "version": queries[i].get("version"),
+                    }
+                    for i in scored
+                ],
+                [pages[i] for i in scored],
+                version_bonus=provider_version_bonus,
+            )
+            for index, scores in zip(scored, page_scores):
+                best = best_candidate_index(scores)
+                matches[index] = _track_match(pages[index][best]) if best is not None else None
+                await self.search_cache.aset(keys[index], matches[index])
+        return matches
 
-        candidates = results["tracks"]["items"]
-        best_match = None
-        best_score = -1.0
-
-        for item in candidates:
-            score = 0.0
-            item_name = item["name"]
-            item_artists = [a["name"] for a in item["artists"]]
-            item_album = item["album"]["name"]
-
-            # Artist Match
-            artist_match = max(_similarity(artist, a) for a in item_artists)
-            score += artist_match * 30
-
-            # Track Name Match
-            track_match = _similarity(track, item_name)
-            score += track_match * 40
-
-            # Version Preference
-            detected_version = _determine_version(item_name, item_album)
-            if version == detected_version:
-                score += 30
-            elif not version and detected_version == "studio":
-                score += 30
-
-            if score > best_score:
-                best_score = score
-                best_match = item
-
-        if best_match and best_score > 60:
-            return {
-                "artist": ", ".join([a["name"] for a in best_match["artists"]]),
-                "track": best_match["name"],
-                "album": best_match["album"]["name"],
-                "uri": best_match["uri"],
-            }
-        return None
+    async def get_tracks(self, track_uris: List[str]) -> Dict[str, dict]:
+        """
+        Fetch tracks by Spotify URI with the several-tracks endpoint, 50 IDs per request.
+
+        Returns the same shape as search_track, keyed by the requested URI; unknown or unavailable
+        tracks (and non-Spotify URIs) are left out.
+        """
+        ids = {uri: track_id for uri in dict.fromkeys(track_uris) if (track_id := spotify_track_id(uri))}
+        uris = list(ids)
+        found: Dict[str, dict] = {}
+        for i in range(0, len(uris), MAX_TRACK_IDS_PER_REQUEST):
+            batch = uris[i : i + MAX_TRACK_IDS_PER_REQUEST]
+            results = await self._request("GET", "/tracks", params={"ids": ",".join(ids[uri] for uri in batch)})
+            for uri, item in zip(batch, (results or {}).get("tracks") or []):
+                if item:
+                    found[uri] = _track_match(item)
+        return found
 
     async def create_playlist(self, name: str, description: str = "", public: bool = False) -> str:
-        playlist = self.sp.user_playlist_create(user=self.user_id, name=name, public=public, description=description)
+        user_id = await self.get_user_id()
+        playlist = await self._request(
+            "POST",
+            f"/users/{user_id}/playlists",
+            json={"name": name, "public": public, "description": description},
+        )
+        if playlist is None:
+            raise Exception(f"Failed to create playlist '{name}'")
         return playlist["id"]
 
     async def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> None:
         # Spotify has a 100-track limit per request
         for i in range(0, len(track_uris), 100):
             batch = track_uris[i : i + 100]
-            self.sp.playlist_add_items(playlist_id, batch)
+            await self._request("POST", f"/playlists/{playlist_id}/tracks", json={"uris": batch})
 
     async def replace_playlist_tracks(self, playlist_id: str, track_uris: List[str]) -> None:
         """Replace all tracks in a Spotify playlist with the given list of URIs."""
@@ -102,23 +272,96 @@ class SpotifyProvider(BaseMusicProvider):
         first_batch = track_uris[:100]
         remaining_uris = track_uris[100:]
 
-        # First call uses replace_playlist_items
-        self.sp.playlist_replace_items(playlist_id, first_batch)
+        # First call replaces the playlist contents
+        await self._request("PUT", f"/playlists/{playlist_id}/tracks", json={"uris": first_batch})
+
+        # Subsequent calls append
+        await self.add_tracks_to_playlist(playlist_id, remaining_uris)
+
+    async def _get_remaining_items(
+        self, playlist_id: str, first_page: Dict[str, Any], fields: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the items of every tracks page after ``first_page``, fetched concurrently when possible."""
+        offsets = remaining_offsets(first_page)
+        if offsets is None:
+            # No total reported: follow the next links one page at a time
+            items: List[Dict[str, Any]] = []
+            page: Optional[Dict[str, Any]] = first_page
+            while page and page.get("next"):
+                page = await self._request("GET", page["next"])
+                if page:
+                    items.extend(page["items"])
+            return items
+        if not offsets:
+            return []
+
+        params: Dict[str, Any] = {"limit": first_page["limit"]}
+        if fields:
+            params["fields"] = fields
+
+        async def fetch(offset: int) -> Optional[Dict[str, Any]]:
+            return await self._request("GET", f"/playlists/{playlist_id}/tracks", params={**params, "offset": offset})
+
+        pages = await fetch_pages_concurrently(fetch, offsets, settings.SPOTIFY_PAGE_CONCURRENCY)
+        return [item for page in pages if page for item in page["items"]]
+
+    async def get_playlist_snapshot(self, playlist_id: str) -> Tuple[str, List[Optional[str]]]:
+        """
+        Fetch a playlist's snapshot_id together with its ordered track URIs.
+
+        Items without a track (unavailable or removed tracks) are kept as None so every position
+        still lines up with the remote playlist.
+        """
+        page = await self._request(
+            "GET",
+            f"/playlists/{playlist_id}",
+            params={"fields": playlist_fields("uris")},
+        )
+        if page is None:
+            raise Exception(f"Failed to fetch playlist '{playlist_id}'")
+        snapshot_id = page["snapshot_id"]
+        items = page["tracks"]["items"]
+        items.extend(await self._get_remaining_items(playlist_id, page["tracks"], fields=tracks_page_fields("uris")))
+        return snapshot_id, [item["track"]["uri"] if item.get("track") else None for item in items]
+
+    async def sync_playlist_tracks(self, playlist_id: str, track_uris: List[str]) -> None:
+        """Apply the minimal remove/reorder/insert diff that makes a playlist match track_uris."""
+        snapshot_id, remote_slots = await self.get_playlist_snapshot(playlist_id)
+        remote_uris = [uri for uri in remote_slots if uri is not None]
+        if len(remote_uris) < len(remote_slots):
+            # Track-less items can't be removed by URI and would shift every diff position
+            await self.replace_playlist_tracks(playlist_id, track_uris)
+            return
+
+        ops = plan_playlist_diff(remote_uris, track_uris)
+        if not ops:
+            return
 
-        # Subsequent calls use playlist_add_items
-        for i in range(0, len(remaining_uris), 100):
-            batch = remaining_uris[i : i + 100]
-            self.sp.playlist_add_items(playlist_id, batch)
+        if len(ops) > full_replace_cost(track_uris):
+            await self.replace_playlist_tracks(playlist_id, track_uris)
+            return
 
-    async def get_playlist(self, playlist_id: str) -> dict:
-        results = self.sp.playlist(playlist_id)
-        tracks = results["tracks"]["items"]
+        url = f"/playlists/{playlist_id}/tracks"
+        for op in ops:
+            # Each write targets the snapshot produced by the previous one
+            if op["type"] == "remove":
+                body = {"tracks": [{"uri": uri} for uri in op["uris"]], "snapshot_id": snapshot_id}
+                result = await self._request("DELETE", url, json=body)
+            elif op["type"] == "reorder":
+                body = {key: op[key] for key in ("range_start", "insert_before", "range_length")}
+                result = await self._request("PUT", url, json={**body, "snapshot_id": snapshot_id})
+            else:
+                result = await self._request("POST", url, json={"uris": op["uris"], "position": op["position"]})
+            snapshot_id = (result or {}).get("snapshot_id", snapshot_id)
 
-        # Helper to follow pagination
-        current_page = results["tracks"]
-        while current_page["next"]:
-            current_page = self.sp.next(current_page)
-            tracks.extend(current_page["items"])
+    async def get_playlist(self, playlist_id: str, use_case: str = "import") -> dict:
+        """Fetch a playlist with all its items, limited to the fields ``use_case`` reads (see spotify_fields)."""
+        results = await self._request("GET", f"/playlists/{playlist_id}", params={"fields": playlist_fields(use_case)})
+        if results is None:
+            raise Exception(f"Failed to fetch playlist '{playlist_id}'")
 
-        results["tracks"]["items"] = tracks
+        # Fetch the remaining pages, in parallel once the first page reports the total
+        remaining = await self._get_remaining_items(playlist_id, results["tracks"], fields=tracks_page_fields(use_case))
+        results["tracks"]["items"].extend(remaining)
+        results["tracks"]["next"] = None
         return results
@@ -0,0 +1,34 @@
+# Spotify ``fields=`` projections for each read path. Full playlist responses carry album art, markets
+# and more for every track; asking only for what a use case reads shrinks large playlists several-fold.
+
+# Always kept so the paginator can compute the remaining offsets
+PAGING_FIELDS = "total,limit,offset,next"
+
+# Per-track fields each use case reads from playlist items
+TRACK_PROJECTIONS: dict[str, str] = {
+    # Sync and clear only diff URIs
+    "uris": "track(uri)",
+    # Export and backup write uri, artist, name, album and a version derived from name/album
+    "export": "track(uri,name,artists(name),album(name))",
+    # Import also stores the duration
+    "import": "track(uri,name,duration_ms,artists(name),album(name))",
+}
+
+# Playlist-level fields read alongside the first page of tracks (export only ever reads track pages)
+PLAYLIST_PROJECTIONS: dict[str, str] = {
+    "uris": "snapshot_id",
+    "import": "name,description,public",
+}
+
+# Playlist details only (no tracks), e.g. to compare description and visibility before updating
+PLAYLIST_DETAILS_FIELDS = "description,public"
+
+
+def tracks_page_fields(use_case: str) -> str:
+    """Projection for a page of playlist items (``/playlists/{id}/tracks``)."""
+    return f"{PAGING_FIELDS},items({TRACK_PROJECTIONS[use_case]})"
+
+
+def playlist_fields(use_case: str) -> str:
+    """Projection for a playlist with its first page of items (``/playlists/{id}``)."""
+    return f"{PLAYLIST_PROJECTIONS[use_case]},tracks({tracks_page_fields(use_case)})"
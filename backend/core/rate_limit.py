@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Awaitable, cast
+
+import redis.asyncio as aioredis
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger("backend.core.rate_limit")
+
+KEY_PREFIX = "vibomat:ratelimit"
+
+# Reserve one token and return how long the caller must wait for it. Tokens may go negative: each
+# caller queues behind the ones already holding reservations, so waits are spaced exactly 1/rate apart.
+# Lua numbers are truncated to integers on return, hence the string.
+RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket shared by every thread and event loop in the process.
+    With a Redis URL the bucket state lives in Redis so all API and taskiq workers share one budget;
+    Redis failures fall back to the in-process bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, name: str = "default", redis_url: str | None = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.key = f"{KEY_PREFIX}:{name}"
+        self.redis_url = redis_url
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._aredis: aioredis.Redis | None = None
+
+    def _reserve_local(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate) - 1
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def _get_aredis(self) -> aioredis.Redis | None:
+        if self.redis_url and self._aredis is None:
+            self._aredis = aioredis.Redis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._aredis
+
+    async def _reserve(self) -> float:
+        client = self._get_aredis()
+        if client is None:
+            return self._reserve_local()
+        try:
+            # redis-py types eval for both its sync and asyncio clients; on the asyncio client it is awaitable
+            reply = client.eval(RESERVE_SCRIPT, 1, self.key, self.rate, self.capacity)
+            return float(await cast(Awaitable[str], reply))
+        except Exception as e:
+            logger.debug(f"Shared rate limiter unavailable for {self.key}, using local bucket: {e}")
+            return self._reserve_local()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        delay = await self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    In-process token bucket whose budget follows the rate limit headers of the upstream API.
+
+    The bucket holds up to one window's worth of requests, so bursts use the whole budget. Every
+    response's remaining count clamps the local tokens, slowing callers down as the server-side
+    count approaches zero, including when other processes share the same token.
+    """
+
+    def __init__(self, requests_per_window: int, window: float = 60.0, name: str = "default"):
+        super().__init__(rate=requests_per_window / window, capacity=requests_per_window, name=name)
+        self.window = window
+
+    def update(self, limit: int | None = None, remaining: int | None = None) -> None:
+        """Apply the limit and remaining counts reported by the server."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+            self._updated = now
+            if limit:
+                self.rate = limit / self.window
+                self.capacity = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+
+
+_musicbrainz_limiter: TokenBucket | None = None
+_discogs_limiters: dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_musicbrainz_limiter() -> TokenBucket:
+    """Return the process-wide MusicBrainz limiter configured from settings."""
+    global _musicbrainz_limiter
+    if _musicbrainz_limiter is None:
+        _musicbrainz_limiter = TokenBucket(
+            rate=settings.MUSICBRAINZ_REQUESTS_PER_SECOND,
+            name="musicbrainz",
+            redis_url=str(settings.REDIS_URL) if settings.MUSICBRAINZ_RATE_LIMIT_REDIS_ENABLED else None,
+        )
+    return _musicbrainz_limiter
+
+
+def reset_musicbrainz_limiter() -> None:
+    """Drop the process-wide MusicBrainz limiter so the next call rebuilds it from settings."""
+    global _musicbrainz_limiter
+    _musicbrainz_limiter = None
+
+
+def get_discogs_limiter(token: str) -> AdaptiveRateLimiter:
+    """Return the process-wide limiter for a Discogs token (Discogs limits are per token)."""
+    limiter = _discogs_limiters.get(token)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(settings.DISCOGS_REQUESTS_PER_MINUTE, window=60.0, name="discogs")
+        _discogs_limiters[token] = limiter
+    return limiter
+
+
+def reset_discogs_limiters() -> None:
+    """Drop every Discogs limiter so the next call rebuilds them from settings."""
+    _discogs_limiters.clear()
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+import redis
+import redis.asyncio as aioredis
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger("backend.core.search_cache")
+
+KEY_PREFIX = "vibomat:search"
+
+# Namespaces for cached values. Resolved results differ per caller because the builder and the
+# provider score candidates differently; candidate pages are raw search results and are shared.
+RESOLVED_NAMESPACES = ("builder", "provider")
+CANDIDATES_NAMESPACE = "candidates"
+
+# Page sizes of the two searches behind a track resolution: the exact album lookup and the fuzzy page
+EXACT_SEARCH_LIMIT = 1
+CANDIDATE_SEARCH_LIMIT = 20
+
+
+def normalize_part(value: Any) -> str:
+    """Normalize a key component so trivial spelling differences hit the same entry."""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def track_search_query(artist: str, track: str, album: str | None = None) -> str:
+    """Spotify search query for a track, narrowed to ``album`` when given."""
+    query = f"track:{track} artist:{artist}"
+    return f"{query} album:{album}" if album else query
+
+
+def slim_track(item: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the track fields used for matching so cached candidate pages stay small."""
+    return {
+        "name": item.get("name", ""),
+        "artists": [{"name": a["name"]} for a in item.get("artists", [])],
+        "album": {"name": (item.get("album") or {}).get("name", "")},
+        "uri": item["uri"],
+        "duration_ms": item.get("duration_ms"),
+    }
+
+
+class SearchCache:
+    """
+    Two-tier cache for track search results: an in-process LRU backed by an optional shared Redis tier.
+    Misses (``None`` results) are cached too, with a shorter TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: int = 60 * 60 * 24 * 7,
+        negative_ttl: int = 60 * 60 * 6,
+        redis_url: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.redis_url = redis_url
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: redis.Redis | None = None
+        self._aredis: aioredis.Redis | None = None
+
+    key_prefix = KEY_PREFIX
+
+    @classmethod
+    def make_key(cls, namespace: str, *parts: Any) -> str:
+        """Build a cache key from a namespace and normalized key parts."""
+        digest = hashlib.sha1(json.dumps([normalize_part(p) for p in parts]).encode()).hexdigest()
+        return f"{cls.key_prefix}:{namespace}:{digest}"
+
+    def _ttl_for(self, value: Any) -> int:
+        return self.negative_ttl if value is None else self.ttl
+
+    # In-process tier
+
+    def _local_get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def _local_set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _local_delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # Shared tier
+
+    def _get_redis(self) -> redis.Redis | None:
+        if self.redis_url and self._redis is None:
+            self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._redis
+
+    def _get_aredis(self) -> aioredis.Redis | None:
+        if self.redis_url and self._aredis is None:
+            self._aredis = aioredis.Redis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._aredis
+
+    def _decode(self, key: str, raw: Any) -> tuple[bool, Any]:
+        if raw is None:
+            return False, None
+        value = json.loads(raw)["v"]
+        # Promote to the local tier; the remaining Redis TTL is unknown, so use the full TTL
+        self._local_set(key, value, self._ttl_for(value))
+        return True, value
+
+    # Public API
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return ``(hit, value)``; a hit may carry ``None`` for a cached miss."""
+        hit, value = self._local_get(key)
+        if hit:
+            return hit, value
+        client = self._get_redis()
+        if client is None:
+            return False, None
+        try:
+            return self._decode(key, client.get(key))
+        except Exception as e:
+            logger.debug(f"Search cache read failed for {key}: {e}")
+            return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value (``None`` records a negative result)."""
+        ttl = self._ttl_for(value)
+        self._local_set(key, value, ttl)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.set(key, json.dumps({"v": value}), ex=ttl)
+        except Exception as e:
+            logger.debug(f"Search cache write failed for {key}: {e}")
+
+    async def aget(self, key: str) -> tuple[bool, Any]:
+        """Async variant of get for use on the event loop."""
+        hit, value = self._local_get(key)
+        if hit:
+            return hit, value
+        client = self._get_aredis()
+        if client is None:
+            return False, None
+        try:
+            return self._decode(key, await client.get(key))
+        except Exception as e:
+            logger.debug(f"Search cache read failed for {key}: {e}")
+            return False, None
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Async variant of set for use on the event loop."""
+        ttl = self._ttl_for(value)
+        self._local_set(key, value, ttl)
+        client = self._get_aredis()
+        if client is None:
+            return
+        try:
+            await client.set(key, json.dumps({"v": value}), ex=ttl)
+        except Exception as e:
+            logger.debug(f"Search cache write failed for {key}: {e}")
+
+    def _track_keys(self, artist: str, track: str, album: str | None, version: str | None) -> list[str]:
+        keys = [self.make_key(ns, artist, track, album, version) for ns in RESOLVED_NAMESPACES]
+        # The candidate pages behind the resolution, or the next lookup would re-score stale results
+        keys.append(self.make_key(CANDIDATES_NAMESPACE, track_search_query(artist, track), CANDIDATE_SEARCH_LIMIT))
+        if album:
+            keys.append(
+                self.make_key(CANDIDATES_NAMESPACE, track_search_query(artist, track, album), EXACT_SEARCH_LIMIT)
+            )
+        return keys
+
+    def invalidate(self, artist: str, track: str, album: str | None = None, version: str | None = None) -> None:
+        """Drop the resolved entries for a track, and the search pages they came from, from both tiers."""
+        keys = self._track_keys(artist, track, album, version)
+        for key in keys:
+            self._local_delete(key)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.delete(*keys)
+        except Exception as e:
+            logger.debug(f"Search cache invalidation failed: {e}")
+
+    async def ainvalidate(self, artist: str, track: str, album: str | None = None, version: str | None = None) -> None:
+        """Async variant of invalidate."""
+        keys = self._track_keys(artist, track, album, version)
+        for key in keys:
+            self._local_delete(key)
+        client = self._get_aredis()
+        if client is None:
+            return
+        try:
+            await client.delete(*keys)
+        except Exception as e:
+            logger.debug(f"Search cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every entry from the local tier and every key under this cache's prefix from the shared tier."""
+        with self._lock:
+            self._entries.clear()
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            keys = list(client.scan_iter(match=f"{self.key_prefix}:*"))
+            if keys:
+                client.delete(*keys)
+        except Exception as e:
+            logger.debug(f"Search cache clear failed: {e}")
+
+
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache configured from settings."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache(
+            max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+            ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+            negative_ttl=settings.SEARCH_CACHE_NEGATIVE_TTL_SECONDS,
+            redis_url=str(settings.REDIS_URL) if settings.SEARCH_CACHE_REDIS_ENABLED else None,
+        )
+    return _search_cache
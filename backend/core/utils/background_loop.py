@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever on a daemon thread, so synchronous code (the spotipy builder and its
+    worker threads) can call async code without paying for a new loop per call. Async clients used
+    through it stay bound to this one loop for their whole life.
+    """
+
+    def __init__(self, name: str = "vibomat-background-loop"):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, daemon=True, name=self.name)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run a coroutine on the background loop and block until it finishes.
+
+        Safe to call from any thread, including one that is itself running an event loop, but not
+        from a coroutine already running on the background loop (that would deadlock).
+        """
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() cannot be called from the background loop itself")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_background_loop: BackgroundLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Return the process-wide background loop used by synchronous callers."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundLoop()
+        return _background_loop
+
+
+def reset_background_loop() -> None:
+    """Stop and drop the process-wide background loop so the next call starts a fresh one."""
+    global _background_loop
+    with _background_loop_lock:
+        loop, _background_loop = _background_loop, None
+    if loop:
+        loop.stop()
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run a coroutine to completion on the process-wide background loop."""
+    return get_background_loop().run(coro, timeout)
@@ -1,4 +1,3 @@
-import difflib
 import logging
 import re
 from spotipy.exceptions import SpotifyException
@@ -9,6 +8,7 @@ from tenacity import (
     retry_if_exception,
     before_sleep_log,
 )
+from .similarity import get_similarity_engine
 
 logger = logging.getLogger("backend.core")
 
@@ -28,8 +28,8 @@ rate_limit_retry = retry(
 
 
 def _similarity(s1: str, s2: str) -> float:
-    """Calculate string similarity ratio."""
-    return difflib.SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
+    """Calculate string similarity ratio (0-1) with the configured similarity engine."""
+    return get_similarity_engine()(s1, s2)
 
 
 def _determine_version(track_name: str, album_name: str) -> str:
@@ -0,0 +1,66 @@
+import json
+from typing import Any
+
+
+class TrackStreamParser:
+    """
+    Incremental parser that pulls complete track objects out of a partially received playlist JSON.
+
+    Handles both the ``{"title": ..., "tracks": [...]}`` schema and the legacy top-level list. Text
+    outside the JSON value (such as markdown fences) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: str | None = None
+        self._tracks_depth: int | None = None
+        self._object_start: int | None = None
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """Consume the next chunk and return the track objects it completed."""
+        self.buffer += text
+        completed: list[dict[str, Any]] = []
+        buffer = self.buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        # Top-level strings are keys or values; only the key before "[" matters
+                        self._last_key = buffer[self._string_start + 1 : pos]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                if char == "[" and self._tracks_depth is None:
+                    if not self._stack or (self._stack == ["{"] and self._last_key == "tracks"):
+                        self._tracks_depth = len(self._stack) + 1
+                if char == "{" and self._tracks_depth is not None and len(self._stack) == self._tracks_depth:
+                    self._object_start = pos
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if (
+                    char == "}"
+                    and self._object_start is not None
+                    and self._tracks_depth is not None
+                    and len(self._stack) == self._tracks_depth
+                ):
+                    item = json.loads(buffer[self._object_start : pos + 1])
+                    self._object_start = None
+                    if isinstance(item, dict):
+                        completed.append(item)
+        self._pos = len(buffer)
+        return completed
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from .helpers import _determine_version
+from .similarity import batch_similarity
+
+ARTIST_WEIGHT = 30
+TRACK_WEIGHT = 40
+ALBUM_WEIGHT = 30
+VERIFICATION_BONUS = 20
+MATCH_THRESHOLD = 60
+
+# Versions where the builder asks external metadata to confirm the candidate
+VERIFIED_VERSIONS = ("live", "remix", "remaster")
+
+VersionBonus = Callable[[str | None, str], float]
+
+
+def builder_version_bonus(requested: str | None, detected: str) -> float:
+    """Version preference weight used by SpotifyPlaylistBuilder.search_track."""
+    if requested in ("live", "remix", "compilation", "remaster", "instrumental", "acoustic"):
+        return 30 if detected == requested else 5
+    if requested == "original":
+        # For original, we specifically want studio and NOT remaster
+        return {"studio": 30, "remaster": 10}.get(detected, 5)
+    # Default: Studio/Original preference; remaster beats live/remix if we want studio
+    return {"studio": 30, "remaster": 20}.get(detected, 10)
+
+
+def provider_version_bonus(requested: str | None, detected: str) -> float:
+    """Version preference weight used by SpotifyProvider.search_track."""
+    if requested == detected or (not requested and detected == "studio"):
+        return 30
+    return 0
+
+
+def score_candidate_pages(
+    queries: Sequence[dict[str, Any]],
+    pages: Sequence[Sequence[dict[str, Any]]],
+    version_bonus: VersionBonus = builder_version_bonus,
+    detect_version: Callable[[str, str], str] = _determine_version,
+) -> list[np.ndarray]:
+    """
+    Score the candidate page of every query in one pass.
+
+    Each query is a track entry with ``artist``, ``track`` and optional ``album``/``version`` keys and
+    each page a list of Spotify track objects. All artist and title comparisons across every page are
+    scored as two flat arrays, then combined with the search_track weights: artist 30, track 40 and
+    either album similarity 30 (when the query has an album) or the version preference bonus.
+    """
+    artist_left: list[str] = []
+    artist_right: list[str] = []
+    artist_starts: list[int] = []
+    track_left: list[str] = []
+    track_right: list[str] = []
+    album_left: list[str] = []
+    album_right: list[str] = []
+    preference: list[float] = []
+    album_mask: list[bool] = []
+
+    for query, page in zip(queries, pages):
+        artist = str(query.get("artist") or "")
+        track = str(query.get("track") or "")
+        album = query.get("album")
+        version = query.get("version")
+        for item in page:
+            item_name = item["name"]
+            item_album = item["album"]["name"]
+            artist_starts.append(len(artist_left))
+            for candidate_artist in [a["name"] for a in item["artists"]] or [""]:
+                artist_left.append(artist)
+                artist_right.append(candidate_artist)
+            track_left.append(track)
+            track_right.append(item_name)
+            album_left.append(album or "")
+            album_right.append(item_album if album else "")
+            album_mask.append(bool(album))
+            preference.append(0.0 if album else version_bonus(version, detect_version(item_name, item_album)))
+
+    if not track_left:
+        return [np.zeros(0) for _ in pages]
+
+    # Best similarity among each candidate's credited artists
+    artist_scores = np.maximum.reduceat(batch_similarity(artist_left, artist_right), artist_starts)
+    track_scores = batch_similarity(track_left, track_right)
+    mask = np.array(album_mask)
+    preference_scores = np.array(preference)
+    if mask.any():
+        album_scores = batch_similarity(album_left, album_right)
+        preference_scores = np.where(mask, album_scores * ALBUM_WEIGHT, preference_scores)
+
+    scores = artist_scores * ARTIST_WEIGHT + track_scores * TRACK_WEIGHT + preference_scores
+
+    offsets = np.cumsum([0] + [len(page) for page in pages])
+    return [scores[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def score_candidates(
+    artist: str,
+    track: str,
+    candidates: Sequence[dict[str, Any]],
+    album: str | None = None,
+    version: str | None = None,
+    version_bonus: VersionBonus = builder_version_bonus,
+    detect_version: Callable[[str, str], str] = _determine_version,
+) -> np.ndarray:
+    """Score a single candidate page; see score_candidate_pages."""
+    query = {"artist": artist, "track": track, "album": album, "version": version}
+    return score_candidate_pages([query], [candidates], version_bonus, detect_version)[0]
+
+
+def best_candidate_index(scores: np.ndarray, threshold: float = MATCH_THRESHOLD) -> int | None:
+    """Return the index of the first top-scoring candidate above the threshold, if any."""
+    if not len(scores):
+        return None
+    best = int(np.argmax(scores))
+    return best if scores[best] > threshold else None
@@ -0,0 +1,108 @@
+import difflib
+import logging
+from functools import lru_cache
+from typing import Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("backend.core.similarity")
+
+try:
+    from rapidfuzz.distance import Indel
+    from rapidfuzz.process import cpdist
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the optional 'speedups' extra
+    RAPIDFUZZ_AVAILABLE = False
+
+SimilarityFunc = Callable[[str, str], float]
+
+
+@lru_cache(maxsize=65536)
+def _difflib_ratio(s1: str, s2: str) -> float:
+    return difflib.SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
+
+
+def difflib_similarity(s1: str, s2: str) -> float:
+    """Reference scorer: difflib's Ratcliff/Obershelp ratio, memoized per string pair."""
+    return _difflib_ratio(s1, s2)
+
+
+def rapidfuzz_similarity(s1: str, s2: str) -> float:
+    """C-accelerated normalized Indel similarity: difflib's 2*M/T formula with M as the exact LCS length."""
+    if not RAPIDFUZZ_AVAILABLE:
+        raise RuntimeError("rapidfuzz is not installed")
+    return Indel.normalized_similarity(s1.lower(), s2.lower())
+
+
+@lru_cache(maxsize=16384)
+def _bigrams(text: str) -> frozenset[str]:
+    normalized = " ".join(text.lower().split())
+    return frozenset(normalized[i : i + 2] for i in range(len(normalized) - 1))
+
+
+def bigram_similarity(s1: str, s2: str) -> float:
+    """Pure-Python Sorensen-Dice coefficient over character bigram sets with cached normalization."""
+    a, b = _bigrams(s1), _bigrams(s2)
+    if not a or not b:
+        return 1.0 if s1.lower().strip() == s2.lower().strip() else 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+SIMILARITY_ENGINES: dict[str, SimilarityFunc] = {
+    "difflib": difflib_similarity,
+    "bigram": bigram_similarity,
+}
+if RAPIDFUZZ_AVAILABLE:
+    SIMILARITY_ENGINES["rapidfuzz"] = rapidfuzz_similarity
+
+
+def resolve_engine(name: str) -> SimilarityFunc:
+    """
+    Look up a scorer by name.
+
+    'auto' uses rapidfuzz when the 'speedups' extra is installed (the Docker image and CI install it)
+    and otherwise stays on memoized difflib, the reference the match thresholds were tuned against.
+    The bigram engine is faster but scores differently, so it is only used when selected explicitly.
+    """
+    if name == "auto":
+        return SIMILARITY_ENGINES.get("rapidfuzz", difflib_similarity)
+    if name not in SIMILARITY_ENGINES:
+        logger.warning(f"Unknown similarity engine '{name}', falling back to 'auto'.")
+        return resolve_engine("auto")
+    return SIMILARITY_ENGINES[name]
+
+
+_active_engine: SimilarityFunc | None = None
+
+
+def get_similarity_engine() -> SimilarityFunc:
+    """Return the scorer selected by SIMILARITY_ENGINE."""
+    global _active_engine
+    if _active_engine is None:
+        from backend.app.core.config import settings
+
+        _active_engine = resolve_engine(settings.SIMILARITY_ENGINE)
+    return _active_engine
+
+
+def set_similarity_engine(engine: str | SimilarityFunc) -> None:
+    """Swap the active scorer, either by registered name or with a custom callable."""
+    global _active_engine
+    _active_engine = resolve_engine(engine) if isinstance(engine, str) else engine
+
+
+def batch_similarity(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """Score ``left[i]`` against ``right[i]`` for every i with the active engine, as a float array.
+
+    With the rapidfuzz engine all pairs are scored in a single C call; other engines fall back to a loop.
+    """
+    engine = get_similarity_engine()
+    if engine is rapidfuzz_similarity and RAPIDFUZZ_AVAILABLE:
+        return cpdist(
+            [s.lower() for s in left],
+            [s.lower() for s in right],
+            scorer=Indel.normalized_similarity,
+            dtype=np.float64,
+        )
+    return np.fromiter((engine(s1, s2) for s1, s2 in zip(left, right)), dtype=np.float64, count=len(left))
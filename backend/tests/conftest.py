@@ -1,7 +1,7 @@
 import os
 import sys
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from backend.app.db.session import Base
 
@@ -20,6 +20,72 @@ def mock_discogs_pat_global():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Keep the process-wide track search cache from leaking results between tests."""
+    from backend.core.search_cache import get_search_cache
+
+    get_search_cache().clear()
+    yield
+    get_search_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_generation_cache():
+    """Keep cached AI generations from leaking between tests."""
+    from backend.core.generation_cache import get_generation_cache
+
+    cache = get_generation_cache()
+    if cache:
+        cache.clear()
+    yield
+    if cache:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_musicbrainz_limiter():
+    """Give every test a fresh MusicBrainz token bucket."""
+    from backend.core.rate_limit import reset_musicbrainz_limiter
+
+    reset_musicbrainz_limiter()
+    yield
+    reset_musicbrainz_limiter()
+
+
+@pytest.fixture(autouse=True)
+def reset_discogs_clients():
+    """Give every test fresh shared Discogs clients and rate limiters."""
+    from backend.core.providers.discogs import reset_discogs_clients
+    from backend.core.rate_limit import reset_discogs_limiters
+
+    reset_discogs_clients()
+    reset_discogs_limiters()
+    yield
+    reset_discogs_clients()
+    reset_discogs_limiters()
+
+
+@pytest.fixture(autouse=True)
+def reset_model_registry():
+    """Keep cached Gemini model listings and failures from leaking between tests."""
+    from backend.core.model_registry import reset_model_registry
+
+    reset_model_registry()
+    yield
+    reset_model_registry()
+
+
+@pytest.fixture(autouse=True)
+def reset_http_clients():
+    """Give every test fresh shared HTTP clients bound to its own event loop."""
+    from backend.core.http_clients import reset_http_clients
+
+    reset_http_clients()
+    yield
+    reset_http_clients()
+
+
 @pytest.fixture
 async def test_db():
     """Create a fresh engine and tables for each test to avoid loop mismatches."""
@@ -72,7 +138,13 @@ def builder(mock_spotify):
         # Setup mock verifier instance
         mock_verifier_instance = MagicMock()
         # Default behavior: verify_track_version returns False (neutral)
-        mock_verifier_instance.verify_track_version.return_value = False
+        mock_verifier_instance.verify_track_version = AsyncMock(return_value=False)
+
+        # The batched call delegates to verify_track_version so tests can configure a single method
+        async def verify_track_versions(tracks, version):
+            return [await mock_verifier_instance.verify_track_version(a, t, version) for a, t in tracks]
+
+        mock_verifier_instance.verify_track_versions = verify_track_versions
         mock_verifier_cls.return_value = mock_verifier_instance
 
         builder = SpotifyPlaylistBuilder("fake_client_id", "fake_client_secret")
@@ -3,12 +3,18 @@ from unittest.mock import MagicMock, patch, AsyncMock
 import pytest
 import httpx
 from backend.core.ai import (
+    close_gemini_client,
+    create_gemini_client,
+    embed_text_async,
     get_ai_api_key,
     generate_playlist,
+    generate_playlist_async,
+    generate_playlist_stream,
     list_available_models,
     discover_fallback_model,
 )
 from backend.core.metadata import MetadataVerifier
+from backend.core.model_registry import get_model_registry, reset_model_registry
 from backend.app.core.config import settings
 from backend.core.providers.spotify import SpotifyProvider
 
@@ -90,6 +96,178 @@ def test_generate_playlist_failure():
             generate_playlist("mood")
 
 
+async def test_generate_playlist_async_uses_aio_client():
+    """Test the async path awaits the SDK's aio client instead of the blocking one."""
+    mock_response = MagicMock()
+    mock_response.text = json.dumps({"title": "Async", "tracks": [{"artist": "A", "track": "B"}]})
+
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+
+        result = await generate_playlist_async("mood", count=3)
+
+    assert result["title"] == "Async"
+    mock_client.aio.models.generate_content.assert_awaited_once()
+    mock_client.models.generate_content.assert_not_called()
+
+
+async def test_generate_playlist_async_retries_without_blocking():
+    """Test transient failures are retried with asyncio.sleep rather than time.sleep."""
+    mock_response = MagicMock()
+    mock_response.text = '{"tracks": []}'
+
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+        patch("asyncio.sleep", new=AsyncMock()) as mock_sleep,
+        patch("time.sleep") as mock_time_sleep,
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=[Exception("503 Unavailable"), mock_response])
+
+        result = await generate_playlist_async("mood")
+
+    assert result == {"tracks": []}
+    mock_sleep.assert_awaited_once()
+    mock_time_sleep.assert_not_called()
+
+
+async def test_generate_playlist_async_404_fallback():
+    """Test the async path falls back to a discovered model on 404."""
+    mock_response = MagicMock()
+    mock_response.text = '{"tracks": []}'
+
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+        patch("backend.core.ai.discover_fallback_model", return_value="gemini-fallback-flash"),
+        patch.object(settings, "GEMINI_MODEL", "missing-model"),
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=[Exception("404 Not Found"), mock_response])
+
+        await generate_playlist_async("mood")
+
+    models = [c.kwargs["model"] for c in mock_client.aio.models.generate_content.call_args_list]
+    assert models == ["missing-model", "gemini-fallback-flash"]
+
+
+def fake_stream(*texts):
+    """Build an async generator of Gemini stream chunks."""
+
+    async def stream():
+        for text in texts:
+            yield MagicMock(text=text)
+
+    return stream()
+
+
+async def test_generate_playlist_stream_yields_tracks_incrementally():
+    """Test tracks are emitted as soon as the streamed JSON completes them."""
+    chunks = [
+        '{"title": "Streamed", "description": "D", "tracks": [{"artist": "A", ',
+        '"track": "One"}, {"artist": "B", "track": "Two"',
+        "}]}",
+    ]
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.aio.models.generate_content_stream = AsyncMock(return_value=fake_stream(*chunks))
+
+        events = [event async for event in generate_playlist_stream("mood", count=2)]
+
+    assert events[0] == {"type": "track", "track": {"artist": "A", "track": "One"}}
+    assert events[1] == {"type": "track", "track": {"artist": "B", "track": "Two"}}
+    assert events[2]["type"] == "playlist"
+    assert events[2]["playlist"]["title"] == "Streamed"
+    assert len(events[2]["playlist"]["tracks"]) == 2
+
+
+async def test_generate_playlist_stream_404_fallback():
+    """Test the stream falls back to a discovered model when the configured one is missing."""
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+        patch("backend.core.ai.discover_fallback_model", return_value="gemini-fallback-flash"),
+        patch.object(settings, "GEMINI_MODEL", "missing-model"),
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.aio.models.generate_content_stream = AsyncMock(
+            side_effect=[Exception("404 Not Found"), fake_stream('{"tracks": []}')]
+        )
+
+        events = [event async for event in generate_playlist_stream("mood")]
+
+    assert events == [{"type": "playlist", "playlist": {"tracks": []}}]
+    models = [c.kwargs["model"] for c in mock_client.aio.models.generate_content_stream.call_args_list]
+    assert models == ["missing-model", "gemini-fallback-flash"]
+
+
+async def test_verify_ai_tracks_accepts_async_source(async_mock_client, mock_spotify_provider):
+    """Test that tracks from an async source are verified as they arrive."""
+    from backend.core.ai import iter_verified_ai_tracks
+
+    async def source():
+        yield {"artist": "A", "track": "One"}
+        yield {"artist": "B", "track": "Two"}
+
+    with patch("backend.core.ai.MetadataVerifier") as mock_verifier_cls:
+        mock_verifier_cls.return_value.verify_track_version = AsyncMock(side_effect=[True, False])
+        results = [r async for r in iter_verified_ai_tracks(source(), async_mock_client, mock_spotify_provider)]
+
+    assert results == [({"artist": "A", "track": "One"}, True), ({"artist": "B", "track": "Two"}, False)]
+
+
+async def test_create_gemini_client_uses_pooled_transports():
+    """Test the shared client pools connections with the configured limits and closes cleanly."""
+    with (
+        patch.object(settings, "GEMINI_MAX_CONNECTIONS", 7),
+        patch.object(settings, "GEMINI_MAX_KEEPALIVE_CONNECTIONS", 3),
+    ):
+        client = create_gemini_client("key")
+
+    options = client._api_client._http_options
+    assert options.client_args is not None and options.async_client_args is not None
+    assert options.client_args["limits"].max_connections == 7
+    assert options.client_args["limits"].max_keepalive_connections == 3
+    assert isinstance(options.async_client_args["transport"], httpx.AsyncHTTPTransport)
+
+    await close_gemini_client(client)
+    assert client._api_client._httpx_client.is_closed
+    assert client._api_client._async_httpx_client.is_closed
+
+
+async def test_generate_playlist_async_uses_shared_client():
+    """Test a provided client is reused instead of building one per call."""
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock(return_value=MagicMock(text='{"tracks": []}'))
+
+    with patch("backend.core.ai.genai.Client") as mock_client_cls:
+        await generate_playlist_async("mood", use_cache=False, client=mock_client)
+
+    mock_client_cls.assert_not_called()
+    mock_client.aio.models.generate_content.assert_awaited_once()
+
+
+async def test_embed_text_async_uses_given_client():
+    """Test embeddings come from the injected client and an empty result is an error."""
+    mock_client = MagicMock()
+    embedding = MagicMock(values=[0.1, 0.2])
+    mock_client.aio.models.embed_content = AsyncMock(return_value=MagicMock(embeddings=[embedding]))
+
+    assert await embed_text_async("mood", mock_client) == [0.1, 0.2]
+
+    mock_client.aio.models.embed_content = AsyncMock(return_value=MagicMock(embeddings=None))
+    with pytest.raises(ValueError):
+        await embed_text_async("mood", mock_client)
+
+
 def test_list_available_models():
     """Test listing available models."""
     mock_model = MagicMock()
@@ -138,14 +316,49 @@ def test_discover_fallback_model_dynamic():
         assert discover_fallback_model(mock_client) == "gemini-2.0-flash"
 
         # 2. Version sort (002 > 001)
+        reset_model_registry()
         mock_list.return_value = ["gemini-1.5-flash-001", "gemini-1.5-flash-002"]
         assert discover_fallback_model(mock_client) == "gemini-1.5-flash-002"
 
         # 3. Random flash model
+        reset_model_registry()
         mock_list.return_value = ["models/some-random-flash-v9"]
         assert discover_fallback_model(mock_client) == "some-random-flash-v9"
 
 
+def test_discover_fallback_model_uses_cached_listing():
+    """Test repeated fallbacks reuse the cached model list and skip failed models."""
+    mock_client = MagicMock()
+    with patch("backend.core.ai.list_available_models", return_value=["gemini-1.5-flash", "gemini-2.0-flash"]) as m:
+        assert discover_fallback_model(mock_client) == "gemini-2.0-flash"
+        get_model_registry().mark_failed("gemini-2.0-flash")
+        assert discover_fallback_model(mock_client) == "gemini-1.5-flash"
+
+    m.assert_called_once_with(mock_client)
+
+
+def test_generate_playlist_skips_recently_failed_model():
+    """Test a model that 404'd recently is replaced up front instead of being retried."""
+    mock_response = MagicMock()
+    mock_response.text = '{"tracks": []}'
+
+    with (
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("google.genai.Client") as mock_client_cls,
+        patch("backend.core.ai.list_available_models", return_value=["models/gemini-2.0-flash"]) as mock_list,
+        patch.object(settings, "GEMINI_MODEL", "missing-model"),
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.models.generate_content.side_effect = [Exception("404 Not Found"), mock_response, mock_response]
+
+        generate_playlist("first", use_cache=False)
+        generate_playlist("second", use_cache=False)
+
+    models = [c.kwargs["model"] for c in mock_client.models.generate_content.call_args_list]
+    assert models == ["missing-model", "gemini-2.0-flash", "gemini-2.0-flash"]
+    mock_list.assert_called_once()
+
+
 def test_discover_fallback_model_fallback():
     """Test fallback when no flash models match."""
     mock_client = MagicMock()
@@ -259,7 +472,9 @@ async def test_verify_ai_tracks_success(async_mock_client, mock_spotify_provider
 
         assert verified == tracks
         assert rejected == []
-        mock_verifier_cls.assert_called_once_with(http_client=async_mock_client, spotify_provider=mock_spotify_provider)
+        mock_verifier_cls.assert_called_once_with(
+            http_client=async_mock_client, spotify_provider=mock_spotify_provider, catalog=None
+        )
         mock_verifier.verify_track_version.assert_called_once_with("A", "T", "studio")
 
 
@@ -280,7 +495,9 @@ async def test_verify_ai_tracks_rejected(async_mock_client, mock_spotify_provide
 
         assert verified == []
         assert rejected == ["A - T"]
-        mock_verifier_cls.assert_called_once_with(http_client=async_mock_client, spotify_provider=mock_spotify_provider)
+        mock_verifier_cls.assert_called_once_with(
+            http_client=async_mock_client, spotify_provider=mock_spotify_provider, catalog=None
+        )
 
 
 async def test_verify_ai_tracks_exception(async_mock_client, mock_spotify_provider):
@@ -302,3 +519,34 @@ async def test_verify_ai_tracks_exception(async_mock_client, mock_spotify_provid
 
         assert verified == tracks
         assert rejected == []
+
+
+async def test_verify_ai_tracks_runs_concurrently_in_order(async_mock_client, mock_spotify_provider):
+    """Test tracks are verified concurrently while results keep the input order."""
+    import asyncio
+    from backend.core.ai import verify_ai_tracks
+
+    tracks = [{"artist": "A", "track": f"T{i}"} for i in range(6)] + [{"artist": "", "track": "Skipped"}]
+    in_flight = 0
+    peak = 0
+
+    async def fake_verify(artist, track, version):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Earlier tracks finish last to shake out ordering bugs
+        await asyncio.sleep((6 - int(track[1:])) * 0.001)
+        in_flight -= 1
+        return track != "T2"
+
+    with patch("backend.core.ai.MetadataVerifier") as mock_verifier_cls:
+        mock_verifier_cls.return_value.verify_track_version = fake_verify
+        verified, rejected = await verify_ai_tracks(
+            tracks,
+            http_client=async_mock_client,
+            spotify_provider=mock_spotify_provider,
+        )
+
+    assert [t["track"] for t in verified] == ["T0", "T1", "T3", "T4", "T5"]
+    assert rejected == ["A - T2"]
+    assert peak > 1
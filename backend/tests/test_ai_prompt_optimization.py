@@ -1,6 +1,6 @@
 import pytest
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from backend.core.ai import generate_playlist
 from backend.app.services.ai_service import AIService
 
@@ -73,3 +73,14 @@ def test_ai_service_full_prompt_construction():
     mock_gen.assert_called_once()
     args, kwargs = mock_gen.call_args
     assert "my prompt. Inspired by artists: Pink Floyd" in args[0]
+
+
+async def test_ai_service_generate_async_prompt_construction():
+    """Test that the async generation path builds the same prompt."""
+    service = AIService()
+    with patch("backend.app.services.ai_service.generate_playlist_async", new=AsyncMock()) as mock_gen:
+        mock_gen.return_value = {"title": "T", "tracks": []}
+        result = await service.generate_async("my prompt", count=5, artists="Pink Floyd")
+
+    assert result == {"title": "T", "tracks": []}
+    mock_gen.assert_awaited_once_with("my prompt. Inspired by artists: Pink Floyd", 5, use_cache=True, client=None)
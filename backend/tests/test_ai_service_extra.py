@@ -56,3 +56,44 @@ async def test_get_nearest_interactions_no_db():
     service = AIService(db=None)
     with pytest.raises(ValueError, match="Database session required"):
         await service.get_nearest_interactions([])
+
+
+def test_stream_verify_tracks_requires_clients():
+    service = AIService()
+    with pytest.raises(ValueError, match="HTTP client and Spotify provider required"):
+        service.stream_verify_tracks([])
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_verifies_tracks_as_they_arrive():
+    from unittest.mock import patch
+
+    async def fake_generation(prompt, count, use_cache, client=None):
+        yield {"type": "track", "track": {"artist": "A", "track": "One"}}
+        yield {"type": "track", "track": {"artist": "B", "track": "Two"}}
+        yield {"type": "playlist", "playlist": {"title": "T", "description": "D", "tracks": []}}
+
+    service = AIService(http_client=MagicMock(), spotify_provider=MagicMock())
+    with (
+        patch("backend.app.services.ai_service.generate_playlist_stream", side_effect=fake_generation),
+        patch("backend.core.ai.MetadataVerifier") as mock_verifier_cls,
+    ):
+        mock_verifier_cls.return_value.verify_track_version = AsyncMock(side_effect=[True, False])
+        events = [event async for event in service.generate_stream("p", count=2, verify=True)]
+
+    assert events == [
+        {"status": "verified", "track": {"artist": "A", "track": "One"}},
+        {"status": "rejected", "track": {"artist": "B", "track": "Two"}},
+        {"status": "done", "title": "T", "description": "D"},
+    ]
+
+
+async def test_generate_async_passes_shared_gemini_client():
+    from unittest.mock import patch
+
+    gemini_client = MagicMock()
+    service = AIService(gemini_client=gemini_client)
+    with patch("backend.app.services.ai_service.generate_playlist_async", new_callable=AsyncMock) as mock_gen:
+        await service.generate_async("p", count=3)
+
+    mock_gen.assert_awaited_once_with("p", 3, use_cache=True, client=gemini_client)
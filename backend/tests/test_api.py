@@ -45,7 +45,7 @@ def test_generate_playlist_endpoint():
         ],
     }
     mock_service = MagicMock()
-    mock_service.generate.return_value = mock_response_data
+    mock_service.generate_async = AsyncMock(return_value=mock_response_data)
 
     app.dependency_overrides[get_ai_service] = lambda: mock_service
     app.dependency_overrides[current_active_user] = lambda: mock_user
@@ -89,10 +89,96 @@ def test_verify_tracks_endpoint():
     assert data["verified"] == expected_verified
 
 
+def test_verify_tracks_stream_endpoint():
+    """Test the streaming verification endpoint emits one NDJSON event per track, then a summary."""
+    import json
+
+    async def fake_stream():
+        yield {"artist": "V", "track": "T"}, True
+        yield {"artist": "R", "track": "S"}, False
+
+    mock_service = MagicMock()
+    mock_service.stream_verify_tracks.return_value = fake_stream()
+
+    app.dependency_overrides[get_ai_service] = lambda: mock_service
+    app.dependency_overrides[current_active_user] = lambda: mock_user
+
+    response = client.post(
+        "/api/v1/playlists/verify/stream",
+        json={"tracks": [{"artist": "V", "track": "T"}, {"artist": "R", "track": "S"}]},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["status"] for e in events] == ["verified", "rejected", "done"]
+    assert events[0]["track"]["artist"] == "V"
+    assert events[1]["track"]["track"] == "S"
+    assert (events[2]["verified_count"], events[2]["rejected_count"]) == (1, 1)
+
+    app.dependency_overrides.clear()
+
+
+def test_verify_tracks_stream_error():
+    """Test that failures mid-stream end the stream with an error event."""
+    import json
+
+    async def failing_stream():
+        yield {"artist": "V", "track": "T"}, True
+        raise RuntimeError("MB exploded")
+
+    mock_service = MagicMock()
+    mock_service.stream_verify_tracks.return_value = failing_stream()
+
+    app.dependency_overrides[get_ai_service] = lambda: mock_service
+    app.dependency_overrides[current_active_user] = lambda: mock_user
+
+    response = client.post("/api/v1/playlists/verify/stream", json={"tracks": [{"artist": "V", "track": "T"}]})
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1] == {
+        "status": "error",
+        "track": None,
+        "detail": "MB exploded",
+        "verified_count": None,
+        "rejected_count": None,
+    }
+
+    app.dependency_overrides.clear()
+
+
+def test_generate_playlist_stream_endpoint():
+    """Test the streaming generation endpoint emits tracks, skips malformed ones and ends with done."""
+    import json
+
+    async def fake_events():
+        yield {"status": "verified", "track": {"artist": "A", "track": "One"}}
+        yield {"status": "verified", "track": {"track": "Missing artist"}}
+        yield {"status": "rejected", "track": {"artist": "B", "track": "Two"}}
+        yield {"status": "done", "title": "Streamed", "description": "D"}
+
+    mock_service = MagicMock()
+    mock_service.generate_stream.return_value = fake_events()
+
+    app.dependency_overrides[get_ai_service] = lambda: mock_service
+    app.dependency_overrides[current_active_user] = lambda: mock_user
+
+    response = client.post("/api/v1/playlists/generate/stream?verify=true", json={"prompt": "p", "count": 2})
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["status"] for e in events] == ["verified", "rejected", "done"]
+    assert events[0]["track"]["artist"] == "A"
+    assert events[2]["title"] == "Streamed"
+    mock_service.generate_stream.assert_called_once_with(prompt="p", count=2, artists=None, verify=True, use_cache=True)
+
+    app.dependency_overrides.clear()
+
+
 def test_generate_playlist_error():
     """Test error handling in generation endpoint."""
     mock_service = MagicMock()
-    mock_service.generate.side_effect = Exception("AI Error")
+    mock_service.generate_async = AsyncMock(side_effect=Exception("AI Error"))
 
     app.dependency_overrides[get_ai_service] = lambda: mock_service
     app.dependency_overrides[current_active_user] = lambda: mock_user
@@ -264,23 +350,40 @@ def test_build_playlist_endpoint_success():
         }
     }
 
+    build_result = {
+        "status": "success",
+        "playlist_id": "new_pid",
+        "url": "https://open.spotify.com/playlist/new_pid",
+        "failed_tracks": [],
+        "actual_tracks": [{"artist": "A", "track": "T", "uri": "spotify:track:1", "duration_ms": 1000}],
+        "total_duration_ms": 1000,
+        "tracks": [{"artist": "A", "track": "T", "uri": "spotify:track:1", "duration_ms": 1000}],
+    }
+
     with (
-        patch("backend.app.api.v1.endpoints.playlists.SpotifyPlaylistBuilder") as mock_builder_cls,
+        patch(
+            "backend.app.api.v1.endpoints.playlists.build_playlist",
+            new_callable=AsyncMock,
+            return_value=build_result,
+        ) as mock_build,
         patch(
             "backend.app.api.v1.endpoints.playlists.IntegrationsService.get_valid_spotify_token",
             new_callable=AsyncMock,
         ) as mock_get_token,
     ):
         mock_get_token.return_value = "fake_token"
-        mock_builder = MagicMock()
-        mock_builder.create_playlist.return_value = "new_pid"
-        mock_builder.add_tracks_to_playlist.return_value = ([], [])
-        mock_builder_cls.return_value = mock_builder
 
         response = client.post("/api/v1/playlists/build", json=payload)
         assert response.status_code == 200
         assert response.json()["status"] == "success"
         assert response.json()["playlist_id"] == "new_pid"
+        assert response.json()["total_duration_ms"] == 1000
+
+        provider, name, description, tracks = mock_build.call_args[0]
+        assert provider.auth_token == "fake_token"
+        assert (name, description) == ("Test Build", "Desc")
+        assert tracks[0]["artist"] == "A" and tracks[0]["track"] == "T"
+        assert mock_build.call_args[1] == {"public": False}
 
     app.dependency_overrides.clear()
 
@@ -417,7 +520,8 @@ def test_build_playlist_endpoint_failure():
 
     with (
         patch(
-            "backend.app.api.v1.endpoints.playlists.SpotifyPlaylistBuilder",
+            "backend.app.api.v1.endpoints.playlists.build_playlist",
+            new_callable=AsyncMock,
             side_effect=Exception("Build Error"),
         ),
         patch(
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.core.utils.background_loop import BackgroundLoop, get_background_loop, reset_background_loop, run_sync
+
+
+@pytest.fixture
+def loop():
+    background = BackgroundLoop(name="test-background-loop")
+    yield background
+    background.stop()
+
+
+def test_run_reuses_one_loop(loop):
+    """Test every call runs on the same persistent loop and thread."""
+
+    async def current():
+        return asyncio.get_running_loop(), threading.current_thread()
+
+    first = loop.run(current())
+    second = loop.run(current())
+
+    assert first == second
+    assert first[1] is not threading.current_thread()
+
+
+def test_run_from_inside_running_loop(loop):
+    """Test synchronous callers work even when their own thread is running an event loop."""
+
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    async def caller():
+        # A nested asyncio.run() would raise here
+        return loop.run(add(1, 2))
+
+    assert asyncio.run(caller()) == 3
+
+
+def test_run_propagates_exceptions(loop):
+    """Test exceptions raised by the coroutine reach the caller."""
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        loop.run(fail())
+
+
+def test_run_rejects_calls_from_the_loop_thread(loop):
+    """Test a coroutine on the background loop cannot block on the loop itself."""
+
+    async def noop():
+        return None
+
+    async def reenter():
+        return loop.run(noop())
+
+    with pytest.raises(RuntimeError, match="background loop itself"):
+        loop.run(reenter())
+
+
+def test_run_from_worker_threads(loop):
+    """Test concurrent callers from several threads share the loop safely."""
+    results = []
+
+    async def square(n):
+        await asyncio.sleep(0.001)
+        return n * n
+
+    threads = [threading.Thread(target=lambda n=n: results.append(loop.run(square(n)))) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == [n * n for n in range(8)]
+
+
+def test_process_wide_loop_reset():
+    """Test run_sync uses the shared loop and reset stops it."""
+
+    async def value():
+        return 42
+
+    try:
+        shared = get_background_loop()
+        assert run_sync(value()) == 42
+        assert get_background_loop() is shared
+        reset_background_loop()
+        assert get_background_loop() is not shared
+    finally:
+        reset_background_loop()
@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.core.build_engine import build_playlist, resolve_tracks
+
+
+def make_provider(matches: dict):
+    provider = MagicMock()
+
+    # Mirrors SpotifyProvider.search_tracks: results in input order, failed searches resolve to None
+    async def search_tracks(queries, concurrency=None, on_searched=None):
+        results = []
+        for query in queries:
+            await asyncio.sleep(0)
+            result = matches.get((query["artist"], query["track"]))
+            results.append(None if isinstance(result, Exception) else result)
+            if on_searched:
+                await on_searched()
+        return results
+
+    provider.search_tracks = AsyncMock(side_effect=search_tracks)
+    provider.create_playlist = AsyncMock(return_value="pl_1")
+    provider.add_tracks_to_playlist = AsyncMock()
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_resolve_tracks_keeps_order_and_reports_progress():
+    """Test matches come back in input order with one progress call per completed search."""
+    matches = {("A", "1"): {"uri": "u1"}, ("C", "3"): {"uri": "u3"}}
+    provider = make_provider(matches)
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    tracks = [{"artist": "A", "track": "1"}, {"artist": "B", "track": "2"}, {"artist": "C", "track": "3"}]
+    result = await resolve_tracks(provider, tracks, concurrency=2, on_progress=on_progress)
+
+    assert result == [{"uri": "u1"}, None, {"uri": "u3"}]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.asyncio
+async def test_resolve_tracks_passes_concurrency_to_search():
+    """Test the concurrency bound is handed to the provider's batched search."""
+    provider = make_provider({})
+
+    await resolve_tracks(provider, [{"artist": "A", "track": "1"}], concurrency=3)
+
+    assert provider.search_tracks.await_args.kwargs["concurrency"] == 3
+
+
+@pytest.mark.asyncio
+async def test_build_playlist_summarizes_and_attaches_uris():
+    """Test the build creates the playlist, adds found tracks and attaches URIs to the requested tracks."""
+    matches = {
+        ("A", "1"): {"artist": "A", "track": "1", "album": "X", "uri": "u1", "duration_ms": 1000},
+        ("C", "3"): {"artist": "C", "track": "3 - Live", "album": "Y", "uri": "u3", "duration_ms": 2000},
+        ("D", "4"): Exception("boom"),
+    }
+    provider = make_provider(matches)
+    tracks = [
+        {"artist": "A", "track": "1"},
+        {"artist": "B", "track": "2"},
+        {"artist": "C", "track": "3", "version": "live"},
+        {"artist": "D", "track": "4"},
+    ]
+
+    result = await build_playlist(provider, "Name", "Desc", tracks, public=True)
+
+    provider.create_playlist.assert_awaited_once_with("Name", "Desc", public=True)
+    provider.add_tracks_to_playlist.assert_awaited_once_with("pl_1", ["u1", "u3"])
+    assert result["playlist_id"] == "pl_1"
+    assert result["url"] == "https://open.spotify.com/playlist/pl_1"
+    assert result["failed_tracks"] == ["B - 2", "D - 4"]
+    assert [t["uri"] for t in result["actual_tracks"]] == ["u1", "u3"]
+    assert result["total_duration_ms"] == 3000
+    assert result["tracks"][1] == {"artist": "B", "track": "2"}
+    assert result["tracks"][2] == {
+        "artist": "C",
+        "track": "3",
+        "version": "live",
+        "uri": "u3",
+        "duration_ms": 2000,
+        "provider": "spotify",
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_tracks_fetches_known_uris_in_bulk():
+    """Test tracks with a Spotify URI are looked up in bulk and only the rest are searched."""
+    provider = make_provider({("B", "2"): {"uri": "u2"}, ("C", "3"): {"uri": "u3"}})
+    provider.get_tracks = AsyncMock(return_value={"spotify:track:1": {"uri": "spotify:track:1", "duration_ms": 5}})
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append(done)
+
+    tracks = [
+        {"artist": "A", "track": "1", "uri": "spotify:track:1"},
+        {"artist": "B", "track": "2"},
+        {"artist": "C", "track": "3", "uri": "spotify:track:unavailable"},
+    ]
+    result = await resolve_tracks(provider, tracks, on_progress=on_progress)
+
+    provider.get_tracks.assert_awaited_once_with(["spotify:track:1", "spotify:track:unavailable"])
+    assert result == [{"uri": "spotify:track:1", "duration_ms": 5}, {"uri": "u2"}, {"uri": "u3"}]
+    assert provider.search_tracks.await_args.args[0] == tracks[1:]
+    assert progress == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_resolve_tracks_falls_back_to_search_when_bulk_lookup_fails():
+    """Test a failed bulk lookup does not fail the build."""
+    provider = make_provider({("A", "1"): {"uri": "u1"}})
+    provider.get_tracks = AsyncMock(side_effect=Exception("503"))
+
+    result = await resolve_tracks(provider, [{"artist": "A", "track": "1", "uri": "spotify:track:1"}])
+
+    assert result == [{"uri": "u1"}]
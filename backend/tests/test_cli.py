@@ -21,6 +21,19 @@ def test_cli_build_success():
             mock_builder.build_playlist_from_json.assert_called_once()
 
 
+def test_cli_build_workers():
+    """Test the build command passes the worker count to the builder."""
+    with patch("backend.core.cli.get_builder") as mock_get_builder:
+        mock_builder = MagicMock()
+        mock_get_builder.return_value = mock_builder
+        with runner.isolated_filesystem():
+            with open("playlist.json", "w") as f:
+                f.write("{}")
+            result = runner.invoke(app, ["build", "playlist.json", "--workers", "8"])
+            assert result.exit_code == 0
+            mock_builder.build_playlist_from_json.assert_called_once_with("playlist.json", dry_run=False, max_workers=8)
+
+
 def test_cli_build_error():
     """Test the build command handling errors."""
     with patch("backend.core.cli.get_builder") as mock_get_builder:
@@ -62,7 +75,17 @@ def test_cli_backup_success():
         mock_get_builder.return_value = mock_builder
         result = runner.invoke(app, ["backup", "backups_dir"])
         assert result.exit_code == 0
-        mock_builder.backup_all_playlists.assert_called_with("backups_dir")
+        mock_builder.backup_all_playlists.assert_called_with("backups_dir", max_workers=4, force=False)
+
+
+def test_cli_backup_workers_and_force():
+    """Test the backup command forwards concurrency and force options."""
+    with patch("backend.core.cli.get_builder") as mock_get_builder:
+        mock_builder = MagicMock()
+        mock_get_builder.return_value = mock_builder
+        result = runner.invoke(app, ["backup", "backups_dir", "--workers", "8", "--force"])
+        assert result.exit_code == 0
+        mock_builder.backup_all_playlists.assert_called_with("backups_dir", max_workers=8, force=True)
 
 
 def test_cli_backup_error():
@@ -177,6 +200,20 @@ def test_cli_generate_success():
         assert "Artist - Track" in result.stdout
 
 
+def test_cli_generate_no_cache():
+    """Test generate --no-cache bypasses the generation cache."""
+    mock_tracks = [{"artist": "A", "track": "B"}]
+    mock_response = {"title": "Test Playlist", "description": "Desc", "tracks": mock_tracks}
+    with (
+        patch("backend.core.ai.generate_playlist", return_value=mock_response) as mock_generate,
+        patch("backend.core.ai.verify_ai_tracks", return_value=(mock_tracks, [])),
+        runner.isolated_filesystem(),
+    ):
+        result = runner.invoke(app, ["generate", "-p", "test", "-o", "out.json", "--no-cache"])
+        assert result.exit_code == 0
+        mock_generate.assert_called_once_with("test", 20, use_cache=False)
+
+
 def test_cli_generate_with_output():
     """Test generate command with --output flag."""
     mock_tracks = [{"artist": "A", "track": "B"}]
@@ -323,3 +360,11 @@ def test_cli_ai_models_error():
         result = runner.invoke(app, ["ai-models"])
         assert result.exit_code == 0
         assert "Error fetching models" in result.output
+
+
+def test_cli_forget_track():
+    """Test forget-track invalidates the track's cached search results."""
+    with patch("backend.core.search_cache.get_search_cache") as mock_get_cache:
+        result = runner.invoke(app, ["forget-track", "Artist", "Song", "--album", "Album"])
+        assert result.exit_code == 0
+        mock_get_cache.return_value.invalidate.assert_called_once_with("Artist", "Song", album="Album", version=None)
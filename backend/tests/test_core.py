@@ -1,5 +1,6 @@
 import pytest
 import os
+import json
 from unittest.mock import MagicMock, patch
 from backend.core.auth import (
     get_credentials_from_env,
@@ -263,6 +264,36 @@ def test_get_playlist_tracks_pagination(builder, mock_spotify):
     assert tracks[-1] == "spotify:track:109"
 
 
+def test_get_playlist_tracks_parallel_pages(builder, mock_spotify):
+    """Test the remaining pages are requested by offset once the first page reports the total."""
+
+    def playlist_tracks(playlist_id, fields, limit, offset):
+        assert fields == "total,limit,offset,next,items(track(uri))"
+        items = [{"track": {"uri": f"spotify:track:{i}"}} for i in range(offset, min(offset + limit, 250))]
+        return {"items": items, "next": "http://next", "total": 250, "limit": limit, "offset": offset}
+
+    mock_spotify.playlist_tracks.side_effect = playlist_tracks
+
+    tracks = builder.get_playlist_tracks("pid")
+
+    assert tracks == [f"spotify:track:{i}" for i in range(250)]
+    assert sorted(c.kwargs["offset"] for c in mock_spotify.playlist_tracks.call_args_list) == [0, 100, 200]
+
+
+def test_read_paths_request_field_projections(builder, mock_spotify):
+    """Test details and export reads only ask Spotify for the fields they use."""
+    from backend.core.providers.spotify_fields import PLAYLIST_DETAILS_FIELDS, tracks_page_fields
+
+    mock_spotify.playlist.return_value = {"description": "D", "public": False}
+    mock_spotify.playlist_tracks.return_value = {"items": [], "next": None}
+
+    builder.update_playlist_details("pid", "D", public=False)
+    mock_spotify.playlist.assert_called_with("pid", fields=PLAYLIST_DETAILS_FIELDS)
+
+    builder.get_playlist_tracks_details("pid")
+    mock_spotify.playlist_tracks.assert_called_with("pid", fields=tracks_page_fields("export"), limit=100, offset=0)
+
+
 def test_get_playlist_tracks_break(builder, mock_spotify):
     """Test break condition in get_playlist_tracks."""
     # Single page
@@ -391,6 +422,55 @@ def test_add_tracks_to_playlist_failures(builder, mock_spotify):
     mock_spotify.playlist_add_items.assert_called_with("pid", ["uri:1"])
 
 
+def test_add_tracks_to_playlist_hydrates_known_uris(builder, mock_spotify):
+    """Test tracks with a Spotify URI are fetched 50 per request and only the rest are searched."""
+
+    def tracks(ids):
+        return {
+            "tracks": [
+                (
+                    None
+                    if track_id == "gone"
+                    else {
+                        "name": f"T{track_id}",
+                        "artists": [{"name": "A"}],
+                        "album": {"name": "Album"},
+                        "uri": f"spotify:track:{track_id}",
+                        "duration_ms": 100,
+                    }
+                )
+                for track_id in ids
+            ]
+        }
+
+    mock_spotify.tracks.side_effect = tracks
+    mock_spotify.search.return_value = {
+        "tracks": {
+            "items": [
+                {
+                    "name": "Searched",
+                    "artists": [{"name": "S"}],
+                    "album": {"name": "Album"},
+                    "uri": "spotify:track:searched",
+                    "duration_ms": 200,
+                }
+            ]
+        }
+    }
+    playlist = [{"artist": "A", "track": f"T{i}", "uri": f"spotify:track:{i}"} for i in range(110)]
+    playlist += [{"artist": "X", "track": "Gone", "uri": "spotify:track:gone"}, {"artist": "Y", "track": "No URI"}]
+
+    actual, failed = builder.add_tracks_to_playlist("pid", playlist)
+
+    assert [len(call.args[0]) for call in mock_spotify.tracks.call_args_list] == [50, 50, 11]
+    # Only the unavailable URI and the track without a URI are searched
+    assert mock_spotify.search.call_count == 2
+    assert failed == []
+    assert [t["uri"] for t in actual[:3]] == ["spotify:track:0", "spotify:track:1", "spotify:track:2"]
+    assert actual[-1]["uri"] == "spotify:track:searched"
+    assert mock_spotify.playlist_add_items.call_count == 2
+
+
 def test_add_tracks_all_missing(builder, mock_spotify):
     """Test adding tracks where none are found."""
     mock_spotify.search.return_value = {"tracks": {"items": []}}
@@ -494,14 +574,31 @@ def test_backup_all_playlists(builder, mock_spotify):
             "Playlist 1",
             os.path.join("backups_dir", "playlist_1.json"),
             playlist_id="p1",
+            playlist_info={"name": "Playlist 1", "id": "p1"},
         )
         mock_export.assert_any_call(
             "Playlist/2",
             os.path.join("backups_dir", "playlist_2.json"),
             playlist_id="p2",
+            playlist_info={"name": "Playlist/2", "id": "p2"},
         )
 
 
+def test_backup_all_playlists_lists_pages_in_parallel(builder, mock_spotify, tmp_path):
+    """Test the playlist listing requests every remaining offset once the total is known."""
+
+    def current_user_playlists(limit, offset):
+        items = [{"name": f"P{i}", "id": f"p{i}"} for i in range(offset, min(offset + limit, 120))]
+        return {"items": items, "next": "http://next", "total": 120, "limit": limit, "offset": offset}
+
+    mock_spotify.current_user_playlists.side_effect = current_user_playlists
+    with patch.object(builder, "export_playlist_to_json") as mock_export:
+        builder.backup_all_playlists(str(tmp_path))
+
+    assert sorted(c.kwargs["offset"] for c in mock_spotify.current_user_playlists.call_args_list) == [0, 50, 100]
+    assert [c.kwargs["playlist_id"] for c in mock_export.call_args_list] == [f"p{i}" for i in range(120)]
+
+
 def test_backup_all_playlists_exception(builder, mock_spotify):
     """Test that one failed backup doesn't stop the whole process."""
     mock_spotify.current_user_playlists.return_value = {
@@ -517,6 +614,80 @@ def test_backup_all_playlists_exception(builder, mock_spotify):
         # Should not raise exception
 
 
+def test_backup_all_playlists_skips_unchanged_snapshots(builder, mock_spotify, tmp_path):
+    """Test the manifest skips playlists whose snapshot_id has not changed since the last backup."""
+    listing = {
+        "items": [
+            {"name": "Same", "id": "p1", "snapshot_id": "s1", "description": "", "public": False},
+            {"name": "Changed", "id": "p2", "snapshot_id": "s2-new", "description": "", "public": False},
+        ],
+        "next": None,
+    }
+    mock_spotify.current_user_playlists.return_value = listing
+    (tmp_path / "same.json").write_text("{}")
+    (tmp_path / ".backup_manifest.json").write_text(
+        json.dumps({"playlists": {"p1": {"snapshot_id": "s1"}, "p2": {"snapshot_id": "s2-old"}}})
+    )
+
+    with patch.object(builder, "get_playlist_tracks_details", return_value=[]) as mock_details:
+        builder.backup_all_playlists(str(tmp_path), max_workers=2)
+
+    mock_details.assert_called_once_with("p2")
+    mock_spotify.playlist.assert_not_called()
+    manifest = json.loads((tmp_path / ".backup_manifest.json").read_text())["playlists"]
+    assert manifest["p2"] == {"snapshot_id": "s2-new", "file": "changed.json"}
+    assert json.loads((tmp_path / "changed.json").read_text())["name"] == "Changed"
+
+    # force re-exports everything
+    with patch.object(builder, "get_playlist_tracks_details", return_value=[]) as mock_details:
+        builder.backup_all_playlists(str(tmp_path), force=True)
+    assert mock_details.call_count == 2
+
+
+def test_backup_all_playlists_resumes_after_failure(builder, mock_spotify, tmp_path):
+    """Test that a failed playlist is retried on the next run while finished ones are skipped."""
+    mock_spotify.current_user_playlists.return_value = {
+        "items": [
+            {"name": "Done", "id": "p1", "snapshot_id": "s1"},
+            {"name": "Failed", "id": "p2", "snapshot_id": "s2"},
+        ],
+        "next": None,
+    }
+    with patch.object(builder, "get_playlist_tracks_details", side_effect=[[], Exception("Boom")]):
+        builder.backup_all_playlists(str(tmp_path))
+
+    with patch.object(builder, "get_playlist_tracks_details", return_value=[]) as mock_details:
+        builder.backup_all_playlists(str(tmp_path))
+    mock_details.assert_called_once_with("p2")
+
+
+def test_backup_all_playlists_same_name_gets_separate_files(builder, mock_spotify, tmp_path):
+    """Test playlists whose names collide get their own files and manifest entries."""
+    mock_spotify.current_user_playlists.return_value = {
+        "items": [
+            {"name": "Road Trip", "id": "p1", "snapshot_id": "s1"},
+            {"name": "road trip", "id": "p2", "snapshot_id": "s2"},
+        ],
+        "next": None,
+    }
+    with patch.object(builder, "get_playlist_tracks_details", return_value=[]):
+        builder.backup_all_playlists(str(tmp_path), max_workers=2)
+
+    manifest = json.loads((tmp_path / ".backup_manifest.json").read_text())["playlists"]
+    assert manifest["p1"]["file"] == "road_trip.json"
+    assert manifest["p2"]["file"] == "road_trip_p2.json"
+    assert json.loads((tmp_path / "road_trip_p2.json").read_text())["name"] == "road trip"
+
+    # Files stay with their playlist even if the listing order changes
+    mock_spotify.current_user_playlists.return_value["items"].reverse()
+    mock_spotify.current_user_playlists.return_value["items"][0]["snapshot_id"] = "s2-new"
+    with patch.object(builder, "get_playlist_tracks_details", return_value=[]) as mock_details:
+        builder.backup_all_playlists(str(tmp_path))
+    mock_details.assert_called_once_with("p2")
+    manifest = json.loads((tmp_path / ".backup_manifest.json").read_text())["playlists"]
+    assert manifest["p2"] == {"snapshot_id": "s2-new", "file": "road_trip_p2.json"}
+
+
 def test_build_playlist_from_json_dry_run(builder, mock_spotify):
     """Test dry run mode does not create/update playlists."""
     playlist_data = {"name": "New Playlist", "tracks": [{"artist": "A", "track": "B"}]}
@@ -575,15 +746,94 @@ def test_build_playlist_from_json_update_existing(builder, mock_spotify):
         with (
             patch.object(builder, "find_playlist_by_name", return_value="existing_pid"),
             patch.object(builder, "search_track", return_value="uri:new"),
-            patch.object(builder, "get_playlist_tracks", return_value=["uri:old"]),
             patch.object(builder, "update_playlist_details") as mock_update,
+            patch.object(builder, "sync_playlist_tracks") as mock_sync,
             patch.object(builder, "clear_playlist") as mock_clear,
-            patch.object(builder, "_add_track_uris_to_playlist") as mock_add,
         ):
             builder.build_playlist_from_json("file.json")
             mock_update.assert_called()
-            mock_clear.assert_called_with("existing_pid")
-            mock_add.assert_called_with("existing_pid", ["uri:new"])
+            mock_sync.assert_called_with("existing_pid", ["uri:new"])
+            mock_clear.assert_not_called()
+
+
+def test_sync_playlist_tracks_applies_small_diff(builder, mock_spotify):
+    """Test a one-track change is applied as targeted writes chained on snapshot_id."""
+    remote = [f"uri:{i}" for i in range(300)]
+    desired = list(remote)
+    desired[150] = "uri:new"
+    mock_spotify.playlist.return_value = {"snapshot_id": "snap1"}
+    mock_spotify.playlist_remove_all_occurrences_of_items.return_value = {"snapshot_id": "snap2"}
+    mock_spotify.playlist_add_items.return_value = {"snapshot_id": "snap3"}
+
+    with patch.object(builder, "_playlist_track_items", return_value=[{"track": {"uri": uri}} for uri in remote]):
+        builder.sync_playlist_tracks("pid", desired)
+
+    mock_spotify.playlist_remove_all_occurrences_of_items.assert_called_once_with(
+        "pid", ["uri:150"], snapshot_id="snap1"
+    )
+    mock_spotify.playlist_add_items.assert_called_once_with("pid", ["uri:new"], position=150)
+    mock_spotify.playlist_replace_items.assert_not_called()
+
+
+def test_sync_playlist_tracks_noop_and_full_replace(builder, mock_spotify):
+    """Test identical playlists cost no writes and heavy rewrites fall back to a replace."""
+    mock_spotify.playlist.return_value = {"snapshot_id": "snap1"}
+    with patch.object(
+        builder, "_playlist_track_items", return_value=[{"track": {"uri": u}} for u in ("uri:1", "uri:2")]
+    ):
+        builder.sync_playlist_tracks("pid", ["uri:1", "uri:2"])
+    mock_spotify.playlist_add_items.assert_not_called()
+
+    remote = [{"track": {"uri": u}} for u in ("uri:1", "uri:2", "uri:3")]
+    with patch.object(builder, "_playlist_track_items", return_value=remote):
+        builder.sync_playlist_tracks("pid", ["uri:3", "uri:2", "uri:1"])
+    mock_spotify.playlist_replace_items.assert_called_once_with("pid", ["uri:3", "uri:2", "uri:1"])
+    mock_spotify.playlist_reorder_items.assert_not_called()
+
+
+def test_sync_playlist_tracks_replaces_playlists_with_unavailable_tracks(builder, mock_spotify):
+    """Test a track-less item forces a full replace instead of misaligned positional writes."""
+    mock_spotify.playlist.return_value = {"snapshot_id": "snap1"}
+    remote = [{"track": {"uri": "uri:1"}}, {"track": None}, {"track": {"uri": "uri:2"}}]
+    with patch.object(builder, "_playlist_track_items", return_value=remote):
+        builder.sync_playlist_tracks("pid", ["uri:1", "uri:2", "uri:3"])
+
+    mock_spotify.playlist_replace_items.assert_called_once_with("pid", ["uri:1", "uri:2", "uri:3"])
+    mock_spotify.playlist_add_items.assert_not_called()
+
+
+def test_resolve_tracks_concurrent_preserves_order(builder):
+    """Test that concurrent resolution returns URIs in input order."""
+    import time
+
+    tracks = [{"artist": "A", "track": f"T{i}"} for i in range(10)]
+
+    def fake_search(artist, track, album=None, version=None):
+        # Earlier tracks finish last to shake out ordering bugs
+        time.sleep((10 - int(track[1:])) * 0.001)
+        return None if track == "T3" else f"uri:{track}"
+
+    with patch.object(builder, "search_track", side_effect=fake_search) as mock_search:
+        uris = builder.resolve_tracks(tracks, max_workers=4)
+
+    assert mock_search.call_count == 10
+    assert uris == [None if i == 3 else f"uri:T{i}" for i in range(10)]
+
+
+def test_build_playlist_from_json_concurrent(builder, mock_spotify):
+    """Test build_playlist_from_json threads max_workers through to track resolution."""
+    playlist_data = {"name": "New Playlist", "tracks": [{"artist": "A", "track": "B"}, {"artist": "C", "track": "D"}]}
+    with (
+        patch("json.load", return_value=playlist_data),
+        patch("builtins.open", MagicMock()),
+        patch.object(builder, "find_playlist_by_name", return_value=None),
+        patch.object(builder, "resolve_tracks", return_value=["uri:1", "uri:2"]) as mock_resolve,
+        patch.object(builder, "create_playlist", return_value="new_pid"),
+        patch.object(builder, "_add_track_uris_to_playlist") as mock_add,
+    ):
+        builder.build_playlist_from_json("file.json", max_workers=8)
+        mock_resolve.assert_called_once_with(playlist_data["tracks"], max_workers=8)
+        mock_add.assert_called_with("new_pid", ["uri:1", "uri:2"])
 
 
 def test_search_track_version_preference_live(builder, mock_spotify):
@@ -814,6 +1064,40 @@ def test_search_track_with_external_verification(builder, mock_spotify):
     assert builder.metadata_verifier.verify_track_version.call_count >= 1
 
 
+def test_search_track_verification_is_batched_and_loop_safe(builder, mock_spotify):
+    """Test version verification runs as one batched call and works inside a running event loop."""
+    import asyncio
+
+    mock_spotify.search.return_value = {
+        "tracks": {
+            "items": [
+                {
+                    "name": f"Song (Live {i})",
+                    "artists": [{"name": "Artist"}],
+                    "album": {"name": "Live Album"},
+                    "uri": f"spotify:track:{i}",
+                }
+                for i in range(5)
+            ]
+        }
+    }
+    calls = []
+
+    async def verify_track_versions(tracks, version):
+        calls.append((tracks, version))
+        return [track == "Song (Live 3)" for _, track in tracks]
+
+    builder.metadata_verifier.verify_track_versions = verify_track_versions
+
+    async def search_in_loop():
+        # The old per-candidate asyncio.run() raised inside a running loop
+        return builder.search_track("Artist", "Song", version="live")
+
+    assert asyncio.run(search_in_loop()) == "spotify:track:3"
+    assert len(calls) == 1
+    assert len(calls[0][0]) == 5 and calls[0][1] == "live"
+
+
 def test_to_snake_case():
     """Test the snake_case conversion utility."""
     from backend.core.utils.helpers import to_snake_case
@@ -841,11 +1125,17 @@ def test_backup_all_playlists_includes_followed(builder, mock_spotify):
         # Both should be backed up
         assert mock_export.call_count == 2
         # Verify the IDs are passed correctly
-        mock_export.assert_any_call("Owned", os.path.join("backups", "owned.json"), playlist_id="owned_id")
+        mock_export.assert_any_call(
+            "Owned",
+            os.path.join("backups", "owned.json"),
+            playlist_id="owned_id",
+            playlist_info={"name": "Owned", "id": "owned_id", "owner": {"id": "test_user_id"}},
+        )
         mock_export.assert_any_call(
             "Followed",
             os.path.join("backups", "followed.json"),
             playlist_id="followed_id",
+            playlist_info={"name": "Followed", "id": "followed_id", "owner": {"id": "other_user_id"}},
         )
 
 
@@ -887,12 +1177,10 @@ def test_build_playlist_preserves_unplayable_tracks(builder, mock_spotify):
                         },
                     ]
 
-                    # Mock clearing/adding/updating
+                    # Mock syncing/updating
                     with (
-                        patch.object(builder, "clear_playlist"),
-                        patch.object(builder, "_add_track_uris_to_playlist") as mock_add,
+                        patch.object(builder, "sync_playlist_tracks") as mock_sync,
                         patch.object(builder, "update_playlist_details"),
-                        patch.object(builder, "get_playlist_tracks", return_value=["uri:old"]),  # Force update trigger
                     ):
                         builder.build_playlist_from_json("file.json")
 
@@ -900,8 +1188,8 @@ def test_build_playlist_preserves_unplayable_tracks(builder, mock_spotify):
                         # 1. We searched for both
                         assert mock_search.call_count == 2
 
-                        # 2. We called add_items with BOTH URIs (found + rescued)
-                        mock_add.assert_called_with("pid", ["uri:found", "uri:unplayable"])
+                        # 2. We synced BOTH URIs (found + rescued)
+                        mock_sync.assert_called_with("pid", ["uri:found", "uri:unplayable"])
 
 
 def test_build_playlist_uses_provided_uri_fallback(builder, mock_spotify):
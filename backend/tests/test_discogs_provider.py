@@ -117,7 +117,7 @@ async def test_get_metadata_success(mock_httpx_client):
     assert metadata["title"] == "The Album"
     assert metadata["artist"] == "The Band"
     assert metadata["year"] == 1970
-    mock_httpx_client.get.assert_called_once_with("/masters/12345", params=None)
+    mock_httpx_client.get.assert_called_once_with("/masters/12345", params=None, headers=client.headers)
 
 
 async def test_get_metadata_invalid_uri(mock_httpx_client):
@@ -192,3 +192,55 @@ def test_retry_predicate_ignores_401():
     exc_500 = httpx.HTTPStatusError("500 Error", request=MagicMock(), response=MagicMock(status_code=500))
     assert retry_if_not_auth_error(exc_500)
     assert retry_if_not_auth_error(ValueError("Some other error"))
+
+
+def discogs_response(status_code=200, payload=None, remaining="59", limit="60"):
+    """Build a real httpx response carrying the Discogs rate limit headers."""
+    headers = {"X-Discogs-Ratelimit": limit, "X-Discogs-Ratelimit-Remaining": remaining}
+    return httpx.Response(
+        status_code, json=payload or {}, headers=headers, request=httpx.Request("GET", "https://api.discogs.com")
+    )
+
+
+async def test_rate_limit_headers_drive_shared_limiter():
+    """Test the remaining budget reported by Discogs throttles every client for that token."""
+    http_client = AsyncMock(spec=httpx.AsyncClient)
+    http_client.get = AsyncMock(return_value=discogs_response(payload={"results": []}, remaining="0", limit="25"))
+
+    client = DiscogsClient(http_client=http_client)
+    with patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        await client.search_track(artist="A", track="B")
+        mock_sleep.assert_not_called()
+
+        # The budget is exhausted, so the next request waits for the 25/min refill
+        await DiscogsClient(http_client=http_client).search_track(artist="A", track="B")
+
+    assert client.rate_limiter.rate == pytest.approx(25 / 60)
+    assert mock_sleep.call_args.args[0] == pytest.approx(60 / 25, rel=0.05)
+
+
+async def test_rate_limited_request_is_retried():
+    """Test a 429 drains the limiter and the request is retried instead of failing."""
+    http_client = AsyncMock(spec=httpx.AsyncClient)
+    http_client.get = AsyncMock(
+        side_effect=[discogs_response(429, remaining="0"), discogs_response(payload={"id": 1, "title": "T"})]
+    )
+
+    client = DiscogsClient(http_client=http_client)
+    with patch("asyncio.sleep", new=AsyncMock()):
+        metadata = await client.get_metadata("discogs:master:1")
+
+    assert metadata is not None
+    assert metadata["title"] == "T"
+    assert http_client.get.call_count == 2
+
+
+def test_get_discogs_client_shared_per_token():
+    """Test one client (and one limiter) is shared per Discogs token."""
+    from backend.core.providers.discogs import get_discogs_client
+
+    assert get_discogs_client() is get_discogs_client("mock-pat")
+    other = get_discogs_client("other-token")
+    assert other is not get_discogs_client()
+    assert other.rate_limiter is not get_discogs_client().rate_limiter
+    assert other.headers["Authorization"] == "Discogs token=other-token"
@@ -0,0 +1,124 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.app.core.config import settings
+from backend.app.services.ai_service import AIService
+from backend.core.ai import generate_playlist, generate_playlist_async, generate_playlist_stream
+from backend.core.generation_cache import GenerationCache, get_generation_cache
+
+PLAYLIST = {"title": "Cached", "description": "D", "tracks": [{"artist": "A", "track": "B"}]}
+
+
+def gemini_response():
+    return MagicMock(text=json.dumps(PLAYLIST))
+
+
+def test_playlist_key_normalizes_prompt():
+    """Test that case and whitespace differences share a key while count and model do not."""
+    key = GenerationCache.playlist_key("Chill  Jazz", 20, "gemini")
+    assert key == GenerationCache.playlist_key(" chill jazz", 20, "gemini")
+    assert key != GenerationCache.playlist_key("chill jazz", 10, "gemini")
+    assert key != GenerationCache.playlist_key("chill jazz", 20, "other-model")
+    assert key.startswith("vibomat:generation:")
+
+
+def test_generate_playlist_uses_cache():
+    """Test that repeated prompts skip the Gemini round-trip unless the cache is bypassed."""
+    with (
+        patch("backend.core.ai.genai.Client"),
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+        patch("backend.core.ai.generate_content_with_retry", return_value=gemini_response()) as mock_generate,
+    ):
+        first = generate_playlist("Rainy Day", 5)
+        first["tracks"].append({"artist": "Mutated", "track": "Copy"})
+        second = generate_playlist("rainy   day", 5)
+        assert mock_generate.call_count == 1
+        assert second == PLAYLIST
+
+        generate_playlist("rainy day", 5, use_cache=False)
+        assert mock_generate.call_count == 2
+
+
+async def test_generate_playlist_async_uses_cache():
+    """Test that the async path reads and writes the same cache."""
+    with (
+        patch("backend.core.ai.genai.Client") as mock_client_cls,
+        patch("backend.core.ai.get_ai_api_key", return_value="key"),
+    ):
+        generate = mock_client_cls.return_value.aio.models.generate_content = AsyncMock(return_value=gemini_response())
+        assert await generate_playlist_async("focus", 3) == PLAYLIST
+        assert await generate_playlist_async("Focus", 3) == PLAYLIST
+    assert generate.await_count == 1
+
+
+async def test_generate_playlist_stream_replays_cached_playlist():
+    """Test that a cached playlist is streamed back without calling Gemini."""
+    cache = get_generation_cache()
+    assert cache is not None
+    cache.set_playlist(GenerationCache.playlist_key("focus", 3, settings.GEMINI_MODEL), PLAYLIST)
+
+    with patch("backend.core.ai.genai.Client") as mock_client_cls:
+        events = [event async for event in generate_playlist_stream("focus", 3)]
+
+    assert events == [
+        {"type": "track", "track": {"artist": "A", "track": "B"}},
+        {"type": "playlist", "playlist": PLAYLIST},
+    ]
+    mock_client_cls.assert_not_called()
+
+
+def test_generation_cache_can_be_disabled():
+    """Test the GENERATION_CACHE_ENABLED opt-out."""
+    with patch.object(settings, "GENERATION_CACHE_ENABLED", False):
+        assert get_generation_cache() is None
+
+
+async def test_semantic_lookup_reuses_similar_prompt():
+    """Test that a near-duplicate prompt reuses the cached result of its nearest stored prompt."""
+    cache = get_generation_cache()
+    assert cache is not None
+    cache.set_playlist(GenerationCache.playlist_key("late night jazz", 10, settings.GEMINI_MODEL), PLAYLIST)
+    neighbor = MagicMock(prompt="late night jazz", embedding=[0.1, 0.2, 0.3])
+    service = AIService(db=MagicMock(), gemini_client=MagicMock())
+
+    with (
+        patch.object(settings, "GENERATION_CACHE_SEMANTIC_ENABLED", True),
+        patch("backend.app.services.ai_service.embed_text_async", new=AsyncMock(return_value=[0.1, 0.2, 0.31])),
+        patch.object(service, "get_nearest_interactions", new=AsyncMock(return_value=[neighbor])),
+        patch("backend.app.services.ai_service.generate_playlist_async", new=AsyncMock()) as mock_generate,
+    ):
+        result = await service.generate_async("jazz for late nights", count=10, user_id="user-1")
+
+    assert result == PLAYLIST
+    mock_generate.assert_not_called()
+
+
+async def test_semantic_lookup_generates_and_stores_on_miss():
+    """Test that distant neighbors are ignored and the new prompt embedding is stored."""
+    neighbor = MagicMock(prompt="death metal", embedding=[1.0, 1.0, 1.0])
+    service = AIService(db=MagicMock(), gemini_client=MagicMock())
+
+    with (
+        patch.object(settings, "GENERATION_CACHE_SEMANTIC_ENABLED", True),
+        patch("backend.app.services.ai_service.embed_text_async", new=AsyncMock(return_value=[0.0, 0.0, 0.0])),
+        patch.object(service, "get_nearest_interactions", new=AsyncMock(return_value=[neighbor])),
+        patch.object(service, "store_interaction_embedding", new=AsyncMock()) as mock_store,
+        patch("backend.app.services.ai_service.generate_playlist_async", new=AsyncMock(return_value=PLAYLIST)),
+    ):
+        result = await service.generate_async("lullabies", count=10, user_id="user-1")
+
+    assert result == PLAYLIST
+    mock_store.assert_awaited_once_with("user-1", "lullabies", [0.0, 0.0, 0.0])
+
+
+async def test_semantic_lookup_needs_the_shared_client():
+    """Test that without the lifespan Gemini client no embedding is requested."""
+    service = AIService(db=MagicMock())
+
+    with (
+        patch.object(settings, "GENERATION_CACHE_SEMANTIC_ENABLED", True),
+        patch("backend.app.services.ai_service.embed_text_async", new=AsyncMock()) as mock_embed,
+        patch("backend.app.services.ai_service.generate_playlist_async", new=AsyncMock(return_value=PLAYLIST)),
+    ):
+        assert await service.generate_async("lullabies", count=10, user_id="user-1") == PLAYLIST
+
+    mock_embed.assert_not_called()
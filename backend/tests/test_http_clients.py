@@ -0,0 +1,69 @@
+import httpcore
+import httpx
+
+from backend.app.core.config import settings
+from backend.core.http_clients import (
+    HTTP2_AVAILABLE,
+    HTTPClientRegistry,
+    close_http_clients,
+    get_http_client_registry,
+    get_shared_http_client,
+)
+from backend.core.providers.discogs import DiscogsClient
+from backend.core.providers.spotify import SpotifyProvider
+
+
+async def test_registry_reuses_named_clients():
+    """Test each name maps to one pooled client until it is closed."""
+    registry = HTTPClientRegistry()
+    default = registry.get()
+    discogs = registry.get("discogs", base_url="https://api.discogs.com")
+
+    assert registry.get() is default
+    assert registry.get("discogs") is discogs
+    assert discogs is not default
+    assert discogs.base_url == httpx.URL("https://api.discogs.com")
+
+    await default.aclose()
+    assert registry.get() is not default
+
+    await registry.aclose()
+    assert discogs.is_closed
+
+
+async def test_shared_clients_use_configured_pool():
+    """Test shared clients pick up the pool and timeout settings."""
+    client = get_shared_http_client()
+
+    assert isinstance(client._transport, httpx.AsyncHTTPTransport)
+    pool = client._transport._pool
+    assert isinstance(pool, httpcore.AsyncConnectionPool)
+    assert pool._max_connections == settings.HTTP_MAX_CONNECTIONS
+    assert pool._max_keepalive_connections == settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    assert client.timeout.connect == settings.HTTP_CONNECT_TIMEOUT_SECONDS
+
+    await close_http_clients()
+    assert client.is_closed
+
+
+async def test_providers_share_clients_across_instances():
+    """Test providers built per request reuse the same connection pools."""
+    assert DiscogsClient().http_client is DiscogsClient().http_client
+    assert SpotifyProvider("a").http_client is SpotifyProvider("b").http_client
+    assert DiscogsClient().http_client is get_http_client_registry().get("discogs")
+
+    await close_http_clients()
+
+
+async def test_shared_clients_negotiate_http2(caplog):
+    """Test the locked h2 dependency turns HTTP/2 on without the fallback warning."""
+    registry = HTTPClientRegistry()
+    client = registry.get()
+
+    assert HTTP2_AVAILABLE
+    assert isinstance(client._transport, httpx.AsyncHTTPTransport)
+    assert isinstance(client._transport._pool, httpcore.AsyncConnectionPool)
+    assert client._transport._pool._http2
+    assert "falls back to HTTP/1.1" not in caplog.text
+
+    await registry.aclose()
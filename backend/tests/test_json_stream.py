@@ -0,0 +1,51 @@
+import json
+from backend.core.utils.json_stream import TrackStreamParser
+
+PLAYLIST = {
+    "title": "Braces {and} [brackets]",
+    "description": 'Quotes \\" and "tracks" inside strings',
+    "tracks": [
+        {"artist": "AC/DC", "track": "T.N.T. {live}", "version": "live", "duration_ms": 215000},
+        {"artist": 'The "Band"', "track": "Song [Remix]", "version": None},
+        {"artist": "Björk", "track": "Jóga", "version": "studio"},
+    ],
+}
+
+
+def feed_in_chunks(text, size):
+    parser = TrackStreamParser()
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted.extend(parser.feed(text[i : i + size]))
+    return parser, emitted
+
+
+def test_parser_emits_tracks_for_any_chunking():
+    """Test every chunk size yields exactly the track objects, in order."""
+    text = json.dumps(PLAYLIST, indent=2)
+    for size in range(1, 40):
+        parser, emitted = feed_in_chunks(text, size)
+        assert emitted == PLAYLIST["tracks"]
+        assert parser.buffer == text
+
+
+def test_parser_emits_each_track_once_it_closes():
+    """Test a track is returned as soon as its closing brace arrives."""
+    parser = TrackStreamParser()
+    assert parser.feed('{"title": "T", "tracks": [{"artist": "A", "track": "B"') == []
+    assert parser.feed("}, {") == [{"artist": "A", "track": "B"}]
+    assert parser.feed('"artist": "C", "track": "D"}]}') == [{"artist": "C", "track": "D"}]
+
+
+def test_parser_handles_legacy_list_and_markdown_fences():
+    """Test a fenced top-level list is parsed the same way."""
+    text = '```json\n[{"artist": "A", "track": "B"}, {"artist": "C", "track": "D"}]\n```'
+    _, emitted = feed_in_chunks(text, 7)
+    assert emitted == [{"artist": "A", "track": "B"}, {"artist": "C", "track": "D"}]
+
+
+def test_parser_ignores_arrays_outside_tracks():
+    """Test objects in other top-level arrays are not mistaken for tracks."""
+    text = '{"tags": [{"name": "x"}], "tracks": [{"artist": "A", "track": "B"}]}'
+    _, emitted = feed_in_chunks(text, 5)
+    assert emitted == [{"artist": "A", "track": "B"}]
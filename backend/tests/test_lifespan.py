@@ -31,3 +31,50 @@ async def test_lifespan_worker_process():
             mock_broker.startup.assert_not_called()
 
         mock_broker.shutdown.assert_not_called()
+
+
+async def test_lifespan_shared_gemini_client():
+    """Test a pooled Gemini client is created for the app and closed on shutdown."""
+    app = FastAPI()
+    with (
+        patch("backend.app.main.broker") as mock_broker,
+        patch("backend.app.main.settings.GEMINI_API_KEY", "key"),
+        patch("backend.app.main.create_gemini_client") as mock_create,
+        patch("backend.app.main.close_gemini_client", new_callable=AsyncMock) as mock_close,
+    ):
+        mock_broker.is_worker_process = True
+
+        async with lifespan(app):
+            assert app.state.gemini_client is mock_create.return_value
+            mock_close.assert_not_called()
+
+        mock_close.assert_awaited_once_with(mock_create.return_value)
+
+
+async def test_lifespan_without_gemini_key():
+    """Test no Gemini client is created when no API key is configured."""
+    app = FastAPI()
+    with (
+        patch("backend.app.main.broker") as mock_broker,
+        patch("backend.app.main.settings.GEMINI_API_KEY", None),
+    ):
+        mock_broker.is_worker_process = True
+
+        async with lifespan(app):
+            assert app.state.gemini_client is None
+
+
+async def test_lifespan_closes_shared_http_clients():
+    """Test the shared outbound HTTP clients are closed on shutdown."""
+    app = FastAPI()
+    with (
+        patch("backend.app.main.broker") as mock_broker,
+        patch("backend.app.main.close_http_clients", new_callable=AsyncMock) as mock_close,
+    ):
+        mock_broker.is_worker_process = True
+
+        async with lifespan(app):
+            assert app.state.http_clients is not None
+            mock_close.assert_not_called()
+
+        mock_close.assert_awaited_once()
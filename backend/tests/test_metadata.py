@@ -21,7 +21,7 @@ def mock_httpx_client():
 def mock_discogs_client():
     """Mocks the DiscogsClient used by MetadataVerifier."""
     mock_client = AsyncMock(spec=DiscogsClient)
-    with patch("backend.core.metadata.DiscogsClient", return_value=mock_client):
+    with patch("backend.core.metadata.get_discogs_client", return_value=mock_client):
         yield mock_client
 
 
@@ -238,15 +238,38 @@ async def test_verify_track_mb_http_error_discogs_success(verifier, mock_httpx_c
 
 
 async def test_metadata_verifier_rate_limit(verifier):
-    """Test the asynchronous rate limit enforcement in MetadataVerifier."""
-    verifier.last_request_time = asyncio.get_event_loop().time() - 0.1  # 100ms ago
+    """Test that MusicBrainz calls wait on the shared limiter."""
+    # Drain the single token so the next request has to wait a full interval
+    await verifier.rate_limiter.acquire()
 
-    with patch("backend.core.metadata.asyncio.sleep", new=AsyncMock()) as mock_sleep:
-        # This will trigger the sleep branch logic because 0.1 < 1.1
+    with patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep:
         await verifier._enforce_rate_limit()
         mock_sleep.assert_called_once()
-        # Verify sleep duration is roughly correct (1.1 - 0.1 = 1.0)
-        assert mock_sleep.call_args[0][0] == pytest.approx(1.0, abs=0.01)
+        assert mock_sleep.call_args[0][0] == pytest.approx(1.0, abs=0.05)
+
+
+async def test_verifiers_share_rate_limiter(mock_httpx_client, mock_discogs_client, mock_spotify_provider):
+    """Test that separate verifier instances draw from the same process-wide budget."""
+    first = MetadataVerifier(http_client=mock_httpx_client, spotify_provider=mock_spotify_provider)
+    second = MetadataVerifier(http_client=mock_httpx_client, spotify_provider=mock_spotify_provider)
+    assert first.rate_limiter is second.rate_limiter
+
+
+async def test_identical_musicbrainz_requests_are_coalesced(verifier, mock_httpx_client):
+    """Test that concurrent lookups for the same recording share one HTTP call."""
+    mock_response = MagicMock(json=MagicMock(return_value={"recordings": [{"title": "Song"}]}))
+    mock_response.raise_for_status.return_value = None
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0)
+        return mock_response
+
+    mock_httpx_client.get.side_effect = slow_get
+
+    results = await asyncio.gather(*(verifier.search_recording("Artist", "Song") for _ in range(5)))
+
+    assert all(r == [{"title": "Song"}] for r in results)
+    assert mock_httpx_client.get.call_count == 1
 
 
 # --- Other Search Methods ---
@@ -332,3 +355,82 @@ async def test_search_album_error_edge(verifier, mock_httpx_client):
     with patch("backend.core.metadata.asyncio.sleep", new=AsyncMock()):
         result = await verifier.search_album("Artist", "Album")
     assert result is None
+
+
+# --- Local Catalog Tests ---
+
+
+@pytest.fixture
+def mock_catalog():
+    from backend.app.services.metadata_catalog import MetadataCatalog
+
+    catalog = AsyncMock(spec=MetadataCatalog)
+    catalog.has_track.return_value = False
+    catalog.get_artist.return_value = None
+    return catalog
+
+
+async def test_verify_track_version_served_from_catalog(
+    mock_httpx_client, mock_discogs_client, mock_spotify_provider, mock_catalog
+):
+    """Test a cataloged track is verified without any provider call."""
+    mock_catalog.has_track.return_value = True
+    verifier = MetadataVerifier(mock_httpx_client, mock_spotify_provider, catalog=mock_catalog)
+
+    assert await verifier.verify_track_version("Artist", "Song", "Live") is True
+
+    mock_catalog.has_track.assert_awaited_once_with("Artist", "Song", "live")
+    mock_httpx_client.get.assert_not_called()
+    mock_discogs_client.search_track.assert_not_called()
+
+
+async def test_verify_track_version_writes_through_to_catalog(
+    mock_httpx_client, mock_discogs_client, mock_spotify_provider, mock_catalog
+):
+    """Test provider verifications are stored in the catalog with their source."""
+    verifier = MetadataVerifier(mock_httpx_client, mock_spotify_provider, catalog=mock_catalog)
+    mock_discogs_client.search_track.return_value = {"uri": "discogs:master:7"}
+
+    with patch.object(verifier, "search_recording", AsyncMock(return_value=[{"id": "mb-1", "title": "Song"}])):
+        assert await verifier.verify_track_version("Artist", "Song", "studio") is True
+    with patch.object(verifier, "search_recording", AsyncMock(return_value=[])):
+        assert await verifier.verify_track_version("Artist", "Other", "studio") is True
+
+    assert mock_catalog.store_track.await_args_list[0].args == ("Artist", "Song", "studio", "musicbrainz")
+    assert mock_catalog.store_track.await_args_list[0].kwargs == {"provider_id": "mb-1"}
+    assert mock_catalog.store_track.await_args_list[1].args == ("Artist", "Other", "studio", "discogs")
+
+
+async def test_search_artist_uses_catalog_first(
+    mock_httpx_client, mock_discogs_client, mock_spotify_provider, mock_catalog
+):
+    """Test artist lookups hit MusicBrainz only on a catalog miss, and store the result."""
+    verifier = MetadataVerifier(mock_httpx_client, mock_spotify_provider, catalog=mock_catalog)
+    mb_artist = {"id": "mb-a", "name": "Artist", "type": "Group", "country": "GB"}
+    mock_httpx_client.get.return_value = MagicMock(json=MagicMock(return_value={"artists": [mb_artist]}))
+
+    assert await verifier.search_artist("Artist") == mb_artist
+    mock_catalog.store_artist.assert_awaited_once_with(mb_artist)
+
+    mock_catalog.get_artist.return_value = mb_artist
+    mock_httpx_client.get.reset_mock()
+    assert await verifier.search_artist("artist") == mb_artist
+    mock_httpx_client.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_verify_track_versions_batches_unique_pairs(verifier):
+    """Test batched verification keeps input order, dedupes pairs and treats errors as unverified."""
+
+    async def fake_verify(artist, track, version):
+        if track == "Broken":
+            raise RuntimeError("lookup failed")
+        return "Live" in track
+
+    with patch.object(verifier, "verify_track_version", side_effect=fake_verify) as mock_verify:
+        result = await verifier.verify_track_versions(
+            [("A", "Song (Live)"), ("A", "Song"), ("A", "Song (Live)"), ("B", "Broken")], "live"
+        )
+
+    assert result == [True, False, True, False]
+    assert mock_verify.call_count == 3
@@ -0,0 +1,108 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.app.core.config import settings
+from backend.app.models.metadata import Artist
+from backend.app.services.metadata_catalog import MetadataCatalog, get_metadata_catalog
+
+
+def make_catalog(result=None, execute_error=None):
+    """Build a catalog over a mocked session maker returning ``result`` from every query."""
+    session = MagicMock()
+    session.execute = AsyncMock(
+        side_effect=execute_error, return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=result))
+    )
+    session.commit = AsyncMock()
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__ = AsyncMock(return_value=session)
+    session_maker.return_value.__aexit__ = AsyncMock(return_value=False)
+    return MetadataCatalog(session_maker=session_maker), session
+
+
+async def test_get_artist_returns_musicbrainz_shape():
+    """Test a cataloged artist is returned in the shape of a MusicBrainz search result."""
+    artist = Artist(name="Radiohead", provider_id="mb-1", artist_type="Group", country="GB", source="musicbrainz")
+    catalog, _ = make_catalog(result=artist)
+
+    assert await catalog.get_artist("radiohead ") == {
+        "id": "mb-1",
+        "name": "Radiohead",
+        "type": "Group",
+        "country": "GB",
+    }
+
+
+async def test_lookups_treat_database_errors_as_misses():
+    """Test catalog failures never break verification."""
+    catalog, _ = make_catalog(execute_error=ConnectionRefusedError("db down"))
+
+    assert await catalog.get_artist("A") is None
+    assert await catalog.has_track("A", "B", "studio") is False
+    await catalog.store_track("A", "B", "studio", "musicbrainz")
+
+
+def executed_sql(session) -> str:
+    """Postgres SQL of the single statement the catalog executed."""
+    from sqlalchemy.dialects import postgresql
+
+    session.execute.assert_awaited_once()
+    return str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+
+
+async def test_store_track_upserts_on_the_catalog_key():
+    """Test tracks are written with one upsert, so concurrent verifications cannot duplicate them."""
+    catalog, session = make_catalog()
+    await catalog.store_track("Artist", "Song", "live", "discogs", provider_id="discogs:master:1")
+
+    sql = executed_sql(session)
+    assert sql.startswith("INSERT INTO track")
+    assert "ON CONFLICT (lower(artist_name), lower(title), version) DO UPDATE" in sql
+    # A refresh without an ID or album keeps the ones already cataloged
+    assert "provider_id = coalesce(excluded.provider_id, track.provider_id)" in sql
+    assert "album_name = coalesce(excluded.album_name, track.album_name)" in sql
+    session.add.assert_not_called()
+    session.commit.assert_awaited_once()
+
+
+async def test_store_artist_upserts_by_provider_id_or_name():
+    """Test artists are keyed on their provider ID, or on their name when the result has none."""
+    catalog, session = make_catalog()
+    await catalog.store_artist({"id": "mb-1", "name": "Radiohead", "type": "Group", "country": "GB"})
+    assert "ON CONFLICT (source, provider_id) DO UPDATE" in executed_sql(session)
+
+    catalog, session = make_catalog()
+    await catalog.store_artist({"name": "Radiohead"})
+    assert "ON CONFLICT (lower(name), source) WHERE provider_id IS NULL DO UPDATE" in executed_sql(session)
+
+
+async def test_store_artist_requires_a_name():
+    """Test incomplete provider results are not cataloged."""
+    catalog, session = make_catalog()
+    await catalog.store_artist({"id": "mb-1"})
+    session.execute.assert_not_called()
+
+
+def test_get_metadata_catalog_disabled():
+    """Test the catalog can be switched off."""
+    with patch.object(settings, "METADATA_CATALOG_ENABLED", False):
+        assert get_metadata_catalog() is None
+    assert isinstance(get_metadata_catalog(), MetadataCatalog)
+
+
+def test_search_statements_use_indexed_operators():
+    """Test metadata search filters with the trigram operator and the generated tsvector columns."""
+    from sqlalchemy.dialects import postgresql
+
+    from backend.app.services.metadata_catalog import artist_search_stmt, track_search_stmt
+
+    artist_sql = str(artist_search_stmt("daft").compile(dialect=postgresql.dialect()))
+    track_sql = str(track_search_stmt("daft").compile(dialect=postgresql.dialect()))
+
+    assert "artist.name %%" in artist_sql
+    assert "artist.search_vector @@ plainto_tsquery" in artist_sql
+    assert "track.title %%" in track_sql
+    assert "track.search_vector @@ plainto_tsquery" in track_sql
+    # No per-row to_tsvector() or similarity() filter that would force a sequential scan
+    assert "to_tsvector" not in artist_sql + track_sql
+    assert "ORDER BY similarity(track.title" in track_sql
+    # The generated vectors are never loaded into API responses
+    assert "search_vector," not in artist_sql.split("FROM")[0]
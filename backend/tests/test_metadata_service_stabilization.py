@@ -116,8 +116,8 @@ def mock_mb_search():
 
 @pytest.fixture
 def mock_discogs_search():
-    # Patch the DiscogsClient instance used inside MetadataVerifier
-    with patch("backend.core.metadata.DiscogsClient.search_track") as mock:
+    # Patch the shared DiscogsClient used inside MetadataVerifier
+    with patch("backend.core.providers.discogs.DiscogsClient.search_track") as mock:
         mock.return_value = AsyncMock()  # Ensure return value is awaitable
         yield mock
 
@@ -149,13 +149,13 @@ async def test_verify_track_version_both_fail_no_token(mock_mb_search, mock_spot
     """Test that if MB fails and Discogs search fails, returns False."""
     with (
         patch("backend.core.metadata.asyncio.sleep", new=AsyncMock()),
-        patch("backend.core.metadata.DiscogsClient") as mock_discogs_cls,
+        patch("backend.core.metadata.get_discogs_client") as mock_get_discogs,
     ):
 
         # Configure the mock DiscogsClient instance
         mock_discogs_client = AsyncMock(spec=DiscogsClient)
         mock_discogs_client.search_track.return_value = None  # Simulate Discogs failure
-        mock_discogs_cls.return_value = mock_discogs_client
+        mock_get_discogs.return_value = mock_discogs_client
 
         verifier = MetadataVerifier(http_client=AsyncMock(spec=AsyncClient), spotify_provider=mock_spotify_provider)
 
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+from backend.core.model_registry import DEFAULT_FALLBACK_MODEL, ModelRegistry
+
+
+def test_available_models_cached_within_ttl():
+    """Test the model list is fetched once and then served from memory."""
+    registry = ModelRegistry(ttl=60)
+    with patch("backend.core.ai.list_available_models", return_value=["models/gemini-2.0-flash"]) as mock_list:
+        assert registry.available_models() == ["models/gemini-2.0-flash"]
+        assert registry.available_models() == ["models/gemini-2.0-flash"]
+
+    mock_list.assert_called_once()
+
+
+def test_stale_list_served_while_refreshing_in_background():
+    """Test a stale list is returned immediately and replaced by a background refresh."""
+    registry = ModelRegistry(ttl=60)
+    with patch("backend.core.ai.list_available_models", return_value=["models/gemini-1.5-flash"]):
+        registry.available_models()
+
+    assert registry._loaded_at is not None
+    registry._loaded_at -= 120
+    with (
+        patch("backend.core.ai.list_available_models", return_value=["models/gemini-2.0-flash"]),
+        patch("backend.core.model_registry.threading.Thread") as mock_thread,
+    ):
+        assert registry.available_models() == ["models/gemini-1.5-flash"]
+        # Only one refresh is scheduled while one is pending
+        registry.available_models()
+        mock_thread.assert_called_once()
+
+        target = mock_thread.call_args.kwargs["target"]
+        target(*mock_thread.call_args.kwargs["args"])
+
+    assert registry.cached_models() == ["models/gemini-2.0-flash"]
+
+
+def test_failed_refresh_keeps_previous_list():
+    """Test an empty listing (API error) does not wipe the cached models."""
+    registry = ModelRegistry()
+    with patch("backend.core.ai.list_available_models", return_value=["models/gemini-2.0-flash"]):
+        registry.refresh()
+    with patch("backend.core.ai.list_available_models", return_value=[]):
+        assert registry.refresh() == ["models/gemini-2.0-flash"]
+
+
+def test_fallback_skips_failed_and_excluded_models():
+    """Test fallback picks the newest flash model that has not failed recently."""
+    registry = ModelRegistry(failure_ttl=60)
+    registry._models = ["models/gemini-1.5-flash", "models/gemini-2.0-flash", "models/gemini-2.5-flash", "gemini-pro"]
+    with patch("backend.core.model_registry.time.monotonic", return_value=10):
+        registry._loaded_at = 10
+        registry.mark_failed("models/gemini-2.5-flash")
+        assert registry.fallback_model() == "gemini-2.0-flash"
+        assert registry.fallback_model(exclude=["gemini-2.0-flash"]) == "gemini-1.5-flash"
+        assert registry.fallback_model(exclude=["gemini-2.0-flash", "gemini-1.5-flash"]) == DEFAULT_FALLBACK_MODEL
+
+    # Failures expire after failure_ttl
+    with patch("backend.core.model_registry.time.monotonic", return_value=100):
+        assert not registry.recently_failed("gemini-2.5-flash")
+
+
+def test_resolve_replaces_recently_failed_model():
+    """Test resolve only swaps the model when it failed recently."""
+    registry = ModelRegistry()
+    registry._models = ["models/gemini-2.0-flash"]
+    client = MagicMock()
+
+    assert registry.resolve("gemini-flash-latest", client) == "gemini-flash-latest"
+    registry.mark_failed("gemini-flash-latest")
+    assert registry.resolve("gemini-flash-latest", client) == "gemini-2.0-flash"
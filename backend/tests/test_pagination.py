@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from backend.core.pagination import fetch_pages_concurrently, fetch_pages_threaded, remaining_offsets
+
+
+def test_remaining_offsets():
+    """Test offsets are derived from total/limit/offset, with None when the total is unknown."""
+    assert remaining_offsets({"items": [], "next": None, "total": 500, "limit": 100}) == []
+    assert remaining_offsets({"next": "url", "total": 350, "limit": 100, "offset": 0}) == [100, 200, 300]
+    assert remaining_offsets({"next": "url", "total": 350, "limit": 100, "offset": 100}) == [200, 300]
+    assert remaining_offsets({"next": "url"}) is None
+    assert remaining_offsets({"next": "url", "total": 10, "limit": 0}) is None
+    assert remaining_offsets(None) == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_concurrently_is_bounded_and_ordered():
+    """Test pages come back in offset order with at most `concurrency` requests in flight."""
+    in_flight = peak = 0
+
+    async def fetch(offset):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later offsets finish first
+        await asyncio.sleep(0.001 * (10 - offset // 100))
+        in_flight -= 1
+        return {"items": [offset]}
+
+    pages = await fetch_pages_concurrently(fetch, [100 * i for i in range(1, 10)], concurrency=3)
+
+    assert pages == [{"items": [100 * i]} for i in range(1, 10)]
+    assert peak == 3
+
+
+def test_fetch_pages_threaded_is_ordered():
+    """Test threaded fetching keeps offset order, and runs inline with a single worker."""
+    import threading
+
+    threads = set()
+
+    def fetch(offset):
+        threads.add(threading.current_thread().name)
+        return {"items": [offset]}
+
+    pages = fetch_pages_threaded(fetch, [100, 200, 300, 400], max_workers=4)
+    assert pages == [{"items": [offset]} for offset in (100, 200, 300, 400)]
+
+    threads.clear()
+    fetch_pages_threaded(fetch, [100, 200], max_workers=1)
+    assert threads == {threading.current_thread().name}
@@ -0,0 +1,70 @@
+import random
+from backend.core.playlist_diff import full_replace_cost, plan_playlist_diff
+
+
+def apply_ops(remote, ops):
+    """Replay diff operations with Spotify's playlist semantics."""
+    current = list(remote)
+    for op in ops:
+        if op["type"] == "remove":
+            current = [uri for uri in current if uri not in op["uris"]]
+        elif op["type"] == "insert":
+            current[op["position"] : op["position"]] = op["uris"]
+        else:
+            start, before, length = op["range_start"], op["insert_before"], op["range_length"]
+            block = current[start : start + length]
+            del current[start : start + length]
+            target = before if before <= start else before - length
+            current[target:target] = block
+    return current
+
+
+def test_identical_playlists_need_no_operations():
+    """Test that an unchanged playlist produces an empty plan."""
+    uris = [f"uri:{i}" for i in range(250)]
+    assert plan_playlist_diff(uris, list(uris)) == []
+
+
+def test_single_change_is_cheap():
+    """Test that swapping one track in a large playlist costs one remove and one insert."""
+    remote = [f"uri:{i}" for i in range(1000)]
+    desired = list(remote)
+    desired[500] = "uri:new"
+
+    ops = plan_playlist_diff(remote, desired)
+
+    assert ops == [
+        {"type": "remove", "uris": ["uri:500"]},
+        {"type": "insert", "uris": ["uri:new"], "position": 500},
+    ]
+    assert len(ops) < full_replace_cost(desired)
+
+
+def test_moved_block_is_one_reorder():
+    """Test that moving a contiguous run of tracks is a single reorder."""
+    remote = [f"uri:{i}" for i in range(300)]
+    desired = remote[100:200] + remote[:100] + remote[200:]
+
+    ops = plan_playlist_diff(remote, desired)
+
+    assert ops == [{"type": "reorder", "range_start": 100, "insert_before": 0, "range_length": 100}]
+
+
+def test_duplicates_and_large_inserts():
+    """Test duplicate handling and that inserts respect the 100-item request limit."""
+    remote = ["a", "a", "b"]
+    desired = ["a", "b"] + [f"new:{i}" for i in range(150)]
+
+    ops = plan_playlist_diff(remote, desired)
+
+    assert apply_ops(remote, ops) == desired
+    assert all(len(op.get("uris", [])) <= 100 for op in ops)
+
+
+def test_random_plans_reproduce_desired_order():
+    """Test that applying any plan yields exactly the desired playlist."""
+    rng = random.Random(42)
+    for _ in range(2000):
+        remote = [rng.choice("abcdefgh") for _ in range(rng.randint(0, 15))]
+        desired = [rng.choice("abcdefghij") for _ in range(rng.randint(0, 15))]
+        assert apply_ops(remote, plan_playlist_diff(remote, desired)) == desired
@@ -134,3 +134,85 @@ async def test_delete_playlist_endpoint(mock_user, mock_db):
     assert response.status_code == 204
     mock_db.commit.assert_called_once()
     app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_create_build_job_enqueues_task(mock_user, mock_db):
+    from unittest.mock import patch
+    from datetime import datetime, timezone
+
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = MagicMock()  # Spotify connection
+    mock_db.execute.return_value = mock_result
+    mock_db.add = MagicMock()
+
+    def refresh(job):
+        job.id = uuid.uuid4()
+        job.created_at = job.updated_at = datetime.now(timezone.utc)
+
+    mock_db.refresh.side_effect = refresh
+
+    app.dependency_overrides[current_active_user] = lambda: mock_user
+    app.dependency_overrides[get_async_session] = lambda: mock_db
+
+    payload = {"playlist_data": {"name": "Big", "tracks": [{"artist": "A", "track": "T"}] * 3}}
+    with patch("backend.app.api.v1.endpoints.playlists.build_playlist_task") as mock_task:
+        mock_task.kiq = AsyncMock()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/v1/playlists/build/jobs", json=payload)
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "pending"
+    assert data["total"] == 3 and data["processed"] == 0
+    assert data["result"] is None
+    job = mock_db.add.call_args[0][0]
+    assert job.request_json["name"] == "Big"
+    mock_task.kiq.assert_awaited_once_with(job.id)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_build_job_reports_progress_and_result(mock_user, mock_db):
+    from datetime import datetime, timezone
+    from backend.app.models.build_job import BuildJob
+
+    now = datetime.now(timezone.utc)
+    job = BuildJob(
+        id=uuid.uuid4(),
+        user_id=mock_user.id,
+        status="completed",
+        total=2,
+        processed=2,
+        request_json={},
+        result_json={
+            "status": "success",
+            "playlist_id": "sp_1",
+            "url": "https://open.spotify.com/playlist/sp_1",
+            "failed_tracks": ["B - 2"],
+            "actual_tracks": [{"artist": "A", "track": "1", "uri": "u1"}],
+            "total_duration_ms": 0,
+        },
+        created_at=now,
+        updated_at=now,
+    )
+    mock_db.get.return_value = job
+
+    app.dependency_overrides[current_active_user] = lambda: mock_user
+    app.dependency_overrides[get_async_session] = lambda: mock_db
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/api/v1/playlists/build/jobs/{job.id}")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed"] == 2
+    assert data["result"]["playlist_id"] == "sp_1"
+    assert data["result"]["failed_tracks"] == ["B - 2"]
+
+    # Other users' jobs are hidden
+    job.user_id = uuid.uuid4()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/api/v1/playlists/build/jobs/{job.id}")
+    assert response.status_code == 404
+    app.dependency_overrides.clear()
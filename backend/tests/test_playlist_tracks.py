@@ -0,0 +1,88 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from backend.app.models.playlist import Playlist, PlaylistTrack
+from backend.app.services.playlist_tracks import (
+    playlist_track_rows,
+    playlists_with_artist_stmt,
+    set_playlist_tracks,
+)
+
+
+def test_playlist_track_rows_follow_playlist_order():
+    """Test rows are numbered in playlist order and tolerate sparse track dicts."""
+    playlist = Playlist(id=uuid.uuid4(), name="P", content_json={})
+    rows = playlist_track_rows(
+        playlist,
+        [
+            {"artist": "A", "track": "One", "uri": "spotify:track:1", "provider": "spotify", "duration_ms": 1000},
+            {"uri": "spotify:track:2", "duration_ms": "bad"},
+        ],
+    )
+
+    assert [r.position for r in rows] == [0, 1]
+    assert rows[0].artist == "A" and rows[0].provider == "spotify" and rows[0].duration_ms == 1000
+    assert rows[1].artist is None and rows[1].duration_ms is None
+    assert all(r.playlist is playlist for r in rows)
+
+
+def test_playlist_track_rows_clip_long_values():
+    """Test free-form values are clipped to the column sizes."""
+    playlist = Playlist(id=uuid.uuid4(), name="P", content_json={})
+    rows = playlist_track_rows(playlist, [{"artist": "x" * 300, "version": "v" * 60}])
+    assert rows[0].artist == "x" * 255
+    assert rows[0].version == "v" * 50
+
+
+@pytest.mark.asyncio
+async def test_set_playlist_tracks_new_playlist_skips_delete():
+    """Test a new playlist gets an id and rows without a delete round-trip."""
+    db = MagicMock()
+    db.execute = AsyncMock()
+    playlist = Playlist(name="P", content_json={})
+    tracks = [{"artist": "A", "track": "One"}]
+
+    await set_playlist_tracks(db, playlist, tracks)
+
+    assert playlist.id is not None
+    assert playlist.content_json == {"tracks": tracks}
+    db.execute.assert_not_called()
+    rows = db.add_all.call_args[0][0]
+    assert [(r.artist, r.track) for r in rows] == [("A", "One")]
+
+
+@pytest.mark.asyncio
+async def test_set_playlist_tracks_existing_playlist_replaces_rows():
+    """Test an existing playlist has its old rows deleted and other content keys preserved."""
+    db = MagicMock()
+    db.execute = AsyncMock()
+    playlist = Playlist(id=uuid.uuid4(), name="P", content_json={"tracks": [], "metadata": {"mood": "calm"}})
+
+    await set_playlist_tracks(db, playlist, [{"artist": "B", "track": "Two"}])
+
+    assert playlist.content_json == {"tracks": [{"artist": "B", "track": "Two"}], "metadata": {"mood": "calm"}}
+    delete_sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert delete_sql.startswith("DELETE FROM playlist_track")
+    db.add_all.assert_called_once()
+
+
+def test_playlists_with_artist_stmt_uses_normalized_rows():
+    """Test the artist lookup filters through playlist_track instead of the JSON document."""
+    user_id = uuid.uuid4()
+    sql = str(playlists_with_artist_stmt("Gunship", user_id=user_id).compile(dialect=postgresql.dialect()))
+
+    assert "FROM playlist_track" in sql
+    assert "lower(playlist_track.artist)" in sql
+    assert "playlist.user_id" in sql
+    assert "content_json::" not in sql and "@>" not in sql
+
+
+def test_artist_index_matches_lookup_expression():
+    """Test the model's artist index is on lower(artist), as created by the migration and used by lookups."""
+    indexes = {index.name: index for index in PlaylistTrack.metadata.tables["playlist_track"].indexes}
+    ddl = str(CreateIndex(indexes["ix_playlist_track_artist_lower"]).compile(dialect=postgresql.dialect()))
+    assert ddl == "CREATE INDEX ix_playlist_track_artist_lower ON playlist_track (lower(artist))"
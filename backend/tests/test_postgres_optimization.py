@@ -116,3 +116,59 @@ async def test_vector_similarity_search(db_session: AsyncSession):
     result = await db_session.execute(stmt)
     nearest = result.scalar_one()
     assert nearest.prompt == "High vector"
+
+
+@pytest.mark.asyncio
+async def test_metadata_search_uses_indexed_columns(db_session: AsyncSession):
+    """Test the ranked trigram/full-text search over the generated search vectors."""
+    from backend.app.models.metadata import Artist, Track
+    from backend.app.services.metadata_catalog import artist_search_stmt, track_search_stmt
+
+    db_session.add_all(
+        [
+            Artist(name="Daft Punk"),
+            Artist(name="Punk Rock Heroes"),
+            Track(title="One More Time", artist_name="Daft Punk", album_name="Discovery"),
+            Track(title="Around the World", artist_name="Daft Punk", album_name="Homework"),
+        ]
+    )
+    await db_session.flush()
+
+    # Typo matches through the trigram operator, the closest name ranks first
+    artists = (await db_session.execute(artist_search_stmt("Daft Punc"))).scalars().all()
+    assert artists[0].name == "Daft Punk"
+
+    # Album and artist words match through the weighted tsvector
+    tracks = (await db_session.execute(track_search_stmt("discovery"))).scalars().all()
+    assert [t.title for t in tracks] == ["One More Time"]
+
+
+@pytest.mark.asyncio
+async def test_playlist_track_rows_follow_content(db_session: AsyncSession):
+    """Test the normalized playlist_track rows back the artist lookup and follow content updates."""
+    from backend.app.services.playlist_tracks import playlists_with_artist_stmt, set_playlist_tracks
+
+    user = User(email="playlist_track@example.com", hashed_password="h")
+    other = User(email="playlist_track_other@example.com", hashed_password="h")
+    db_session.add_all([user, other])
+    await db_session.flush()
+
+    mine = Playlist(user_id=user.id, name="Mine", content_json={})
+    theirs = Playlist(user_id=other.id, name="Theirs", content_json={})
+    db_session.add_all([mine, theirs])
+    await set_playlist_tracks(db_session, mine, [{"artist": "Gunship", "track": "Tech Noir"}])
+    await set_playlist_tracks(db_session, theirs, [{"artist": "gunship", "track": "Fly For Your Life"}])
+    await db_session.commit()
+
+    result = await db_session.execute(playlists_with_artist_stmt("GUNSHIP", user_id=user.id))
+    assert [p.name for p in result.scalars().all()] == ["Mine"]
+
+    # Cross-user lookup
+    result = await db_session.execute(playlists_with_artist_stmt("Gunship"))
+    assert {p.name for p in result.scalars().all()} == {"Mine", "Theirs"}
+
+    # Replacing the content replaces the rows
+    await set_playlist_tracks(db_session, mine, [{"artist": "The Midnight", "track": "Sunset"}])
+    await db_session.commit()
+    result = await db_session.execute(playlists_with_artist_stmt("Gunship", user_id=user.id))
+    assert result.scalars().all() == []
@@ -1,23 +1,34 @@
+import asyncio
+import json
 import pytest
-from unittest.mock import MagicMock, patch
+import httpx
+from unittest.mock import patch
+from spotipy.exceptions import SpotifyException
 from backend.core.providers.spotify import SpotifyProvider
+from backend.core.search_cache import SearchCache
+from backend.core.utils import scoring
+from backend.core.providers.spotify_fields import playlist_fields, tracks_page_fields
 
 
-@pytest.fixture
-def mock_spotipy():
-    with patch("backend.core.providers.spotify.spotipy.Spotify") as mock_cls:
-        instance = MagicMock()
-        mock_cls.return_value = instance
-        instance.current_user.return_value = {"id": "user_id"}
-        yield instance
+def make_provider(handler) -> SpotifyProvider:
+    """Build a SpotifyProvider whose HTTP calls are served by handler."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return SpotifyProvider(auth_token="token", http_client=client)
+
+
+def search_response(items):
+    return httpx.Response(200, json={"tracks": {"items": items}})
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_search_track(mock_spotipy):
+async def test_spotify_provider_search_track():
     """Test SpotifyProvider search_track."""
-    mock_spotipy.search.return_value = {
-        "tracks": {
-            "items": [
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/search"
+        assert request.headers["Authorization"] == "Bearer token"
+        return search_response(
+            [
                 {
                     "name": "Song",
                     "artists": [{"name": "Artist"}],
@@ -25,32 +36,40 @@ async def test_spotify_provider_search_track(mock_spotipy):
                     "uri": "spotify:track:123",
                 }
             ]
-        }
-    }
+        )
 
-    provider = SpotifyProvider(auth_token="token")
+    provider = make_provider(handler)
     result = await provider.search_track("Artist", "Song")
     assert result is not None
     assert result["uri"] == "spotify:track:123"
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_create_playlist(mock_spotipy):
+async def test_spotify_provider_create_playlist():
     """Test SpotifyProvider create_playlist."""
-    mock_spotipy.user_playlist_create.return_value = {"id": "pl_id"}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/v1/me":
+            return httpx.Response(200, json={"id": "user_id"})
+        assert json.loads(request.content)["name"] == "My List"
+        return httpx.Response(201, json={"id": "pl_id"})
 
-    provider = SpotifyProvider(auth_token="token")
+    provider = make_provider(handler)
     pl_id = await provider.create_playlist("My List")
     assert pl_id == "pl_id"
-    mock_spotipy.user_playlist_create.assert_called_once()
+    assert calls == [("GET", "/v1/me"), ("POST", "/v1/users/user_id/playlists")]
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_search_track_with_album(mock_spotipy):
+async def test_spotify_provider_search_track_with_album():
     """Test search_track with album."""
-    mock_spotipy.search.return_value = {
-        "tracks": {
-            "items": [
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["limit"] == "1"
+        return search_response(
+            [
                 {
                     "name": "Song",
                     "artists": [{"name": "Artist"}],
@@ -58,29 +77,28 @@ async def test_spotify_provider_search_track_with_album(mock_spotipy):
                     "uri": "spotify:track:album",
                 }
             ]
-        }
-    }
-    provider = SpotifyProvider(auth_token="token")
+        )
+
+    provider = make_provider(handler)
     result = await provider.search_track("Artist", "Song", album="Album")
     assert result is not None
     assert result["uri"] == "spotify:track:album"
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_search_track_no_results(mock_spotipy):
+async def test_spotify_provider_search_track_no_results():
     """Test search_track with no results."""
-    mock_spotipy.search.return_value = {"tracks": {"items": []}}
-    provider = SpotifyProvider(auth_token="token")
+    provider = make_provider(lambda request: search_response([]))
     uri = await provider.search_track("Artist", "Song")
     assert uri is None
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_search_track_no_version_pref(mock_spotipy):
+async def test_spotify_provider_search_track_no_version_pref():
     """Test search_track with no version preference."""
-    mock_spotipy.search.return_value = {
-        "tracks": {
-            "items": [
+    provider = make_provider(
+        lambda request: search_response(
+            [
                 {
                     "name": "Song",
                     "artists": [{"name": "Artist"}],
@@ -88,9 +106,8 @@ async def test_spotify_provider_search_track_no_version_pref(mock_spotipy):
                     "uri": "spotify:track:studio",
                 }
             ]
-        }
-    }
-    provider = SpotifyProvider(auth_token="token")
+        )
+    )
     # No version passed, should prefer studio
     result = await provider.search_track("Artist", "Song")
     assert result is not None
@@ -98,11 +115,11 @@ async def test_spotify_provider_search_track_no_version_pref(mock_spotipy):
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_search_track_low_score(mock_spotipy):
+async def test_spotify_provider_search_track_low_score():
     """Test search_track with low score."""
-    mock_spotipy.search.return_value = {
-        "tracks": {
-            "items": [
+    provider = make_provider(
+        lambda request: search_response(
+            [
                 {
                     "name": "Different",
                     "artists": [{"name": "Other"}],
@@ -110,16 +127,291 @@ async def test_spotify_provider_search_track_low_score(mock_spotipy):
                     "uri": "spotify:track:low",
                 }
             ]
-        }
-    }
-    provider = SpotifyProvider(auth_token="token")
+        )
+    )
     uri = await provider.search_track("Artist", "Song")
     assert uri is None
 
 
 @pytest.mark.asyncio
-async def test_spotify_provider_add_tracks(mock_spotipy):
-    """Test SpotifyProvider add_tracks_to_playlist."""
-    provider = SpotifyProvider(auth_token="token")
-    await provider.add_tracks_to_playlist("pl_id", ["uri:1"])
-    mock_spotipy.playlist_add_items.assert_called_once_with("pl_id", ["uri:1"])
+async def test_spotify_provider_search_tracks_scores_pages_in_one_batch():
+    """Test search_tracks keeps input order, scores every page in one call and maps failures to None."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        if "artist:Broken" in query:
+            return httpx.Response(500, json={"error": {"message": "boom"}})
+        if "album:" in query:
+            return search_response([])
+        name = query.split("track:")[1].split(" artist:")[0]
+        artist = query.split(" artist:")[1].split(" album:")[0]
+        return search_response(
+            [{"name": name, "artists": [{"name": artist}], "album": {"name": "X"}, "uri": f"spotify:track:{name}"}]
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = SpotifyProvider(auth_token="token", http_client=client, search_cache=SearchCache())
+    searched = []
+
+    async def on_searched():
+        searched.append(1)
+
+    queries = [
+        {"artist": "A", "track": "One"},
+        {"artist": "Broken", "track": "Two"},
+        {"artist": "C", "track": "Three", "album": "Missing"},
+    ]
+    with patch("backend.core.providers.spotify.score_candidate_pages", wraps=scoring.score_candidate_pages) as batch:
+        results = await provider.search_tracks(queries, concurrency=2, on_searched=on_searched)
+
+    assert [r["uri"] if r else None for r in results] == ["spotify:track:One", None, "spotify:track:Three"]
+    assert batch.call_count == 1
+    assert len(batch.call_args.args[1]) == 2
+    assert len(searched) == 3
+    # Resolved matches are cached like search_track's
+    assert await provider.search_track("A", "One") == results[0]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_search_tracks_bounds_concurrency():
+    """Test no more than `concurrency` searches run at once."""
+    provider = SpotifyProvider(auth_token="token", http_client=httpx.AsyncClient(), search_cache=SearchCache())
+    in_flight = peak = 0
+
+    async def search_pages(artist, track, album=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"uri": f"spotify:track:{track}"}, []
+
+    with patch.object(provider, "_search_pages", side_effect=search_pages):
+        results = await provider.search_tracks([{"artist": "A", "track": str(i)} for i in range(10)], concurrency=3)
+
+    assert peak == 3
+    assert [r["uri"] for r in results] == [f"spotify:track:{i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_add_tracks():
+    """Test SpotifyProvider add_tracks_to_playlist batches by 100."""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        assert request.url.path == "/v1/playlists/pl_id/tracks"
+        bodies.append(json.loads(request.content)["uris"])
+        return httpx.Response(201, json={"snapshot_id": "snap"})
+
+    provider = make_provider(handler)
+    await provider.add_tracks_to_playlist("pl_id", [f"uri:{i}" for i in range(150)])
+    assert [len(b) for b in bodies] == [100, 50]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_get_tracks_batches_by_50():
+    """Test get_tracks fetches known URIs 50 IDs at a time and skips unknown tracks."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "GET"
+        assert request.url.path == "/v1/tracks"
+        ids = request.url.params["ids"].split(",")
+        requested.append(ids)
+        tracks = [
+            (
+                None
+                if track_id == "gone"
+                else {
+                    "name": f"Song {track_id}",
+                    "artists": [{"name": "A"}, {"name": "B"}],
+                    "album": {"name": "Album"},
+                    "uri": f"spotify:track:{track_id}",
+                    "duration_ms": 1000,
+                }
+            )
+            for track_id in ids
+        ]
+        return httpx.Response(200, json={"tracks": tracks})
+
+    provider = make_provider(handler)
+    uris = [f"spotify:track:{i}" for i in range(119)] + ["spotify:track:gone", "spotify:track:0", "local:track:x"]
+    found = await provider.get_tracks(uris)
+
+    # Duplicates and non-Spotify URIs are never requested
+    assert [len(ids) for ids in requested] == [50, 50, 20]
+    assert len(found) == 119
+    assert "spotify:track:gone" not in found
+    assert found["spotify:track:7"] == {
+        "artist": "A, B",
+        "track": "Song 7",
+        "album": "Album",
+        "uri": "spotify:track:7",
+        "duration_ms": 1000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_replace_tracks():
+    """Test replace_playlist_tracks replaces the first batch and appends the rest."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, len(json.loads(request.content)["uris"])))
+        return httpx.Response(201, json={"snapshot_id": "snap"})
+
+    provider = make_provider(handler)
+    await provider.replace_playlist_tracks("pl_id", [f"uri:{i}" for i in range(120)])
+    assert calls == [("PUT", 100), ("POST", 20)]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_get_playlist_follows_next():
+    """Test get_playlist follows the tracks 'next' links."""
+    next_url = "https://api.spotify.com/v1/playlists/pl_id/tracks?offset=1&limit=1"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/playlists/pl_id":
+            return httpx.Response(
+                200,
+                json={"name": "PL", "tracks": {"items": [{"track": {"uri": "a"}}], "next": next_url}},
+            )
+        return httpx.Response(200, json={"items": [{"track": {"uri": "b"}}], "next": None})
+
+    provider = make_provider(handler)
+    data = await provider.get_playlist("pl_id")
+    assert [i["track"]["uri"] for i in data["tracks"]["items"]] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_get_playlist_fetches_pages_in_parallel():
+    """Test get_playlist requests every remaining offset once the first page reports the total."""
+    offsets = []
+    requested_fields = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_fields.append(request.url.params["fields"])
+        if request.url.path == "/v1/playlists/pl_id":
+            items = [{"track": {"uri": f"u{i}"}} for i in range(100)]
+            return httpx.Response(
+                200,
+                json={
+                    "name": "PL",
+                    "tracks": {"items": items, "next": "next-url", "total": 350, "limit": 100, "offset": 0},
+                },
+            )
+        assert request.url.path == "/v1/playlists/pl_id/tracks"
+        offset = int(request.url.params["offset"])
+        assert request.url.params["limit"] == "100"
+        offsets.append(offset)
+        items = [{"track": {"uri": f"u{i}"}} for i in range(offset, min(offset + 100, 350))]
+        return httpx.Response(200, json={"items": items, "next": None})
+
+    provider = make_provider(handler)
+    data = await provider.get_playlist("pl_id")
+
+    assert sorted(offsets) == [100, 200, 300]
+    assert requested_fields == [playlist_fields("import")] + [tracks_page_fields("import")] * 3
+    assert [i["track"]["uri"] for i in data["tracks"]["items"]] == [f"u{i}" for i in range(350)]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_snapshot_fetches_pages_in_parallel():
+    """Test get_playlist_snapshot keeps the URI-only projection on every page."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/playlists/pl_id":
+            assert "total" in request.url.params["fields"]
+            tracks = {"items": [{"track": {"uri": "a"}}], "next": "n", "total": 3, "limit": 1, "offset": 0}
+            return httpx.Response(200, json={"snapshot_id": "snap", "tracks": tracks})
+        assert request.url.params["fields"] == "total,limit,offset,next,items(track(uri))"
+        offset = int(request.url.params["offset"])
+        return httpx.Response(200, json={"items": [{"track": {"uri": "abc"[offset]}}]})
+
+    provider = make_provider(handler)
+    assert await provider.get_playlist_snapshot("pl_id") == ("snap", ["a", "b", "c"])
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_sync_playlist_tracks_diff():
+    """Test sync_playlist_tracks sends only the diff, chaining snapshot_id between writes."""
+    remote = [{"track": {"uri": f"uri:{i}"}} for i in range(250)]
+    writes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            assert request.url.params["fields"].startswith("snapshot_id")
+            return httpx.Response(200, json={"snapshot_id": "snap0", "tracks": {"items": remote, "next": None}})
+        writes.append((request.method, json.loads(request.content)))
+        return httpx.Response(200, json={"snapshot_id": f"snap{len(writes)}"})
+
+    provider = make_provider(handler)
+    desired = [f"uri:{i}" for i in range(250) if i != 10] + ["uri:new"]
+    await provider.sync_playlist_tracks("pl_id", desired)
+
+    assert writes == [
+        ("DELETE", {"tracks": [{"uri": "uri:10"}], "snapshot_id": "snap0"}),
+        ("POST", {"uris": ["uri:new"], "position": 249}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_sync_playlist_tracks_falls_back_to_replace():
+    """Test sync_playlist_tracks replaces the playlist when the diff would cost more."""
+    writes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            items = [{"track": {"uri": uri}} for uri in ("a", "b", "c")]
+            return httpx.Response(200, json={"snapshot_id": "snap0", "tracks": {"items": items, "next": None}})
+        writes.append((request.method, json.loads(request.content)))
+        return httpx.Response(200, json={"snapshot_id": "snap1"})
+
+    provider = make_provider(handler)
+    await provider.sync_playlist_tracks("pl_id", ["c", "b", "a"])
+    assert writes == [("PUT", {"uris": ["c", "b", "a"]})]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_sync_playlist_tracks_replaces_when_tracks_are_unavailable():
+    """Test track-less items keep their slot in the snapshot and force a full replace on sync."""
+    writes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            items = [{"track": {"uri": "a"}}, {"track": None}, {"track": {"uri": "b"}}]
+            return httpx.Response(200, json={"snapshot_id": "snap0", "tracks": {"items": items, "next": None}})
+        writes.append((request.method, json.loads(request.content)))
+        return httpx.Response(200, json={"snapshot_id": "snap1"})
+
+    provider = make_provider(handler)
+    assert await provider.get_playlist_snapshot("pl_id") == ("snap0", ["a", None, "b"])
+
+    await provider.sync_playlist_tracks("pl_id", ["a", "b", "c"])
+    assert writes == [("PUT", {"uris": ["a", "b", "c"]})]
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_retries_rate_limit():
+    """Test that 429 responses are retried through rate_limit_retry."""
+    from unittest.mock import patch, AsyncMock
+
+    responses = [
+        httpx.Response(429, json={"error": {"status": 429, "message": "rate limited"}}),
+        httpx.Response(200, json={"id": "user_id"}),
+    ]
+    provider = make_provider(lambda request: responses.pop(0))
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        assert await provider.get_user_id() == "user_id"
+    assert not responses
+
+
+@pytest.mark.asyncio
+async def test_spotify_provider_raises_spotify_exception():
+    """Test that API errors surface as SpotifyException with the HTTP status."""
+    provider = make_provider(lambda request: httpx.Response(404, json={"error": {"message": "Not found"}}))
+    with pytest.raises(SpotifyException) as excinfo:
+        await provider.get_playlist("missing")
+    assert excinfo.value.http_status == 404
@@ -0,0 +1,129 @@
+import pytest
+from backend.core.utils.helpers import _determine_version, _similarity
+from backend.core.utils.scoring import (
+    best_candidate_index,
+    builder_version_bonus,
+    provider_version_bonus,
+    score_candidate_pages,
+    score_candidates,
+)
+
+
+def make_item(name, album, *artists):
+    return {
+        "name": name,
+        "artists": [{"name": a} for a in artists],
+        "album": {"name": album},
+        "uri": f"spotify:track:{name}",
+    }
+
+
+CANDIDATES = [
+    make_item("Dreams", "Rumours", "Fleetwood Mac"),
+    make_item("Dreams - 2004 Remaster", "Rumours (Remastered)", "Fleetwood Mac"),
+    make_item("Dreams - Live", "Live in Boston", "Fleetwood Mac"),
+    make_item("Dreams (Remix)", "Club Hits", "DJ Someone", "Fleetwood Mac"),
+    make_item("Dreams", "Greatest Hits", "Fleetwood Mac"),
+    make_item("Dreams - Acoustic", "Unplugged", "Cover Band"),
+    make_item("Dreams (Instrumental)", "Karaoke", "Various Artists"),
+]
+
+
+def reference_builder_score(artist, track, item, album=None, version=None):
+    """The original per-candidate loop from SpotifyPlaylistBuilder.search_track."""
+    score = 0.0
+    score += max(_similarity(artist, a["name"]) for a in item["artists"]) * 30
+    score += _similarity(track, item["name"]) * 40
+    if album:
+        score += _similarity(album, item["album"]["name"]) * 30
+    else:
+        detected = _determine_version(item["name"], item["album"]["name"])
+        if version in ["live", "remix", "compilation", "remaster", "instrumental", "acoustic"]:
+            score += 30 if detected == version else 5
+        elif version == "original":
+            score += 30 if detected == "studio" else 10 if detected == "remaster" else 5
+        else:
+            score += 30 if detected == "studio" else 20 if detected == "remaster" else 10
+    return score
+
+
+def reference_provider_score(artist, track, item, version=None):
+    """The original per-candidate loop from SpotifyProvider.search_track."""
+    score = 0.0
+    score += max(_similarity(artist, a["name"]) for a in item["artists"]) * 30
+    score += _similarity(track, item["name"]) * 40
+    detected = _determine_version(item["name"], item["album"]["name"])
+    if version == detected:
+        score += 30
+    elif not version and detected == "studio":
+        score += 30
+    return score
+
+
+VERSIONS = [None, "studio", "live", "remix", "compilation", "remaster", "instrumental", "acoustic", "original"]
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_builder_scores_match_reference(version):
+    """Test batch scores equal the original builder loop for every version preference."""
+    scores = score_candidates("Fleetwood Mac", "Dreams", CANDIDATES, version=version)
+    expected = [reference_builder_score("Fleetwood Mac", "Dreams", c, version=version) for c in CANDIDATES]
+    assert scores.tolist() == expected
+
+
+def test_builder_scores_with_album_match_reference():
+    """Test album similarity replaces the version preference when an album is given."""
+    scores = score_candidates("Fleetwood Mac", "Dreams", CANDIDATES, album="Rumours")
+    expected = [reference_builder_score("Fleetwood Mac", "Dreams", c, album="Rumours") for c in CANDIDATES]
+    assert scores.tolist() == expected
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_provider_scores_match_reference(version):
+    """Test batch scores equal the original provider loop."""
+    scores = score_candidates(
+        "Fleetwood Mac", "Dreams", CANDIDATES, version=version, version_bonus=provider_version_bonus
+    )
+    expected = [reference_provider_score("Fleetwood Mac", "Dreams", c, version=version) for c in CANDIDATES]
+    assert scores.tolist() == expected
+
+
+def test_score_candidate_pages_matches_per_page_scoring():
+    """Test scoring many queries at once equals scoring each page on its own."""
+    queries = [
+        {"artist": "Fleetwood Mac", "track": "Dreams", "version": "live"},
+        {"artist": "Nobody", "track": "Nothing"},
+        {"artist": "Fleetwood Mac", "track": "Dreams", "album": "Rumours"},
+    ]
+    pages = [CANDIDATES, [], CANDIDATES[:3]]
+    batched = score_candidate_pages(queries, pages)
+
+    assert [len(s) for s in batched] == [7, 0, 3]
+    for query, page, scores in zip(queries, pages, batched):
+        single = score_candidates(
+            query["artist"], query["track"], page, album=query.get("album"), version=query.get("version")
+        )
+        assert scores.tolist() == single.tolist()
+
+
+def test_score_candidate_pages_empty():
+    """Test scoring with no candidates at all."""
+    assert [len(s) for s in score_candidate_pages([{"artist": "A", "track": "B"}], [[]])] == [0]
+
+
+def test_best_candidate_index():
+    """Test the first top score wins and the threshold is exclusive."""
+    import numpy as np
+
+    assert best_candidate_index(np.array([50.0, 90.0, 90.0])) == 1
+    assert best_candidate_index(np.array([60.0])) is None
+    assert best_candidate_index(np.array([])) is None
+
+
+def test_version_bonus_tables():
+    """Spot-check the version preference weights."""
+    assert builder_version_bonus(None, "remaster") == 20
+    assert builder_version_bonus("original", "remaster") == 10
+    assert builder_version_bonus("live", "studio") == 5
+    assert provider_version_bonus("live", "live") == 30
+    assert provider_version_bonus("original", "studio") == 0
@@ -0,0 +1,214 @@
+import json
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.core.search_cache import SearchCache, slim_track
+from backend.core.providers.spotify import SpotifyProvider
+
+
+def test_make_key_normalizes_parts():
+    """Test that case and whitespace differences map to the same key."""
+    assert SearchCache.make_key("builder", "The  Beatles", "Help!", None, None) == SearchCache.make_key(
+        "builder", "the beatles ", "HELP!", None, None
+    )
+    assert SearchCache.make_key("builder", "A", "B") != SearchCache.make_key("provider", "A", "B")
+
+
+def test_local_tier_hit_and_negative_cache():
+    """Test that values and misses are both cached."""
+    cache = SearchCache()
+    assert cache.get("k") == (False, None)
+
+    cache.set("k", "uri:1")
+    cache.set("miss", None)
+
+    assert cache.get("k") == (True, "uri:1")
+    assert cache.get("miss") == (True, None)
+
+
+def test_local_tier_ttl_expiry():
+    """Test that entries expire after their TTL, with misses using the shorter negative TTL."""
+    cache = SearchCache(ttl=100, negative_ttl=10)
+    with patch("backend.core.search_cache.time.monotonic", return_value=1000.0):
+        cache.set("hit", "uri:1")
+        cache.set("miss", None)
+    with patch("backend.core.search_cache.time.monotonic", return_value=1050.0):
+        assert cache.get("hit") == (True, "uri:1")
+        assert cache.get("miss") == (False, None)
+    with patch("backend.core.search_cache.time.monotonic", return_value=1200.0):
+        assert cache.get("hit") == (False, None)
+
+
+def test_local_tier_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = SearchCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+
+
+def test_invalidate_track():
+    """Test invalidation drops resolved entries for every namespace."""
+    cache = SearchCache()
+    builder_key = cache.make_key("builder", "Artist", "Song", None, None)
+    provider_key = cache.make_key("provider", "Artist", "Song", None, None)
+    cache.set(builder_key, "uri:1")
+    cache.set(provider_key, {"uri": "uri:1"})
+
+    cache.invalidate("artist", "song")
+
+    assert cache.get(builder_key) == (False, None)
+    assert cache.get(provider_key) == (False, None)
+
+
+def test_redis_tier_read_through_and_write():
+    """Test the shared tier is consulted on local misses and written on set."""
+    cache = SearchCache(redis_url="redis://localhost:6379", ttl=60, negative_ttl=5)
+    redis_client = MagicMock()
+    redis_client.get.return_value = json.dumps({"v": "uri:remote"})
+    cache._redis = redis_client
+
+    assert cache.get("k") == (True, "uri:remote")
+    # Promoted to the local tier
+    redis_client.get.reset_mock()
+    assert cache.get("k") == (True, "uri:remote")
+    redis_client.get.assert_not_called()
+
+    cache.set("miss", None)
+    redis_client.set.assert_called_with("miss", json.dumps({"v": None}), ex=5)
+
+
+def test_redis_tier_errors_are_misses():
+    """Test that Redis failures degrade to cache misses instead of raising."""
+    cache = SearchCache(redis_url="redis://localhost:6379")
+    redis_client = MagicMock()
+    redis_client.get.side_effect = ConnectionError("down")
+    redis_client.set.side_effect = ConnectionError("down")
+    cache._redis = redis_client
+
+    assert cache.get("k") == (False, None)
+    cache.set("k", "uri:1")
+    assert cache.get("k") == (True, "uri:1")
+
+
+@pytest.mark.asyncio
+async def test_async_redis_tier():
+    """Test the async accessors use the async Redis client."""
+    cache = SearchCache(redis_url="redis://localhost:6379")
+    aredis = MagicMock()
+    aredis.get = AsyncMock(return_value=None)
+    aredis.set = AsyncMock()
+    aredis.delete = AsyncMock()
+    cache._aredis = aredis
+
+    assert await cache.aget("k") == (False, None)
+    await cache.aset("k", {"uri": "uri:1"})
+    aredis.set.assert_called_once()
+    assert await cache.aget("k") == (True, {"uri": "uri:1"})
+
+    await cache.ainvalidate("Artist", "Song")
+    aredis.delete.assert_called_once()
+
+
+def test_slim_track_keeps_matching_fields():
+    """Test candidate pages are trimmed to the fields used for scoring."""
+    item = {
+        "name": "Song",
+        "artists": [{"name": "Artist", "id": "a1", "href": "x"}],
+        "album": {"name": "Album", "images": [{"url": "y"}]},
+        "uri": "spotify:track:1",
+        "duration_ms": 1000,
+        "available_markets": ["US"],
+    }
+    assert slim_track(item) == {
+        "name": "Song",
+        "artists": [{"name": "Artist"}],
+        "album": {"name": "Album"},
+        "uri": "spotify:track:1",
+        "duration_ms": 1000,
+    }
+
+
+def test_builder_search_track_uses_cache(builder):
+    """Test that repeated builder searches for the same track skip the Spotify API."""
+    builder.sp.search.return_value = {
+        "tracks": {
+            "items": [
+                {
+                    "name": "Song",
+                    "artists": [{"name": "Artist"}],
+                    "album": {"name": "Album"},
+                    "uri": "spotify:track:1",
+                }
+            ]
+        }
+    }
+    assert builder.search_track("Artist", "Song") == "spotify:track:1"
+    assert builder.search_track("artist", "song ") == "spotify:track:1"
+    assert builder.sp.search.call_count == 1
+
+
+def test_builder_search_track_searches_again_after_invalidate(builder):
+    """Test invalidation also drops the candidate pages, so the next lookup re-queries Spotify."""
+    builder.sp.search.return_value = {
+        "tracks": {
+            "items": [{"name": "Song", "artists": [{"name": "Artist"}], "album": {"name": "Album"}, "uri": "u:1"}]
+        }
+    }
+    assert builder.search_track("Artist", "Song", album="Album") == "u:1"
+    builder.search_cache.invalidate("Artist", "Song", album="Album")
+
+    builder.sp.search.return_value = {
+        "tracks": {
+            "items": [{"name": "Song", "artists": [{"name": "Artist"}], "album": {"name": "Album"}, "uri": "u:2"}]
+        }
+    }
+    assert builder.search_track("Artist", "Song", album="Album") == "u:2"
+    assert builder.sp.search.call_count == 2
+
+
+def test_builder_search_track_caches_misses(builder):
+    """Test that a track with no match is not searched again."""
+    builder.sp.search.return_value = {"tracks": {"items": []}}
+    assert builder.search_track("Nobody", "Nothing") is None
+    assert builder.search_track("Nobody", "Nothing") is None
+    assert builder.sp.search.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_search_track_uses_cache():
+    """Test that the async provider serves repeat searches from the cache."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        return httpx.Response(
+            200,
+            json={
+                "tracks": {
+                    "items": [
+                        {
+                            "name": "Song",
+                            "artists": [{"name": "Artist"}],
+                            "album": {"name": "Album"},
+                            "uri": "spotify:track:1",
+                        }
+                    ]
+                }
+            },
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = SpotifyProvider(auth_token="token", http_client=client, search_cache=SearchCache())
+
+    first = await provider.search_track("Artist", "Song")
+    second = await provider.search_track("Artist", "Song")
+
+    assert first == second
+    assert first is not None and first["uri"] == "spotify:track:1"
+    assert len(calls) == 1
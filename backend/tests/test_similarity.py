@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import patch
+from backend.core.utils import similarity
+from backend.core.utils.helpers import _similarity
+from backend.core.utils.similarity import (
+    SIMILARITY_ENGINES,
+    bigram_similarity,
+    difflib_similarity,
+    resolve_engine,
+    set_similarity_engine,
+)
+
+PAIRS = [
+    ("Fleetwood Mac", "Fleetwood Mac"),
+    ("Dreams", "Dreams - 2004 Remaster"),
+    ("The Beatles", "Various Artists"),
+    ("abc", "xyz"),
+    ("", ""),
+    ("A", "a"),
+]
+
+
+@pytest.fixture
+def restore_engine():
+    yield
+    similarity._active_engine = None
+
+
+@pytest.mark.parametrize("name", sorted(SIMILARITY_ENGINES))
+def test_engines_score_in_unit_range(name):
+    """Test every registered engine returns difflib-compatible 0-1 scores."""
+    scorer = SIMILARITY_ENGINES[name]
+    for s1, s2 in PAIRS:
+        assert 0.0 <= scorer(s1, s2) <= 1.0
+    assert scorer("Test", "test") == 1.0
+    assert scorer("abc", "xyz") == 0.0
+
+
+def test_bigram_similarity_partial_match():
+    """Test the bigram scorer ranks closer strings higher."""
+    assert bigram_similarity("Dreams", "Dreams - Remaster") > bigram_similarity("Dreams", "Rhiannon")
+
+
+def test_rapidfuzz_tracks_difflib():
+    """Test the rapidfuzz engine stays close to the difflib reference scores."""
+    pytest.importorskip("rapidfuzz")
+    scorer = SIMILARITY_ENGINES["rapidfuzz"]
+    for s1, s2 in PAIRS:
+        assert abs(scorer(s1, s2) - difflib_similarity(s1, s2)) < 0.15
+
+
+def test_resolve_engine_auto_and_unknown():
+    """Test 'auto' prefers rapidfuzz and unknown names fall back to 'auto'."""
+    expected = SIMILARITY_ENGINES.get("rapidfuzz", difflib_similarity)
+    assert resolve_engine("auto") is expected
+    assert resolve_engine("nope") is expected
+    assert resolve_engine("bigram") is bigram_similarity
+
+
+def test_resolve_engine_without_rapidfuzz():
+    """Test 'auto' falls back to difflib when rapidfuzz is unavailable."""
+    engines = {k: v for k, v in SIMILARITY_ENGINES.items() if k != "rapidfuzz"}
+    with patch.dict(SIMILARITY_ENGINES, engines, clear=True):
+        assert resolve_engine("auto") is difflib_similarity
+
+
+def test_similarity_helper_uses_active_engine(restore_engine):
+    """Test _similarity delegates to the configured engine and custom engines can be plugged in."""
+    set_similarity_engine("difflib")
+    assert _similarity("hello world", "hello") == difflib_similarity("hello world", "hello")
+
+    set_similarity_engine(lambda s1, s2: 0.5)
+    assert _similarity("a", "b") == 0.5
+
+
+def test_similarity_engine_from_settings(restore_engine):
+    """Test the engine is picked from SIMILARITY_ENGINE on first use."""
+    similarity._active_engine = None
+    with patch("backend.app.core.config.settings.SIMILARITY_ENGINE", "bigram"):
+        assert similarity.get_similarity_engine() is bigram_similarity
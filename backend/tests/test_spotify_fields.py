@@ -0,0 +1,29 @@
+from backend.core.providers.spotify_fields import (
+    PLAYLIST_PROJECTIONS,
+    TRACK_PROJECTIONS,
+    playlist_fields,
+    tracks_page_fields,
+)
+
+
+def test_every_use_case_keeps_paging_keys():
+    """Test every projection keeps the keys the paginator needs."""
+    assert set(PLAYLIST_PROJECTIONS) <= set(TRACK_PROJECTIONS)
+    for use_case in TRACK_PROJECTIONS:
+        assert tracks_page_fields(use_case).startswith("total,limit,offset,next,items(")
+    for use_case in PLAYLIST_PROJECTIONS:
+        assert f"tracks({tracks_page_fields(use_case)})" in playlist_fields(use_case)
+
+
+def test_projections_match_read_paths():
+    """Test each use case asks only for the fields its caller reads."""
+    assert playlist_fields("uris") == "snapshot_id,tracks(total,limit,offset,next,items(track(uri)))"
+    assert "duration_ms" in tracks_page_fields("import")
+    assert "duration_ms" not in tracks_page_fields("export")
+    assert playlist_fields("import").startswith("name,description,public,")
+    # Heavy fields are never requested
+    requested = [tracks_page_fields(use_case) for use_case in TRACK_PROJECTIONS]
+    requested += [playlist_fields(use_case) for use_case in PLAYLIST_PROJECTIONS]
+    for fields in requested:
+        assert "images" not in fields
+        assert "available_markets" not in fields
@@ -1,4 +1,5 @@
 import pytest
+import httpx
 from unittest.mock import MagicMock, patch
 from backend.core.providers.spotify import SpotifyProvider
 from spotipy.exceptions import SpotifyException
@@ -8,18 +9,18 @@ from backend.app.services.integrations_service import IntegrationsService
 from backend.app.models.service_connection import ServiceConnection
 
 
-@patch("backend.core.providers.spotify.spotipy.Spotify")
-def test_spotify_provider_init_failure(mock_spotify_cls):
-    """Test that SpotifyProvider handles initialization failure gracefully."""
-    mock_spotify = MagicMock()
-    mock_spotify_cls.return_value = mock_spotify
+@pytest.mark.asyncio
+async def test_spotify_provider_init_failure():
+    """Test that SpotifyProvider surfaces authentication failures as SpotifyException."""
 
-    # Simulate an expired token or other API error
-    mock_spotify.current_user.side_effect = SpotifyException(401, -1, "The access token expired")
+    # Simulate an expired token
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"error": {"status": 401, "message": "The access token expired"}})
 
-    provider = SpotifyProvider(auth_token="expired_token")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = SpotifyProvider(auth_token="expired_token", http_client=client)
     with pytest.raises(SpotifyException) as excinfo:
-        _ = provider.user_id
+        await provider.get_user_id()
 
     assert excinfo.value.http_status == 401
     assert "The access token expired" in str(excinfo.value)
@@ -41,15 +42,21 @@ def test_spotify_builder_init_failure(mock_spotify_cls):
     assert "Failed to authenticate with Spotify" in str(excinfo.value)
 
 
-@patch("backend.core.providers.spotify.spotipy.Spotify")
-def test_spotify_provider_init_success(mock_spotify_cls):
-    """Test that SpotifyProvider initializes correctly with a valid token."""
-    mock_spotify = MagicMock()
-    mock_spotify_cls.return_value = mock_spotify
-    mock_spotify.current_user.return_value = {"id": "test_user_id"}
+@pytest.mark.asyncio
+async def test_spotify_provider_init_success():
+    """Test that SpotifyProvider resolves and caches the user ID with a valid token."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        assert request.headers["Authorization"] == "Bearer valid_token"
+        return httpx.Response(200, json={"id": "test_user_id"})
 
-    provider = SpotifyProvider(auth_token="valid_token")
-    assert provider.user_id == "test_user_id"
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = SpotifyProvider(auth_token="valid_token", http_client=client)
+    assert await provider.get_user_id() == "test_user_id"
+    assert await provider.get_user_id() == "test_user_id"
+    assert calls == ["/v1/me"]
 
 
 @pytest.mark.asyncio
@@ -186,28 +193,9 @@ async def test_integrations_service_token_refresh_api_error():
 
 
 @pytest.mark.asyncio
-@patch("backend.core.providers.spotify.spotipy.Spotify")
-async def test_spotify_provider_get_playlist_error(mock_spotify_cls):
-    mock_spotify = MagicMock()
-    mock_spotify_cls.return_value = mock_spotify
-    mock_spotify.playlist.side_effect = Exception("PL Error")
-
-    provider = SpotifyProvider(auth_token="token")
-    # Wrap in try/except or modify implementation to catch error
-    # The implementation doesn't seem to catch error?
-    # Wait, the previous failing test showed assertions error: <coroutine ...> == {}
-    # That means it DID return a coroutine, but I didn't await it.
-    # But if I await it, will it raise exception or return empty dict?
-    # backend/core/providers/spotify.py:get_playlist calls self.sp.playlist(playlist_id).
-    # If self.sp.playlist raises, get_playlist raises.
-    # The test expects empty dict. This implies get_playlist should handle exception or the test
-    # expects exception.
-    # Let's check implementation again.
-    # implementation:
-    # async def get_playlist(self, playlist_id: str) -> dict:
-    #     results = self.sp.playlist(playlist_id) ...
-    # No try/except block. So it will raise.
-    # So I should assert raises.
-
-    with pytest.raises(Exception, match="PL Error"):
+async def test_spotify_provider_get_playlist_error():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500, text="PL Error")))
+    provider = SpotifyProvider(auth_token="token", http_client=client)
+
+    with pytest.raises(SpotifyException, match="PL Error"):
         await provider.get_playlist("pl_id")
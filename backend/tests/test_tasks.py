@@ -1,23 +1,6 @@
 from unittest.mock import MagicMock, patch, AsyncMock
 from backend.app.core.tasks import create_playlist_task
-
-# --- Shared Mocks for Spotify ---
-
-
-class MockSpotifyClient:
-    """Mocks the spotipy.Spotify client for testing."""
-
-    def __init__(self, auth=None, **kwargs):
-        self.auth = auth
-        self.current_user = MagicMock(return_value={"id": "mock_user_id"})
-        self.user_playlist_create = MagicMock(return_value={"id": "pl_id"})
-        # Mock methods used in the provider to prevent network calls/validation failures
-        self.playlist_replace_items = MagicMock()
-        self.playlist_add_items = MagicMock()
-
-
-# Patch the constructor of spotipy.Spotify itself
-patch_spotipy_client = patch("backend.core.providers.spotify.spotipy.Spotify", new=MockSpotifyClient)
+from backend.core.build_engine import ProgressCallback
 
 # --- Test Functions ---
 
@@ -25,21 +8,17 @@ patch_spotipy_client = patch("backend.core.providers.spotify.spotipy.Spotify", n
 async def test_create_playlist_task():
     """Test the create_playlist_task background worker."""
 
-    with patch_spotipy_client:
-        with patch("backend.app.core.tasks.SpotifyProvider") as mock_provider_cls:
-            mock_provider = MagicMock()
+    with patch("backend.app.core.tasks.SpotifyProvider") as mock_provider_cls:
+        mock_provider = MagicMock()
+        mock_provider.create_playlist = AsyncMock(return_value="pl_id")
+        mock_provider.add_tracks_to_playlist = AsyncMock()
+        mock_provider_cls.return_value = mock_provider
 
-            # The mocked SpotifyProvider should now use the MockSpotifyClient internally,
-            # but we need to mock the async methods it calls on itself.
-            mock_provider.create_playlist = AsyncMock(return_value="pl_id")
-            mock_provider.add_tracks_to_playlist = AsyncMock()
-            mock_provider_cls.return_value = mock_provider
+        pl_id = await create_playlist_task("My Task Playlist", ["uri:1"], "token")
 
-            pl_id = await create_playlist_task("My Task Playlist", ["uri:1"], "token")
-
-            assert pl_id == "pl_id"
-            mock_provider.create_playlist.assert_called_once_with("My Task Playlist")
-            mock_provider.add_tracks_to_playlist.assert_called_once_with("pl_id", ["uri:1"])
+        assert pl_id == "pl_id"
+        mock_provider.create_playlist.assert_called_once_with("My Task Playlist")
+        mock_provider.add_tracks_to_playlist.assert_called_once_with("pl_id", ["uri:1"])
 
 
 async def test_purge_deleted_playlists_task():
@@ -104,25 +83,24 @@ async def test_sync_playlist_task_success():
     mock_session.__aenter__ = AsyncMock(return_value=mock_session)
     mock_session.__aexit__ = AsyncMock(return_value=None)
 
-    with patch_spotipy_client:
-        with (
-            patch("backend.app.core.tasks.async_session_maker", return_value=mock_session),
-            patch(
-                "backend.app.core.tasks.IntegrationsService.get_valid_spotify_token",
-                new=AsyncMock(return_value="valid_token"),
-            ),
-            patch("backend.app.core.tasks.SpotifyProvider") as MockProviderCls,
-        ):
-            mock_provider = MockProviderCls.return_value
-            mock_provider.replace_playlist_tracks = AsyncMock()
+    with (
+        patch("backend.app.core.tasks.async_session_maker", return_value=mock_session),
+        patch(
+            "backend.app.core.tasks.IntegrationsService.get_valid_spotify_token",
+            new=AsyncMock(return_value="valid_token"),
+        ),
+        patch("backend.app.core.tasks.SpotifyProvider") as MockProviderCls,
+    ):
+        mock_provider = MockProviderCls.return_value
+        mock_provider.sync_playlist_tracks = AsyncMock()
 
-            result = await sync_playlist_task(mock_playlist.id)
+        result = await sync_playlist_task(mock_playlist.id)
 
-            assert "Sync successful" in result
-            mock_provider.replace_playlist_tracks.assert_called_once_with("sp_id_123", ["spotify:track:123"])
-            # Check if last_synced_at was updated (rough check for call, logic is in task)
-            assert mock_playlist.last_synced_at is not None
-            mock_session.commit.assert_called_once()
+        assert "Sync successful" in result
+        mock_provider.sync_playlist_tracks.assert_called_once_with("sp_id_123", ["spotify:track:123"])
+        # Check if last_synced_at was updated (rough check for call, logic is in task)
+        assert mock_playlist.last_synced_at is not None
+        mock_session.commit.assert_called_once()
 
 
 async def test_periodic_sync_dispatch_task():
@@ -162,3 +140,92 @@ async def test_periodic_sync_dispatch_task():
         mock_task.kiq.assert_any_call(pl1_id)
         mock_task.kiq.assert_any_call(pl2_id)
         assert mock_task.kiq.call_count == 2
+
+
+async def test_build_playlist_task_success():
+    """Test build_playlist_task runs the build, records the result and links the saved playlist."""
+    from backend.app.core.tasks import build_playlist_task
+    from backend.app.models.build_job import BuildJob
+    from backend.app.models.playlist import Playlist
+    import uuid
+
+    job = BuildJob(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        playlist_id=uuid.uuid4(),
+        status="pending",
+        total=1,
+        processed=0,
+        request_json={"name": "Job", "description": "", "public": False, "tracks": [{"artist": "A", "track": "T"}]},
+    )
+    playlist = Playlist(id=job.playlist_id, user_id=job.user_id, name="Job", content_json={"tracks": []})
+
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(side_effect=[job, playlist])
+    mock_session.execute = AsyncMock()
+    mock_session.commit = AsyncMock()
+    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session.__aexit__ = AsyncMock(return_value=None)
+
+    async def fake_build(
+        provider, name, description, tracks, public=False, on_progress: ProgressCallback | None = None
+    ):
+        assert on_progress is not None
+        await on_progress(1, 1)
+        return {
+            "status": "success",
+            "playlist_id": "sp_1",
+            "url": "https://open.spotify.com/playlist/sp_1",
+            "failed_tracks": [],
+            "actual_tracks": [{"artist": "A", "track": "T", "uri": "u1", "duration_ms": 10}],
+            "total_duration_ms": 10,
+            "tracks": [{"artist": "A", "track": "T", "uri": "u1", "duration_ms": 10, "provider": "spotify"}],
+        }
+
+    with (
+        patch("backend.app.core.tasks.async_session_maker", return_value=mock_session),
+        patch(
+            "backend.app.core.tasks.IntegrationsService.get_valid_spotify_token",
+            new=AsyncMock(return_value="valid_token"),
+        ),
+        patch("backend.app.core.tasks.build_playlist", side_effect=fake_build),
+    ):
+        result = await build_playlist_task(job.id)
+
+    assert "Build successful" in result
+    assert job.status == "completed"
+    assert job.processed == 1
+    assert job.result_json is not None
+    assert job.result_json["playlist_id"] == "sp_1"
+    assert "tracks" not in job.result_json
+    assert playlist.status == "transmitted"
+    assert playlist.provider_id == "sp_1"
+    assert playlist.content_json["tracks"][0]["uri"] == "u1"
+
+
+async def test_build_playlist_task_failure_marks_job_failed():
+    """Test a failing build is recorded on the job instead of raising."""
+    from backend.app.core.tasks import build_playlist_task
+    from backend.app.models.build_job import BuildJob
+    import uuid
+
+    job = BuildJob(id=uuid.uuid4(), user_id=uuid.uuid4(), status="pending", total=0, processed=0, request_json={})
+
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session = MagicMock()
+    mock_session.get = AsyncMock(return_value=job)
+    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.commit = AsyncMock()
+    mock_session.rollback = AsyncMock()
+    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_session.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("backend.app.core.tasks.async_session_maker", return_value=mock_session):
+        result = await build_playlist_task(job.id)
+
+    assert "Build failed" in result
+    assert job.status == "failed"
+    assert job.error is not None
+    assert "no active spotify connection" in job.error
+    mock_session.rollback.assert_awaited_once()
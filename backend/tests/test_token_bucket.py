@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from backend.core.rate_limit import TokenBucket
+
+
+async def test_token_bucket_spaces_requests():
+    """Test that queued callers are spaced 1/rate seconds apart."""
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    with (
+        patch("backend.core.rate_limit.time.monotonic", return_value=100.0),
+        patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep,
+    ):
+        for _ in range(3):
+            await bucket.acquire()
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [pytest.approx(0.5), pytest.approx(1.0)]
+
+
+async def test_token_bucket_refills_over_time():
+    """Test that an idle bucket hands out tokens without waiting, up to its capacity."""
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    with patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        with patch("backend.core.rate_limit.time.monotonic", return_value=100.0):
+            await bucket.acquire()
+            await bucket.acquire()
+        with patch("backend.core.rate_limit.time.monotonic", return_value=105.0):
+            await bucket.acquire()
+            await bucket.acquire()
+
+    mock_sleep.assert_not_called()
+
+
+async def test_token_bucket_uses_redis_reservation():
+    """Test that a Redis-backed bucket waits for the delay computed by the shared script."""
+    bucket = TokenBucket(rate=1.0, name="musicbrainz", redis_url="redis://localhost:6379")
+    aredis = MagicMock()
+    aredis.eval = AsyncMock(return_value=b"0.75")
+    bucket._aredis = aredis
+
+    with patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        await bucket.acquire()
+
+    assert aredis.eval.call_args.args[2] == "vibomat:ratelimit:musicbrainz"
+    mock_sleep.assert_called_once_with(0.75)
+
+
+async def test_token_bucket_falls_back_when_redis_fails():
+    """Test that Redis errors degrade to the in-process bucket."""
+    bucket = TokenBucket(rate=1.0, redis_url="redis://localhost:6379")
+    aredis = MagicMock()
+    aredis.eval = AsyncMock(side_effect=ConnectionError("down"))
+    bucket._aredis = aredis
+
+    with patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        await bucket.acquire()
+        await bucket.acquire()
+
+    mock_sleep.assert_called_once()
+
+
+async def test_adaptive_limiter_follows_server_counts():
+    """Test the server's limit and remaining counts replace the local estimate."""
+    from backend.core.rate_limit import AdaptiveRateLimiter
+
+    limiter = AdaptiveRateLimiter(60, window=60.0)
+    with (
+        patch("backend.core.rate_limit.time.monotonic", return_value=100.0),
+        patch("backend.core.rate_limit.asyncio.sleep", new=AsyncMock()) as mock_sleep,
+    ):
+        limiter._updated = 100.0
+        # A full window's budget can be spent in a burst
+        for _ in range(5):
+            await limiter.acquire()
+        mock_sleep.assert_not_called()
+
+        # Another consumer of the token spent the rest of the budget at a lower limit
+        limiter.update(limit=30, remaining=0)
+        await limiter.acquire()
+
+    assert limiter.capacity == 30
+    mock_sleep.assert_awaited_once_with(pytest.approx(2.0))
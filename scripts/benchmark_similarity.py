@@ -0,0 +1,75 @@
+"""Benchmark the fuzzy-matching engines on search_track-shaped workloads.
+
+Usage: python -m scripts.benchmark_similarity [rounds]
+"""
+
+import sys
+import timeit
+
+from backend.core.utils.similarity import SIMILARITY_ENGINES, _bigrams, _difflib_ratio
+
+# (query artist, query track) paired with a page of Spotify-style candidates (artists, name, album)
+QUERIES = [
+    ("Fleetwood Mac", "Dreams"),
+    ("The Beatles", "Here Comes The Sun"),
+    ("Daft Punk", "Around the World"),
+    ("Nina Simone", "Feeling Good"),
+    ("Radiohead", "Paranoid Android"),
+]
+CANDIDATE_SUFFIXES = [
+    "",
+    " - 2004 Remaster",
+    " - Live at the BBC",
+    " (Radio Edit)",
+    " - Remastered 2019",
+    " (Acoustic Version)",
+    " - Instrumental",
+    " (Extended Mix)",
+    " - Single Version",
+    " (Demo)",
+]
+CANDIDATE_ARTISTS = ["{artist}", "{artist} & Friends", "Various Artists", "The {artist} Tribute Band"]
+
+
+def build_pairs() -> list[tuple[str, str]]:
+    """Build the (query, candidate) pairs scored by one search_track call per query (20 candidates each)."""
+    pairs = []
+    for artist, track in QUERIES:
+        for i in range(20):
+            candidate_artist = CANDIDATE_ARTISTS[i % len(CANDIDATE_ARTISTS)].format(artist=artist)
+            candidate_track = track + CANDIDATE_SUFFIXES[i % len(CANDIDATE_SUFFIXES)]
+            pairs.append((artist, candidate_artist))
+            pairs.append((track, candidate_track))
+    return pairs
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pairs = build_pairs()
+
+    cold, warm = {}, {}
+    for name, scorer in SIMILARITY_ENGINES.items():
+
+        def run(scorer=scorer) -> None:
+            for s1, s2 in pairs:
+                scorer(s1, s2)
+
+        def run_cold(scorer=scorer) -> None:
+            # Clear memoization so every round scores unseen strings
+            _difflib_ratio.cache_clear()
+            _bigrams.cache_clear()
+            run(scorer)
+
+        cold[name] = min(timeit.repeat(run_cold, number=rounds, repeat=3)) / rounds
+        # Bulk builds revisit the same artist and candidate names, so memoized engines stay warm
+        warm[name] = min(timeit.repeat(run, number=rounds, repeat=3)) / rounds
+
+    print(f"{len(pairs)} scored pairs per round ({len(QUERIES)} queries x 20 candidates), {rounds} rounds")
+    baseline = cold["difflib"]
+    for label, results in (("cold", cold), ("warm", warm)):
+        for name, seconds in sorted(results.items(), key=lambda item: item[1]):
+            print(f"{label} {name:>10}: {seconds * 1e6:9.1f} us/round  ({baseline / seconds:6.1f}x vs cold difflib)")
+
+
+if __name__ == "__main__":
+    main()